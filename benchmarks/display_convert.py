@@ -0,0 +1,90 @@
+"""Compare the pure-Python frame conversion with the NumPy RGB565 fast path.
+
+Run from the repository root with ``python3 -m benchmarks.display_convert``.
+A null device swallows the SPI traffic so only conversion cost is measured.
+"""
+
+import random
+import time
+
+from PIL import Image, ImageDraw
+
+from utilities.display import PartialDisplay, to_rgb565
+
+FRAMES = 200
+SIZE = (128, 128)
+
+
+class NullDevice:
+    """Stand-in for the st7735 that discards everything it is sent."""
+
+    width, height = SIZE
+    mode = "RGB"
+
+    def apply_offsets(self, bbox):
+        return bbox
+
+    def preprocess(self, image):
+        return image
+
+    def command(self, cmd, *args):
+        pass
+
+    def data(self, data):
+        pass
+
+
+def make_frames(count):
+    """Return ``count`` random 128x128 test frames."""
+    rng = random.Random(1)
+    frames = []
+    for _ in range(count):
+        img = Image.new("RGB", SIZE)
+        draw = ImageDraw.Draw(img)
+        for _ in range(20):
+            x, y = rng.randrange(128), rng.randrange(128)
+            color = tuple(rng.randrange(256) for _ in range(3))
+            draw.rectangle((x, y, x + 40, y + 12), fill=color)
+        frames.append(img)
+    return frames
+
+
+def bench(name, func, frames):
+    """Time ``func`` over ``frames`` and print FPS and CPU per frame."""
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    for frame in frames:
+        func(frame)
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    print(f"{name:<22} {len(frames) / wall:8.1f} fps {cpu / len(frames) * 1000:8.3f} ms CPU/frame")
+
+
+def main():
+    frames = make_frames(FRAMES)
+    device = NullDevice()
+
+    # What luma's st7735.display() does for every full frame
+    def current(frame):
+        device.data(list(frame.tobytes()))
+
+    fast = PartialDisplay(device, use_numpy=True)
+
+    def numpy_full(frame):
+        fast.invalidate()
+        fast.display(frame)
+
+    cached = [to_rgb565(frame) for frame in frames]
+
+    def numpy_cached(frame):
+        fast.invalidate()
+        fast.display(frame)
+
+    print(f"{FRAMES} frames of {SIZE[0]}x{SIZE[1]}")
+    bench("current (list bytes)", current, frames)
+    bench("numpy rgb565", numpy_full, frames)
+    bench("numpy pre-converted", numpy_cached, cached)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare one-off ``requests.get`` calls with the pooled HTTP client.
+
+Run from the repository root with ``python3 -m benchmarks.http_keepalive``.
+By default both fetch from a local HTTP/1.1 server that counts the TCP
+connections it accepts and fails every fifth request with a 503, so the
+output shows connection reuse and retries.  Pass ``--url`` to time a real
+host instead, where the saving includes the TLS handshake.
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from utilities.http_client import HttpClient
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one write, or Nagle's algorithm stalls each reply
+    wbufsize = -1
+    connections = 0
+    served = 0
+
+    def setup(self):
+        super().setup()
+        CountingHandler.connections += 1
+
+    def do_GET(self):
+        CountingHandler.served += 1
+        status = 503 if CountingHandler.served % 5 == 0 else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, fetch, url, count):
+    start = time.perf_counter()
+    failed = 0
+    for _ in range(count):
+        try:
+            if not fetch(url).ok:
+                failed += 1
+        except requests.RequestException:
+            failed += 1
+    elapsed = time.perf_counter() - start
+    print(f"{label:>14}: {count} requests in {elapsed * 1000:.0f}ms "
+          f"({elapsed / count * 1000:.1f}ms each, {failed} failed)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="fetch this instead of the local server")
+    parser.add_argument("--count", type=int, default=20)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+        threading.Thread(target=server.serve_forever, name="http-server", daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def one_off(u):
+        return requests.get(u, timeout=5)
+
+    for label, fetch in (("requests.get", one_off), ("HttpClient", HttpClient(backoff=0.05).get)):
+        before = CountingHandler.connections
+        run(label, fetch, url, args.count)
+        if server is not None:
+            print(f"{'':>14}  {CountingHandler.connections - before} connections opened")
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
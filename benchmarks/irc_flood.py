@@ -0,0 +1,101 @@
+"""Flood the chat screen from a stand-in IRC server and count the frames drawn.
+
+Run from the repository root with ``python3 -m benchmarks.irc_flood``.
+Mini OS is booted headless with its IRC client pointed at
+:mod:`benchmarks.irc_server`.  The server sends 100 messages a second to the
+open chat screen, then drops the connection, then goes away entirely, and
+the script reports frames drawn, messages received and reconnect times.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("MINI_OS_BACKEND", "virtual")
+# Keep the flood out of the real chat history
+os.environ.setdefault("MINI_OS_CHAT_LOG", os.path.join(tempfile.mkdtemp(), "chat.log"))
+
+from benchmarks.irc_server import StandInServer  # noqa: E402
+
+RATE = 100
+SECONDS = 5.0
+
+
+def wait_for(condition, timeout):
+    """Poll ``condition`` until it is true; return the seconds it took or None."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if condition():
+            return time.perf_counter() - start
+        time.sleep(0.01)
+    return None
+
+
+def main():
+    import main as app
+
+    server = StandInServer(app.IRC_CHANNEL)
+    server_loop = asyncio.new_event_loop()
+    threading.Thread(target=server_loop.run_forever, name="irc-server", daemon=True).start()
+
+    def on_server(coro):
+        return asyncio.run_coroutine_threadsafe(coro, server_loop).result()
+
+    port = on_server(server.start())
+
+    frames = []
+    sink = app.display_worker.sink
+
+    def counting_sink(image):
+        sink(image)
+        frames.append(time.perf_counter())
+
+    app.display_worker.sink = counting_sink
+    client = app.irc_client
+    client.host, client.port = "127.0.0.1", port
+    client.min_backoff = 0.2
+    threading.Thread(target=app.runtime.run, name="runtime", daemon=True).start()
+    app.menu_instance = app.Menu([])
+    app.show_main_menu()
+    app.start_chat()
+    if wait_for(lambda: client.connected and server.clients, 5) is None:
+        print("Could not connect to the stand-in server")
+        return 1
+
+    lines_before = client.lines_in
+    frames.clear()
+    start = time.perf_counter()
+    on_server(server.flood(RATE, SECONDS))
+    wait_for(lambda: client.lines_in - lines_before >= server.flooded, 2)
+    elapsed = time.perf_counter() - start
+    app.display_worker.flush()
+    received = client.lines_in - lines_before
+    print(
+        f"Flood: {server.flooded} messages in {elapsed:.1f}s, {received} received, "
+        f"{len(frames)} frames drawn ({len(frames) / elapsed:.1f} fps)"
+    )
+    print(f"Scrollback: {len(app.chat_messages)} of {app.CHAT_SCROLLBACK} kept, "
+          f"newest {app.chat_messages[-1]!r}")
+
+    connects = client.connects
+    for writer in list(server.clients):
+        server_loop.call_soon_threadsafe(writer.close)
+    took = wait_for(lambda: client.connects > connects and client.connected, 5)
+    print(f"Reconnect after drop: {took:.2f}s" if took is not None else "Did not reconnect")
+
+    failures = client.failures
+    on_server(server.stop())
+    for writer in list(server.clients):
+        server_loop.call_soon_threadsafe(writer.close)
+    time.sleep(4)
+    print(f"Server gone for 4s: {client.failures - failures} connect attempts "
+          f"(backoff from {client.min_backoff}s)")
+    print(f"IRC: {client.report()}")
+    print(f"Chat log: {app.chat_log.report()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
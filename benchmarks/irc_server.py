@@ -0,0 +1,118 @@
+"""Stand-in IRC server for trying the chat screen without a real network.
+
+Run from the repository root with ``python3 -m benchmarks.irc_server`` and
+start Mini OS with ``MINI_OS_IRC=127.0.0.1:6667``.  The server speaks just
+enough IRC for :class:`utilities.irc.IrcClient`: it welcomes clients, relays
+channel messages between them and PINGs them.  ``--flood RATE`` posts RATE
+messages a second from a fake user and ``--drop-after SECONDS`` closes every
+connection after that long, to exercise reconnects.
+"""
+
+import argparse
+import asyncio
+
+
+class StandInServer:
+    """Minimal single-channel IRC server on asyncio streams."""
+
+    def __init__(self, channel="#pet", ping_interval=30.0, drop_after=None):
+        self.channel = channel
+        self.ping_interval = ping_interval
+        self.drop_after = drop_after
+        self.clients = {}  # writer -> nick
+        self.server = None
+        self.connections = 0
+        self.received = []  # (nick, message) PRIVMSGs from clients
+        self.flooded = 0
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Listen on ``host:port`` (0 picks a free port); return the port."""
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for writer in list(self.clients):
+            writer.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def broadcast(self, line, skip=None):
+        data = f"{line}\r\n".encode()
+        for writer in list(self.clients):
+            if writer is not skip and not writer.is_closing():
+                writer.write(data)
+
+    async def handle_client(self, reader, writer):
+        self.connections += 1
+        nick = "guest"
+        self.clients[writer] = nick
+        pinger = asyncio.ensure_future(self.ping(writer))
+        dropper = None
+        if self.drop_after is not None:
+            dropper = asyncio.get_running_loop().call_later(self.drop_after, writer.close)
+        try:
+            while True:
+                data = await reader.readline()
+                if not data:
+                    break
+                line = data.rstrip(b"\r\n").decode(errors="ignore")
+                command, _, rest = line.partition(" ")
+                if command == "NICK":
+                    nick = self.clients[writer] = rest.strip()
+                    writer.write(f":stand-in 001 {nick} :Welcome\r\n".encode())
+                elif command == "JOIN":
+                    self.broadcast(f":{nick}!{nick}@stand-in JOIN {rest.strip()}")
+                elif command == "PRIVMSG":
+                    target, _, message = rest.partition(" :")
+                    self.received.append((nick, message))
+                    self.broadcast(f":{nick}!{nick}@stand-in PRIVMSG {target} :{message}", skip=writer)
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            pinger.cancel()
+            if dropper is not None:
+                dropper.cancel()
+            self.clients.pop(writer, None)
+            writer.close()
+
+    async def ping(self, writer):
+        while not writer.is_closing():
+            await asyncio.sleep(self.ping_interval)
+            writer.write(b"PING :stand-in\r\n")
+
+    async def flood(self, rate, seconds=None, nick="flood"):
+        """Post ``rate`` messages a second to the channel, forever or for ``seconds``."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while seconds is None or loop.time() - start < seconds:
+            self.flooded += 1
+            self.broadcast(f":{nick}!{nick}@stand-in PRIVMSG {self.channel} :message {self.flooded}")
+            await asyncio.sleep(1 / rate)
+
+
+async def serve(args):
+    server = StandInServer(args.channel, drop_after=args.drop_after)
+    port = await server.start(args.host, args.port)
+    print(f"Stand-in IRC server on {args.host}:{port}, channel {args.channel}")
+    if args.flood:
+        await server.flood(args.flood)
+    else:
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6667)
+    parser.add_argument("--channel", default="#pet")
+    parser.add_argument("--flood", type=float, help="messages per second from a fake user")
+    parser.add_argument("--drop-after", type=float, help="close connections after this many seconds")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Replay a recorded button session headless and time every frame it draws.
+
+Record a session on the Pi (or headless) with
+``MINI_OS_RECORD=session.rec python3 main.py``, then from the repository root::
+
+    python3 -m benchmarks.replay session.rec [--realtime] [--frames out.csv]
+                                             [--expect SHA256]
+
+By default edges are fed as fast as Mini OS can take them under a virtual
+clock: ``random`` is seeded from the recording, ``time`` in main.py and the
+games reads and sleeps on the virtual clock, and held keys repeat on the
+schedule a real hold would give.  The event loop in ``main.runtime`` is not
+run, so its timers (cursor blink, reaction game countdown) stay idle and IRC
+never connects.  Every run therefore draws the same frames, and the SHA-256
+of the final frame can be checked with ``--expect`` (exit status 1 on a
+mismatch).  ``--realtime`` replays at 1x on the real clock, event loop
+included.
+
+Notes, settings, metrics and the chat log are written to a scratch directory,
+never the checkout.
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("MINI_OS_BACKEND", "virtual")
+
+from utilities import replay  # noqa: E402
+from utilities.events import InputEvent  # noqa: E402
+from utilities.latency import nearest_rank  # noqa: E402
+
+# Real seconds to wait for a step to settle before moving on regardless
+SETTLE_TIMEOUT = 0.25
+# Virtual seconds to keep running after the last recorded edge
+TAIL = 1.0
+
+
+class Harness:
+    """Boots main.py without its ``__main__`` block and feeds it a recording."""
+
+    def __init__(self, recording, realtime=False, scratch=None):
+        self.recording = recording
+        self.realtime = realtime
+        self.scratch = scratch or tempfile.mkdtemp(prefix="mini-os-replay-")
+        self.frames = []
+        self.stalls = 0
+        self.stimulus = time.perf_counter()
+        self.clock = None
+        self.app = None
+        self.start = 0.0
+
+    def setup(self):
+        # The chat log is opened when main is imported
+        os.environ.setdefault("MINI_OS_CHAT_LOG", os.path.join(self.scratch, "chat.log"))
+        import main as app
+
+        self.app = app
+        random.seed(self.recording.seed)
+        app.NOTES_DIR = os.path.join(self.scratch, "notes")
+        os.makedirs(app.NOTES_DIR, exist_ok=True)
+        app.SETTINGS_FILE = os.path.join(self.scratch, "settings.json")
+        app.METRICS_FILE = os.path.join(self.scratch, "metrics.bin")
+        # The Wi-Fi monitor isn't started, so the status icon can't depend on the host
+        app.wifi_connected = False
+
+        if not self.realtime:
+            self.clock = replay.VirtualClock()
+            virtual_time = replay.VirtualTime(self.clock)
+
+            def use_virtual_time(module):
+                if getattr(module, "time", None) is time:
+                    module.time = virtual_time
+
+            for name in ("main", "utilities.events", "utilities.latency"):
+                use_virtual_time(sys.modules[name])
+            # Games are imported lazily, the first time they are started
+            for name, module in list(sys.modules.items()):
+                if name.startswith("games."):
+                    use_virtual_time(module)
+            app.apps.on_load(use_virtual_time)
+            app.key_repeater = replay.SteppedRepeater(
+                app.input_events.post,
+                delay=app.KEY_REPEAT_DELAY,
+                rate=app.KEY_REPEAT_RATE,
+                max_rate=app.KEY_REPEAT_MAX_RATE,
+                ramp=app.KEY_REPEAT_RAMP,
+            )
+
+        sink = app.display_worker.sink
+
+        def timed_sink(image):
+            start = time.perf_counter()
+            sink(image)
+            end = time.perf_counter()
+            self.frames.append((
+                len(self.frames) + 1,
+                self.now() * 1000,
+                app.menu_instance.current_screen if app.menu_instance else None,
+                (start - self.stimulus) * 1000,
+                (end - start) * 1000,
+            ))
+
+        app.display_worker.sink = timed_sink
+        self.start = self.clock.monotonic() if self.clock is not None else time.monotonic()
+        app.menu_instance = app.Menu([])
+        self.stimulus = time.perf_counter()
+        app.show_main_menu()
+        app.input_events.start()
+        app.key_repeater.start()
+        if self.realtime:
+            threading.Thread(target=app.runtime.run, name="runtime", daemon=True).start()
+        for channel in app.BUTTON_PINS.values():
+            app.GPIO.add_event_detect(channel, app.GPIO.BOTH, callback=app.button_event_handler)
+        self.baseline = {t.ident for t in threading.enumerate()}
+        self.settle()
+
+    def now(self):
+        """Return session seconds since the harness booted Mini OS."""
+        clock = self.clock.monotonic() if self.clock is not None else time.monotonic()
+        return clock - self.start
+
+    def fire(self, channel, level):
+        self.stimulus = time.perf_counter()
+        if level == self.app.GPIO.LOW:
+            self.app.GPIO.press(channel)
+        else:
+            self.app.GPIO.release(channel)
+
+    def quiet(self):
+        """Return True once nothing is left to run until the clock moves."""
+        app = self.app
+        sleeping = self.clock.is_sleeping
+        dispatcher = app.input_events
+        if not dispatcher.idle() and not sleeping(dispatcher.thread.ident):
+            return False
+        for job in list(app.worker_pool.active):
+            if not job.done.is_set() and not (job.thread and sleeping(job.thread)):
+                return False
+        for thread in threading.enumerate():
+            if thread.ident not in self.baseline and thread.is_alive() and not sleeping(thread.ident):
+                return False
+        return True
+
+    def settle(self):
+        """Wait for the last step's work to finish and its frame to be sent."""
+        if self.clock is not None:
+            limit = time.perf_counter() + SETTLE_TIMEOUT
+            while not self.quiet():
+                if time.perf_counter() > limit:
+                    # Something is blocked on a thread that waits for the clock
+                    self.stalls += 1
+                    break
+                time.sleep(0.0005)
+        self.app.display_worker.flush()
+
+    def run(self):
+        if self.realtime:
+            self.run_realtime()
+        else:
+            self.run_virtual()
+        self.settle()
+        return hashlib.sha256(self.app.device.framebuffer.tobytes()).hexdigest()
+
+    def run_realtime(self):
+        for edge in self.recording.edges:
+            delay = edge.time - self.now()
+            if delay > 0:
+                time.sleep(delay)
+            self.fire(edge.channel, edge.level)
+        time.sleep(TAIL)
+
+    def run_virtual(self):
+        clock = self.clock
+        base = clock.monotonic()
+        edges = self.recording.edges
+        end = base + (edges[-1].time if edges else 0.0) + TAIL
+        index = 0
+        while True:
+            # Edges first, then key repeats, then sleeping threads at equal times
+            candidates = []
+            if index < len(edges):
+                candidates.append((base + edges[index].time, 0))
+            repeat = self.app.key_repeater.next_repeat()
+            if repeat is not None:
+                candidates.append((repeat[1], 1))
+            deadline = clock.next_deadline()
+            if deadline is not None:
+                candidates.append((deadline, 2))
+            if not candidates:
+                break
+            when, kind = min(candidates)
+            if when > end:
+                break
+            if kind == 0:
+                clock.advance(when)
+                edge = edges[index]
+                index += 1
+                self.fire(edge.channel, edge.level)
+            elif kind == 1:
+                clock.advance(when)
+                self.app.key_repeater.step()
+                self.stimulus = time.perf_counter()
+                self.app.input_events.post(InputEvent(repeat[0], self.app.GPIO.LOW, when, 1))
+            else:
+                self.stimulus = time.perf_counter()
+                clock.wake_next()
+            self.settle()
+
+    def summary(self):
+        """Return ``(screen, frames, input p50, input p95, display p50, display p95)`` rows."""
+        by_screen = {}
+        for _, _, screen, since_input, display in self.frames:
+            by_screen.setdefault(screen, []).append((since_input, display))
+        rows = []
+        for screen, samples in sorted(by_screen.items(), key=lambda item: -len(item[1])):
+            since_input = sorted(s[0] for s in samples)
+            display = sorted(s[1] for s in samples)
+            rows.append((
+                screen,
+                len(samples),
+                statistics.median(since_input),
+                nearest_rank(since_input, 0.95),
+                statistics.median(display),
+                nearest_rank(display, 0.95),
+            ))
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", help="file written with MINI_OS_RECORD")
+    parser.add_argument("--realtime", action="store_true", help="replay at 1x on the real clock")
+    parser.add_argument("--frames", help="write per-frame timings to this CSV file")
+    parser.add_argument("--expect", help="SHA-256 the final frame must have")
+    args = parser.parse_args()
+
+    recording = replay.load(args.recording)
+    harness = Harness(recording, realtime=args.realtime)
+    harness.setup()
+    started = time.perf_counter()
+    digest = harness.run()
+    elapsed = time.perf_counter() - started
+
+    mode = "1x" if args.realtime else "virtual clock"
+    print(
+        f"Replayed {len(recording.edges)} edges ({mode}) in {elapsed:.2f}s, "
+        f"{harness.now():.2f}s of session time, {len(harness.frames)} frames"
+        + (f", {harness.stalls} stalls" if harness.stalls else "")
+    )
+    print(f"{'screen':<20}{'frames':>7}{'input->frame ms':>18}{'display ms':>14}")
+    for screen, count, in50, in95, d50, d95 in harness.summary():
+        print(f"{str(screen):<20}{count:>7}{in50:>9.2f}/{in95:<8.2f}{d50:>6.2f}/{d95:<7.2f}")
+    print(f"Final frame sha256: {digest}")
+
+    if args.frames:
+        with open(args.frames, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "session_ms", "screen", "input_to_frame_ms", "display_ms"])
+            for row in harness.frames:
+                writer.writerow([row[0], f"{row[1]:.1f}", row[2], f"{row[3]:.3f}", f"{row[4]:.3f}"])
+
+    harness.app.worker_pool.cancel_all()
+    if args.expect and args.expect != digest:
+        print(f"Final frame differs from expected {args.expect}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Check and time :class:`~utilities.sysinfo.SysInfo` against a fake ``/sys`` and ``/proc``.
+
+Run from the repository root with ``python3 -m benchmarks.sysinfo_fakeroot``.
+A small tree of kernel files with known contents is written to a temporary
+directory (or ``--keep DIR``, which can then be passed to Mini OS as
+``MINI_OS_SYSTEM_ROOT``).  Every reading is compared with the value the
+files describe, several threads then sample the CPU at once to check they
+share one delta, and the cost of each reading is printed.  Exits with
+status 1 if any reading is wrong.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from utilities.sysinfo import SysInfo
+
+STAT_BEFORE = (
+    "cpu  100 0 100 700 100 0 0 0 0 0\n"
+    "cpu0 50 0 50 350 50 0 0 0 0 0\n"
+    "cpu1 50 0 50 350 50 0 0 0 0 0\n"
+    "intr 0\n"
+)
+# 200 more ticks per core; cpu0 spent 100 of them busy, cpu1 50
+STAT_AFTER = (
+    "cpu  200 0 150 950 100 0 0 0 0 0\n"
+    "cpu0 100 0 100 450 50 0 0 0 0 0\n"
+    "cpu1 100 0 50 500 50 0 0 0 0 0\n"
+    "intr 0\n"
+)
+
+FILES = {
+    "sys/class/thermal/thermal_zone0/type": "gpu-thermal\n",
+    "sys/class/thermal/thermal_zone0/temp": "40000\n",
+    "sys/class/thermal/thermal_zone1/type": "cpu-thermal\n",
+    "sys/class/thermal/thermal_zone1/temp": "51234\n",
+    "sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq": "1200000\n",
+    "sys/devices/platform/soc/soc:firmware/get_throttled": "0x50005\n",
+    "proc/stat": STAT_BEFORE,
+    "proc/loadavg": "0.52 0.41 0.30 1/123 4567\n",
+    "proc/meminfo": "MemTotal:        4000000 kB\nMemFree:          500000 kB\nMemAvailable:    3000000 kB\n",
+    "proc/net/fib_trie": (
+        "Local:\n"
+        "  +-- 0.0.0.0/0 3 0 5\n"
+        "     |-- 127.0.0.1\n"
+        "        /32 host LOCAL\n"
+        "     |-- 192.168.1.20\n"
+        "        /32 host LOCAL\n"
+        "     |-- 192.168.1.255\n"
+        "        /32 link BROADCAST\n"
+    ),
+    "proc/net/if_inet6": (
+        "00000000000000000000000000000001 01 80 10 80       lo\n"
+        "fe800000000000000000000000000001 02 40 20 80    wlan0\n"
+        "20010db8000000000000000000000002 02 40 00 00    wlan0\n"
+    ),
+    "proc/diskstats": "   8       0 sda 10 0 2048 0 20 0 4096 0 0 0 0\n",
+    "sys/block/sda/size": "1000\n",
+    "sys/block/loop0/size": "0\n",
+}
+
+EXPECTED = {
+    "temperature": 51.234,
+    "cpu_freq": 1200.0,
+    "load": (0.52, 0.41, 0.30),
+    "memory": (1000000, 4000000),
+    "throttled": 0x50005,
+    "addresses": ["192.168.1.20", "2001:db8::2"],
+    "cpu_count": 2,
+    "cpu_usage": [37.5, 50.0, 25.0],
+}
+
+
+def build(root, files):
+    for path, text in files.items():
+        full = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "w") as f:
+            f.write(text)
+
+
+def matches(got, want):
+    """Compare readings, allowing float rounding."""
+    if isinstance(want, float):
+        return got is not None and abs(got - want) < 1e-6
+    if isinstance(want, (list, tuple)) and want and isinstance(want[0], float):
+        return got is not None and len(got) == len(want) and all(matches(a, b) for a, b in zip(got, want))
+    return got == want
+
+
+def timed(func, repeat=1000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keep", metavar="DIR", help="write the fake tree here and leave it")
+    args = parser.parse_args()
+
+    root = args.keep or tempfile.mkdtemp(prefix="fakeroot-")
+    build(root, FILES)
+    info = SysInfo(root, ttl=0.5)
+    failures = 0
+
+    def check(name, got):
+        nonlocal failures
+        want = EXPECTED[name]
+        ok = matches(got, want)
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':>4}  {name:<12} {got!r}" + ("" if ok else f" (expected {want!r})"))
+
+    check("temperature", info.temperature())
+    check("cpu_freq", info.cpu_freq())
+    check("load", info.load())
+    check("memory", info.memory())
+    check("throttled", info.throttled())
+    check("addresses", info.addresses())
+    check("cpu_count", info.cpu_count())
+
+    # The first CPU sample only records totals; the second is the delta
+    info.cpu_usage()
+    info.cache.clear()
+    build(root, {"proc/stat": STAT_AFTER})
+    results = []
+    barrier = threading.Barrier(8)
+
+    def sample():
+        barrier.wait()
+        results.append(info.cpu_usage())
+
+    threads = [threading.Thread(target=sample, name=f"sampler-{i}") for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    shared = all(r == results[0] for r in results)
+    failures += not shared
+    print(f"{'ok' if shared else 'FAIL':>4}  8 threads sampling at once got {'one' if shared else 'different'} result(s)")
+    check("cpu_usage", results[0])
+
+    info.ttl = 0
+    print("\nCost per reading with the cache off:")
+    for name in ("temperature", "cpu_usage", "load", "memory", "addresses", "disk_io"):
+        print(f"  {name:<12} {timed(getattr(info, name)):6.1f}us")
+    print(info.report())
+    if args.keep:
+        print(f"\nFake tree left in {root}; try MINI_OS_SYSTEM_ROOT={root}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
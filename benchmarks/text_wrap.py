@@ -0,0 +1,118 @@
+"""Compare the textbbox-based wrap_text with the table-driven layout engine.
+
+Run from the repository root with ``python3 -m benchmarks.text_wrap``.
+Wraps a 50 KB web page and a 5 KB note at the screen width used by the web
+browser and notes viewer, with a cold and a warm layout cache.
+"""
+
+import random
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+from utilities import text_layout
+
+FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+FONT_SIZE = 9
+MAX_WIDTH = 118
+RUNS = 5
+
+WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or "
+    "his from at which but have an they you were her she there been one all "
+    "would their we him when who will more no if out so said what up its about "
+    "into than them can only other new some could time these two may then do "
+    "first any my now such like our over man me even most made after also did "
+    "display screen button joystick raspberry weather temperature "
+    "configuration international"
+).split()
+LONG_WORDS = [
+    "https://example.com/a/very/long/path/to/some/article?id=1234567890",
+    "supercalifragilisticexpialidocious",
+]
+
+
+def make_text(size, seed):
+    """Return roughly ``size`` bytes of paragraphs with the odd unbreakable word."""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(20, 80))]
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(LONG_WORDS))
+        paragraph = " ".join(words).capitalize() + "."
+        parts.append(paragraph)
+        length += len(paragraph) + 1
+    return "\n".join(parts)
+
+
+def legacy_wrap_text(text, font, max_width, draw):
+    """The previous main.wrap_text, which measured every candidate with textbbox."""
+    lines = []
+    for line in text.split("\n"):
+        words = line.split()
+        current = ""
+        for word in words:
+            test = f"{current} {word}".strip()
+            width = draw.textbbox((0, 0), test, font=font)[2]
+            if width <= max_width:
+                current = test
+            else:
+                if draw.textbbox((0, 0), word, font=font)[2] > max_width:
+                    if current:
+                        lines.append(current)
+                        current = ""
+                    remaining = word
+                    while remaining:
+                        prefix = ""
+                        for i in range(len(remaining), 0, -1):
+                            segment = remaining[:i]
+                            seg_width = draw.textbbox(
+                                (0, 0), segment + ("-" if i < len(remaining) else ""), font=font
+                            )[2]
+                            if seg_width <= max_width:
+                                prefix = segment
+                                break
+                        if not prefix:
+                            prefix = remaining[0]
+                            i = 1
+                        lines.append(prefix + ("-" if i < len(remaining) else ""))
+                        remaining = remaining[i:]
+                else:
+                    if current:
+                        lines.append(current)
+                    current = word
+        if current:
+            lines.append(current)
+    return lines
+
+
+def bench(name, func, runs=RUNS):
+    """Time ``func`` over ``runs`` calls and print milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = func()
+    elapsed = (time.perf_counter() - start) / runs
+    print(f"  {name:<18} {elapsed * 1000:9.2f} ms/wrap")
+    return result
+
+
+def main():
+    font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
+    draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+    def cold(text):
+        text_layout.clear_cache()
+        return text_layout.wrap_text(text, font, MAX_WIDTH)
+
+    for name, text in (("50 KB web page", make_text(50_000, 1)), ("5 KB note", make_text(5_000, 2))):
+        print(f"{name} ({len(text)} chars)")
+        old = bench("textbbox", lambda: legacy_wrap_text(text, font, MAX_WIDTH, draw), runs=1)
+        new = bench("glyph tables", lambda: cold(text))
+        bench("cached", lambda: text_layout.wrap_text(text, font, MAX_WIDTH), runs=100)
+        print(f"  {len(new)} lines, identical to textbbox: {old == new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,7 @@
-from . import (
-    snake,
-    tetris,
-    rps,
-    space_invaders,
-    vet_adventure,
-    axe,
-    trivia,
-    hack_in,
-    pico_wow,
-    gta_1997,
-    doctor_mode,
-    ai_cases,
-)
+"""Games bundled with Mini OS, imported on first use to keep boot fast."""
+
+import importlib
+
 __all__ = [
     "snake",
     "tetris",
@@ -20,9 +10,16 @@ __all__ = [
     "vet_adventure",
     "axe",
     "trivia",
+    "two_player_trivia",
     "hack_in",
     "pico_wow",
     "gta_1997",
     "doctor_mode",
     "ai_cases",
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -178,7 +178,7 @@ def start_reveal():
         reveal_thread = None
 
     reveal_stop.clear()
-    reveal_thread = threading.Thread(target=task, daemon=True)
+    reveal_thread = threading.Thread(target=task, name="ai-cases-reveal", daemon=True)
     reveal_thread.start()
 
 
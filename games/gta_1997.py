@@ -55,7 +55,7 @@ def start():
     place_star()
     running = True
     start_time = time.time()
-    update_thread = threading.Thread(target=game_loop, daemon=True)
+    update_thread = threading.Thread(target=game_loop, name="gta-1997", daemon=True)
     update_thread.start()
     draw()
 
@@ -27,7 +27,7 @@ def start():
     start_time = time.time()
     progress = 0
     code_lines = []
-    update_thread = threading.Thread(target=_loop, daemon=True)
+    update_thread = threading.Thread(target=_loop, name="hack-in", daemon=True)
     update_thread.start()
 
 
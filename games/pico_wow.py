@@ -58,7 +58,7 @@ def start():
     heart_pos = None
     enemies = [Enemy() for _ in range(3)]
     running = True
-    update_thread = threading.Thread(target=_game_loop, daemon=True)
+    update_thread = threading.Thread(target=_game_loop, name="pico-wow", daemon=True)
     update_thread.start()
     draw()
 
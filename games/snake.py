@@ -33,7 +33,7 @@ def start():
     snake = deque([(GRID_WIDTH // 2, GRID_HEIGHT // 2)])
     direction = (1, 0)
     place_food()
-    update_thread = threading.Thread(target=game_loop, daemon=True)
+    update_thread = threading.Thread(target=game_loop, name="snake", daemon=True)
     update_thread.start()
     draw()
 
@@ -40,7 +40,7 @@ def start():
 
 def start_thread():
     global update_thread
-    update_thread = threading.Thread(target=game_loop, daemon=True)
+    update_thread = threading.Thread(target=game_loop, name="space-invaders", daemon=True)
     update_thread.start()
 
 
@@ -2,6 +2,7 @@ import time
 import random
 import threading
 from PIL import Image, ImageDraw
+from utilities import text_layout
 
 thread_safe_display = None
 fonts = None
@@ -22,21 +23,9 @@ timer_stop_event = threading.Event()
 timer_end_time = 0
 
 # Simple text wrapping helper
-def wrap_text(text, font, max_width, draw):
-    lines = []
-    words = text.split()
-    current = ""
-    for word in words:
-        test = (current + " " + word).strip()
-        if draw.textlength(test, font=font) <= max_width:
-            current = test
-        else:
-            if current:
-                lines.append(current)
-            current = word
-    if current:
-        lines.append(current)
-    return lines
+def wrap_text(text, font, max_width, draw=None):
+    # Newlines are treated as spaces, as the games expect
+    return text_layout.wrap_text(" ".join(text.split()), font, max_width)
 
 QUESTIONS = {
     "Hawaii": [
@@ -312,7 +301,7 @@ def start_timer():
         timer_thread = None
 
     timer_stop_event.clear()
-    timer_thread = threading.Thread(target=timer_task, daemon=True)
+    timer_thread = threading.Thread(target=timer_task, name="trivia-timer", daemon=True)
     timer_thread.start()
 
 
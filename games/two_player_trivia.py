@@ -157,7 +157,7 @@ def start_reveal():
         reveal_thread = None
 
     reveal_stop.clear()
-    reveal_thread = threading.Thread(target=task, daemon=True)
+    reveal_thread = threading.Thread(target=task, name="trivia-reveal", daemon=True)
     reveal_thread.start()
 
 
@@ -185,7 +185,7 @@ def start_reveal():
         reveal_thread = None
 
     reveal_stop.clear()
-    reveal_thread = threading.Thread(target=task, daemon=True)
+    reveal_thread = threading.Thread(target=task, name="vet-adventure-reveal", daemon=True)
     reveal_thread.start()
 
 
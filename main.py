@@ -1,42 +1,79 @@
 #!/usr/bin/env python3
 
-import RPi.GPIO as GPIO
+# Time every import from here on; the report is written once the menu is up
+from utilities.apps import AppRegistry, ImportTimer
+
+import_timer = ImportTimer()
+import_timer.install()
+
 import time
+import asyncio
 import subprocess
 from datetime import datetime
+from collections import OrderedDict, deque
 import os
+import math
 import random
 import threading
-import requests
 import re
 import select
-import webbrowser
 import shutil
-import socket
 import json
 import html
-import pexpect
-from games import (
-    snake,
-    tetris,
-    rps,
-    space_invaders,
-    vet_adventure,
-    axe,
-    trivia,
-    two_player_trivia,
-    hack_in,
-    pico_wow,
-    gta_1997,
-    doctor_mode,
-    ai_cases,
-)
 
-# Luma.lcd imports and setup
-from luma.core.interface.serial import spi
-from luma.core.render import canvas
-from luma.lcd.device import st7735
+# Games and heavy libraries are imported when first used, normally when their
+# menu entry is selected, or by the warm-up thread once the menu is showing
+apps = AppRegistry()
+snake = apps.lazy("games.snake")
+tetris = apps.lazy("games.tetris")
+rps = apps.lazy("games.rps")
+space_invaders = apps.lazy("games.space_invaders")
+axe = apps.lazy("games.axe")
+hack_in = apps.lazy("games.hack_in")
+pico_wow = apps.lazy("games.pico_wow")
+gta_1997 = apps.lazy("games.gta_1997")
+trivia = apps.lazy("games.trivia")
+two_player_trivia = apps.lazy("games.two_player_trivia")
+doctor_mode = apps.lazy("games.doctor_mode")
+# Imported by http_client on the first fetch; registered so it warms up early
+apps.lazy("requests")
+pexpect = apps.lazy("pexpect")
+webbrowser = apps.lazy("webbrowser")
+# These two import openai, by far the slowest module, so they warm up last
+vet_adventure = apps.lazy("games.vet_adventure")
+ai_cases = apps.lazy("games.ai_cases")
+# Set MINI_OS_WARM_UP=0 to only ever import on demand
+WARM_UP_APPS = os.environ.get("MINI_OS_WARM_UP", "1") != "0"
+
 from PIL import ImageFont, ImageDraw, Image
+from utilities import hardware, text_layout, text_cache, replay, boot
+from utilities.display import PartialDisplay, DisplayWorker, to_rgb565
+from utilities.scroll_view import ScrollView
+from utilities.events import EventDispatcher, InputEvent, KeyRepeater, WorkerPool
+from utilities.screens import ScreenRegistry
+from utilities.latency import LatencyTracker, STAGES
+from utilities.runtime import Runtime
+from utilities.irc import IrcClient
+from utilities.chat_log import ChatLog
+from utilities.network import LinkMonitor
+from utilities.sysinfo import SysInfo
+from utilities.metrics import MetricsStore, Sampler, WINDOWS as METRIC_WINDOWS, metric_names
+from utilities.thread_stats import ThreadStats
+from utilities.http_client import HttpClient
+
+# Milestones from process start to the menu taking input, saved to logs/boot.json
+boot_timeline = boot.BootTimeline()
+boot_timeline.mark("imports done")
+
+# --- Hardware Backend ---
+# "pi" drives the real LCD HAT. "virtual" runs headless on any Linux box with an
+# in-memory display and scriptable buttons (see utilities/hardware.py).
+HARDWARE_BACKEND = hardware.backend_name()
+
+if HARDWARE_BACKEND == "virtual":
+    GPIO = hardware.FakeGPIO()
+else:
+    import RPi.GPIO as GPIO
 
 # --- Display Configuration ---
 # Waveshare 1.44inch LCD HAT with ST7735S controller is 128x128 pixels. 
@@ -52,25 +89,67 @@ RST_PIN = 27  # GPIO 27
 DC_PIN = 25   # GPIO 25 
 # CS (GPIO 8), SCLK (GPIO 11), MOSI (GPIO 10) are handled by the SPI interface directly. 
 BL_PIN = 24   # Backlight pin, GPIO 24 
+# SPI clock; 16MHz is a good speed. Max is 60MHz.
+SPI_BUS_SPEED_HZ = 16000000
 
-# SPI communication setup (port=0, device=0 corresponds to SPI0 CE0/GPIO 8)
-# Speed can be up to 60MHz for ST7735S 
-serial_interface = spi(port=0, device=0,
-                       gpio_DC=DC_PIN, gpio_RST=RST_PIN,
-                       speed_hz=16000000) # 16MHz is a good speed. Max is 60MHz.
-
-# LCD device initialization. bgr=True is important for correct colors on many ST7735 displays.
-# h_offset/v_offset may need minor tuning for perfect alignment on 128x128 physical screens,
-# as the ST7735S has a native resolution of 132x162, and the Waveshare HAT uses a 128x128 portion. 
-device = st7735(serial_interface, width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT, bgr=True,
-                h_offset=2, v_offset=1) # Adjust offsets if your display has borders/misalignment
+if HARDWARE_BACKEND == "virtual":
+    device = hardware.VirtualDevice(
+        DISPLAY_WIDTH, DISPLAY_HEIGHT, dump_dir=os.environ.get(hardware.FRAME_DIR_ENV)
+    )
+else:
+    # Luma.lcd imports and setup
+    from luma.core.interface.serial import spi
+    from luma.core.framebuffer import full_frame
+    from luma.lcd.device import st7735
+
+    # SPI communication setup (port=0, device=0 corresponds to SPI0 CE0/GPIO 8)
+    # Speed can be up to 60MHz for ST7735S 
+    serial_interface = spi(port=0, device=0,
+                           gpio_DC=DC_PIN, gpio_RST=RST_PIN,
+                           bus_speed_hz=SPI_BUS_SPEED_HZ)
+
+    # LCD device initialization. bgr=True is important for correct colors on many ST7735 displays.
+    # h_offset/v_offset may need minor tuning for perfect alignment on 128x128 physical screens,
+    # as the ST7735S has a native resolution of 132x162, and the Waveshare HAT uses a 128x128 portion. 
+    # Frame diffing is done by PartialDisplay, so luma is told to always take the full frame.
+    device = st7735(serial_interface, width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT, bgr=True,
+                    h_offset=2, v_offset=1, # Adjust offsets if your display has borders/misalignment
+                    framebuffer=full_frame())
+
+# Only the regions that changed since the last frame are sent over SPI
+partial_display = PartialDisplay(device, bus_speed_hz=SPI_BUS_SPEED_HZ)
+boot_timeline.mark("display ready")
+
+# Show the main menu as it looked at the end of the last boot while fonts,
+# settings and everything else load. The real menu frame is diffed against it.
+SPLASH_FILE = os.path.join(os.path.dirname(__file__), "splash.rgb565")
+boot_splash = boot.load_splash(SPLASH_FILE, DISPLAY_WIDTH, DISPLAY_HEIGHT)
+if boot_splash is not None:
+    partial_display.display(boot_splash)
+    # The backlight is normally set up in the main block; light it now
+    GPIO.setwarnings(False)
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(BL_PIN, GPIO.OUT)
+    GPIO.output(BL_PIN, GPIO.HIGH)
+    boot_timeline.mark("splash shown")
 
 # Ensure display access is thread-safe
 display_lock = threading.Lock()
 
+# A single render thread owns SPI. Producers drop their frame in a one-slot
+# mailbox and return straight away; frames that were never sent are replaced.
+display_worker = DisplayWorker(partial_display.display, display_lock)
+display_worker.start()
+
+# Edge-to-frame timings per screen; frames drawn while an input event is
+# being handled are tagged so the worker can report when they hit the panel
+latency_tracker = LatencyTracker()
+display_worker.on_sent = latency_tracker.frame_sent
+
 def thread_safe_display(img):
-    with display_lock:
-        device.display(img)
+    if job_cancelled():
+        return  # a cancelled background job finished late; its screen is gone
+    display_worker.submit(img, latency_tracker.frame_tag())
 
 # --- Joystick and Button Configuration ---
 # GPIO setup using BCM numbering. Buttons are active LOW (pressed = low).
@@ -81,6 +160,7 @@ BUTTON_PINS = {
     "KEY1": 21, "KEY2": 20, "KEY3": 16, # General purpose buttons 
     "JOY_UP": 6, "JOY_DOWN": 19, "JOY_LEFT": 5, "JOY_RIGHT": 26, "JOY_PRESS": 13 # Joystick directions and press 
 }
+PIN_NAMES = {num: name for name, num in BUTTON_PINS.items()}  # BCM number -> name
 
 # Set up each pin as an input with an internal pull-up resistor
 for pin_name, pin_num in BUTTON_PINS.items():
@@ -109,13 +189,11 @@ game_score = 0
 game_prompt = None
 
 # Timer support for the reaction game
-timer_thread = None
-timer_stop_event = threading.Event()
+game_timer = None
 timer_end_time = 0
 
 # Blinking cursor support for the shell/console
-cursor_thread = None
-cursor_stop_event = threading.Event()
+cursor_timer = None
 cursor_visible = True
 
 # --- Fonts ---
@@ -158,9 +236,13 @@ def update_fonts():
         font_medium = ImageFont.load_default()
         font_large = ImageFont.load_default()
         font_tiny = ImageFont.load_default()
+    # Cached masks and line metrics belong to the old fonts
+    text_cache.clear()
+    text_layout.clear_cache()
 
 
 update_fonts()
+boot_timeline.mark("fonts loaded")
 
 # --- Color Schemes ---
 # Basic menu color palettes inspired by macOS Terminal themes.
@@ -260,26 +342,72 @@ def apply_color_scheme(name):
         if menu_instance:
             menu_instance.draw()
 
+# Every outbound HTTP request shares this client's keep-alive connections
+http_client = HttpClient()
+
+# --- System Info ---
+# Directory holding the sys and proc trees; point it at fake ones to test
+SYSTEM_ROOT = os.environ.get("MINI_OS_SYSTEM_ROOT", "/")
+sysinfo = SysInfo(SYSTEM_ROOT)
+# History for the System Monitor graphs and /metrics.json, kept across restarts
+METRICS_FILE = os.path.join(os.path.dirname(__file__), "logs", "metrics.bin")
+METRICS_INTERVAL = 1.0
+metrics = None
+# Index into METRIC_WINDOWS shown by the System Monitor; the timer redraws it
+# or the Threads screen every second
+monitor_window = 0
+monitor_timer = None
+# Per-thread CPU for the Threads screen and /threads.json
+thread_stats = ThreadStats(sysinfo)
+threads_offset = 0
+
 # --- Wi-Fi Status ---
+# Kept up to date by wifi_monitor on the event loop; drawing only reads it
 wifi_connected = False
-_wifi_check_time = 0
+wifi_monitor = LinkMonitor(sysinfo.path("/sys"), sysinfo.path("/proc"))
+# Netlink wakes the monitor on every link change, so polling is a safety net
+WIFI_POLL_INTERVAL = 30
+# Poll interval when there is no netlink socket
+WIFI_POLL_FALLBACK = 5
 
 
 def is_wifi_connected():
-    """Return True if the system is connected to Wi-Fi."""
-    global wifi_connected, _wifi_check_time
-    if time.time() - _wifi_check_time > 5:
-        _wifi_check_time = time.time()
-        try:
-            output = subprocess.check_output(
-                ["iwgetid", "-r"], stderr=subprocess.DEVNULL
-            ).decode().strip()
-            wifi_connected = bool(output)
-        except Exception:
-            wifi_connected = False
+    """Return True if the system is connected to Wi-Fi, as last seen by the monitor."""
     return wifi_connected
 
 
+def on_wifi_change(state):
+    """Remember the new link state and redraw the status icons if a menu is showing."""
+    global wifi_connected
+    wifi_connected = state.connected
+    print(f"Wi-Fi {'connected on ' + state.interface if state.connected else 'disconnected'}")
+    if menu_instance:
+        # Drawn by the input dispatcher, so no key press can switch screens
+        # between the check and the draw
+        input_events.call(redraw_menu_screen)
+
+
+def redraw_menu_screen():
+    if menu_instance.current_screen in menu_screens:
+        menu_instance.draw()
+
+
+wifi_monitor.subscribe(on_wifi_change)
+
+
+def poll_wifi():
+    wifi_monitor.refresh()
+
+
+def start_wifi_monitor():
+    """Follow link changes over netlink, polling sysfs in case events are missed."""
+    sock = wifi_monitor.open()
+    if sock is not None:
+        runtime.add_reader(sock.fileno(), wifi_monitor.on_netlink)
+    runtime.every(WIFI_POLL_INTERVAL if sock is not None else WIFI_POLL_FALLBACK, poll_wifi)
+    poll_wifi()
+
+
 def draw_status_icons(draw):
     """Draw small status icons (letters) at the top left of the screen."""
     x = 2
@@ -330,6 +458,8 @@ WEATHER_CODES = {
 WEATHER_ZIPS = ["97222", "97134"]
 weather_zip_index = 0
 weather_cache = {}
+# ZIP code -> (latitude, longitude); a ZIP never moves, so one lookup each
+zip_locations = {}
 ZIP_KEYPAD = [
     ["1", "2", "3"],
     ["4", "5", "6"],
@@ -343,10 +473,7 @@ zip_col = 0
 # --- NYT Top Stories ---
 nyt_stories = []
 current_story_index = 0
-story_lines = []          # Wrapped lines of the currently viewed story
-story_line_h = 0          # Height of a single line
-story_offset = 0          # Current scroll offset in pixels
-story_max_offset = 0      # Maximum allowed offset
+story_view = None         # ScrollView of the currently viewed story
 story_render = None       # Function used to re-render the story view
 try:
     from nyt_config import NYT_API_KEY
@@ -358,6 +485,7 @@ IMAGES_DIR = os.path.join(os.path.dirname(__file__), "images")
 os.makedirs(IMAGES_DIR, exist_ok=True)
 gallery_images = []
 gallery_index = 0
+gallery_cache = {}  # path -> pre-converted RGB565 frame
 
 # --- Notes Directory ---
 NOTES_DIR = os.path.join(os.path.dirname(__file__), "notes")
@@ -366,10 +494,7 @@ ATTEMPT_LOG_PATH = os.path.join(NOTES_DIR, "attempt.txt")
 
 # --- Web Browser ---
 web_url = "https://example.com"
-web_lines = []
-web_line_h = 0
-web_offset = 0
-web_max_offset = 0
+web_view = None  # ScrollView of the loaded page
 web_keyboard_visible = True
 web_keyboard_state = 1
 web_row = 1
@@ -416,11 +541,26 @@ def load_settings():
 # --- IRC Chat ---
 IRC_SERVER = "192.168.0.81"
 IRC_PORT = 6667
+if os.environ.get("MINI_OS_IRC"):
+    # host:port override, e.g. benchmarks/irc_server.py on 127.0.0.1:6667
+    IRC_SERVER, _, _port = os.environ["MINI_OS_IRC"].rpartition(":")
+    IRC_PORT = int(_port)
 IRC_CHANNEL = "#pet"
 IRC_NICK = "birdie"
-irc_socket = None
-irc_thread = None
-chat_messages = []
+IRC_CONNECT_TIMEOUT = 10
+CHAT_SCROLLBACK = 100  # messages kept for the chat screen
+chat_messages = deque(maxlen=CHAT_SCROLLBACK)
+# Every channel message is kept here; the chat screen pages back through it
+CHAT_LOG_FILE = os.environ.get(
+    "MINI_OS_CHAT_LOG", os.path.join(os.path.dirname(__file__), "logs", "chat.log")
+)
+CHAT_PAGE_STEP = 3  # messages scrolled per joystick step
+# Line number just past the newest message shown, or None to follow new ones
+chat_history_end = None
+# Incoming messages redraw the chat at most this often (seconds)
+CHAT_REDRAW_INTERVAL = 0.25
+chat_redraw_pending = False
+chat_last_redraw = 0.0
 
 # IRC typing state
 irc_typing = False
@@ -434,52 +574,26 @@ bt_pairing_result = None
 bt_pairing_cancel = False
 
 # --- Scrollable Message ---
-message_lines = []
-message_line_h = 0
-message_offset = 0
-message_max_offset = 0
+message_view = None
 message_render = None
 
 
-def wrap_text(text, font, max_width, draw):
+def wrap_text(text, font, max_width, draw=None):
     """Return a list of lines wrapped to fit within max_width."""
-    lines = []
-    for line in text.split("\n"):
-        words = line.split()
-        current = ""
-        for word in words:
-            test = f"{current} {word}".strip()
-            width = draw.textbbox((0, 0), test, font=font)[2]
-            if width <= max_width:
-                current = test
-            else:
-                if draw.textbbox((0, 0), word, font=font)[2] > max_width:
-                    if current:
-                        lines.append(current)
-                        current = ""
-                    remaining = word
-                    while remaining:
-                        prefix = ""
-                        for i in range(len(remaining), 0, -1):
-                            segment = remaining[:i]
-                            seg_width = draw.textbbox(
-                                (0, 0), segment + ("-" if i < len(remaining) else ""), font=font
-                            )[2]
-                            if seg_width <= max_width:
-                                prefix = segment
-                                break
-                        if not prefix:
-                            prefix = remaining[0]
-                            i = 1
-                        lines.append(prefix + ("-" if i < len(remaining) else ""))
-                        remaining = remaining[i:]
-                else:
-                    if current:
-                        lines.append(current)
-                    current = word
-        if current:
-            lines.append(current)
-    return lines
+    # Measured from cached glyph tables; ``draw`` is kept for existing callers
+    return text_layout.wrap_text(text, font, max_width)
+
+
+def make_text_view(text, top=25, heading=None):
+    """Wrap ``text`` in the small font into a ScrollView ending above the footer.
+
+    ``heading`` is shown in yellow as the first line and scrolls with the text.
+    """
+    lines = wrap_text(text, font_small, DISPLAY_WIDTH - 10)
+    if heading is not None:
+        lines.insert(0, (heading, (255, 255, 0)))
+    line_h = font_small.getbbox("A")[3] + 2
+    return ScrollView(lines, font_small, line_h, (0, top, DISPLAY_WIDTH, DISPLAY_HEIGHT - 10))
 
 
 def compute_max_visible_items(font):
@@ -515,15 +629,106 @@ class Menu:
         self.max_visible_items = compute_max_visible_items(self.font)
         # Optional pre-wrapped item text for variable-height lists
         self.item_lines = None
+        # Rendered frames keyed by _frame_key(), most recently used last.
+        # Each entry is [image, selected index drawn on it, row line height].
+        self.frames = OrderedDict()
+        self.max_cached_frames = 8
+
+    @property
+    def current_screen(self):
+        return self._current_screen
+
+    @current_screen.setter
+    def current_screen(self, name):
+        # Give the registry a chance to run the old screen's exit hook and
+        # the new one's enter hook
+        if job_cancelled():
+            return  # a cancelled background job may not take the screen back
+        old = getattr(self, "_current_screen", None)
+        self._current_screen = name
+        screens.switch(old, name)
+
+    def _frame_key(self, wifi):
+        """Return the key for everything besides the selection that shapes a frame."""
+        font_key = (getattr(self.font, "path", None), getattr(self.font, "size", None))
+        if font_key == (None, None):
+            font_key = id(self.font)
+        return (
+            tuple(self.items),
+            font_key,
+            current_color_scheme_name,
+            self.current_screen,
+            self.view_start,
+            self.max_visible_items,
+            wifi,
+        )
+
+    def _retained(self):
+        """Return True if this screen uses the uniform rows that can be repainted."""
+        return self.current_screen != "font_menu" and not (
+            self.current_screen == "bluetooth_list" and self.item_lines
+        )
+
+    def _row_box(self, i, line_height):
+        """Return the rectangle covered by visible row ``i`` including its highlight."""
+        y = 25 + (i - self.view_start) * (line_height + 4)
+        return (0, y - 2, DISPLAY_WIDTH, y + line_height + 3)
+
+    def _draw_row(self, draw, i, line_height):
+        """Paint row ``i`` in place, highlighted if it is the selected item."""
+        left, top, right, bottom = self._row_box(i, line_height)
+        y = top + 2
+        draw.rectangle([(left, top), (right - 1, bottom - 1)], fill=current_color_scheme["background"])
+        text_color = current_color_scheme["text"]
+        if i == self.selected_item:
+            text_color = current_color_scheme["highlight_text"]
+            draw.rectangle(
+                [(2, y - 2), (DISPLAY_WIDTH - 2, y + line_height + 2)],
+                fill=current_color_scheme["highlight_bg"],
+            )
+        draw.text((5, y), self.items[i], font=self.font, fill=text_color)
+
+    def _show_cached(self, key):
+        """Show the cached frame for ``key`` if there is one, moving its highlight.
+
+        Only the rows whose selection state changed are repainted; everything
+        else (status icons, header, other rows) is reused as is.
+        """
+        entry = self.frames.get(key)
+        if entry is None:
+            return False
+        self.frames.move_to_end(key)
+        img, drawn, line_height = entry
+        if drawn != self.selected_item:
+            draw = text_cache.Draw(img)
+            visible = range(self.view_start, min(len(self.items), self.view_start + self.max_visible_items))
+            # Clear the old row first: its highlight shares a pixel row with its neighbours
+            for i in (drawn, self.selected_item):
+                if i in visible:
+                    self._draw_row(draw, i, line_height)
+            entry[1] = self.selected_item
+        # The display worker keeps a reference, so never hand it the cached image
+        thread_safe_display(img.copy())
+        return True
+
+    def invalidate(self):
+        """Drop all cached frames so the next draw renders from scratch."""
+        self.frames.clear()
 
     def draw(self):
         if self.current_screen == "font_menu":
             self.draw_font_menu()
             return
 
+        retained = self._retained()
+        if retained:
+            key = self._frame_key(is_wifi_connected())
+            if self._show_cached(key):
+                return
+
         # Create a new blank image using the active background color
         img = Image.new('RGB', (DISPLAY_WIDTH, DISPLAY_HEIGHT), color=current_color_scheme["background"])
-        draw = ImageDraw.Draw(img)
+        draw = text_cache.Draw(img)
 
         # Draw status icons and optional header text
         header_x = draw_status_icons(draw)
@@ -576,12 +781,17 @@ class Menu:
                 draw.text((5, y_offset), item, font=self.font, fill=text_color)
                 y_offset += line_height + 4  # Consistent line spacing
 
+        if retained:
+            self.frames[key] = [img, self.selected_item, line_height]
+            while len(self.frames) > self.max_cached_frames:
+                self.frames.popitem(last=False)
+            img = img.copy()
         thread_safe_display(img) # Send the PIL image to the display
 
     def draw_font_menu(self):
         """Draw font selection menu with sample text."""
         img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color=current_color_scheme["background"])
-        draw = ImageDraw.Draw(img)
+        draw = text_cache.Draw(img)
         draw.text((5, 2), "Select Font", font=font_large, fill=current_color_scheme["header"])
         draw.line([(0, 18), (DISPLAY_WIDTH, 18)], fill=current_color_scheme["text"])
 
@@ -624,6 +834,8 @@ class Menu:
             self.view_start = self.selected_item
         elif self.selected_item >= self.view_start + self.max_visible_items:
             self.view_start = self.selected_item - self.max_visible_items + 1
+        if self._retained() and self._show_cached(self._frame_key(wifi_connected)):
+            return
         self.draw() # Redraw menu after navigation
 
     def get_selected_item(self):
@@ -631,7 +843,7 @@ class Menu:
 
     def display_message_screen(self, title, message, delay=3, clear_after=True):
         img = Image.new('RGB', (DISPLAY_WIDTH, DISPLAY_HEIGHT), color=current_color_scheme["background"])
-        draw = ImageDraw.Draw(img)
+        draw = text_cache.Draw(img)
         draw.text((5, 5), title, font=font_large, fill=current_color_scheme["title"])
         max_width = DISPLAY_WIDTH - 10
         lines = wrap_text(message, font_medium, max_width, draw)
@@ -649,359 +861,175 @@ class Menu:
         img = Image.new('RGB', (DISPLAY_WIDTH, DISPLAY_HEIGHT), color=current_color_scheme["background"])
         thread_safe_display(img)
 
+# --- Input Events and Background Jobs ---
+# Timers, subprocess pipes and the IRC socket share one event loop, run on
+# the main thread once the menu is up. Its callbacks must never block.
+runtime = Runtime()
+
+# Slow actions run here so the input dispatcher keeps draining events
+worker_pool = WorkerPool(workers=2, max_pending=4)
+foreground_job = None  # slow action started from input, cancelled by KEY3
+foreground_screen = None  # screen the slow action was started from
+swallow_release = set()  # pins whose release belonged to a cancel press
+
+
+def run_in_background(func, *args, on_cancel=None):
+    """Run a slow action on the worker pool instead of the input thread.
+
+    Until it finishes other input is ignored, except KEY3 which cancels it.
+    """
+    global foreground_job, foreground_screen
+    job = worker_pool.submit(func, *args, on_cancel=on_cancel)
+    if job is None:
+        print(f"Worker pool busy, skipped {func.__name__}")
+        return None
+    foreground_job = job
+    foreground_screen = menu_instance.current_screen
+    return job
+
+
+def cancel_foreground_job():
+    """Cancel the slow action and go back to the screen it was started from.
+
+    The job may keep running until its blocking call returns, but the input
+    is free again at once and anything it draws or switches to afterwards
+    is dropped (see :func:`job_cancelled`).
+    """
+    global foreground_job
+    job, foreground_job = foreground_job, None
+    job.cancel()
+    menu_instance.current_screen = foreground_screen
+    screens.render(foreground_screen)
+
+
+def background_busy():
+    """Return True while a slow action started from input is running."""
+    return foreground_job is not None and not foreground_job.done.is_set()
+
+
+def job_cancelled():
+    """Return True if called from a background job that has been cancelled."""
+    job = worker_pool.current()
+    return job is not None and job.cancelled
+
+
 # --- Button Event Handler ---
 def button_event_handler(channel):
-    current_time = time.time()
-    pin_name = next((name for name, num in BUTTON_PINS.items() if num == channel), f"Unknown Pin {channel}")
+    """GPIO edge callback: timestamp the edge and queue it for the dispatcher."""
+    level = GPIO.input(channel)
+    now = time.monotonic()
+    if input_recorder:
+        input_recorder.record(channel, level, now)
+    input_events.post(InputEvent(channel, level, now))
+
+
+def handle_button_event(event):
+    """Act on one queued edge; runs on the input dispatcher thread."""
+    current_time = event.time
+    channel = event.channel
+    pin_name = PIN_NAMES.get(channel, f"Unknown Pin {channel}")
 
     # If the menu hasn't been initialized yet, ignore events
     if menu_instance is None:
         return
 
+    if event.repeat:
+        # Auto-repeat of a key that was held when the repeater posted it
+        try:
+            if not (
+                button_states.get(pin_name)
+                and not background_busy()
+                and screens.repeat(menu_instance.current_screen, pin_name, event.repeat)
+            ):
+                key_repeater.release(channel)
+        finally:
+            key_repeater.handled()
+        return
+
+    pressed = event.level == GPIO.LOW
     # Simple debounce to prevent multiple triggers from one physical press
     if current_time - last_event_time[pin_name] < 0.2: # 200ms debounce time
+        if not pressed:
+            # A tap shorter than the debounce: the key is up, so stop
+            # repeating it even though the release isn't acted on
+            button_states[pin_name] = False
+            key_repeater.release(channel)
         return
 
-    # Only react on falling edge (button press)
-    if GPIO.input(channel) == GPIO.LOW:
+    if background_busy() or (not pressed and pin_name in swallow_release):
+        # A slow action owns the screen: keep the button state, let the
+        # screen's cancel pins (KEY3 unless it declares others) stop it
+        button_states[pin_name] = pressed
+        key_repeater.release(channel)
+        if pressed:
+            press_start_time[pin_name] = current_time
+            if screens.cancels(menu_instance.current_screen, pin_name):
+                swallow_release.add(pin_name)
+                cancel_foreground_job()
+        else:
+            swallow_release.discard(pin_name)
+        last_event_time[pin_name] = current_time
+        return
+
+    screen = menu_instance.current_screen
+    if pressed:
         button_states[pin_name] = True
         press_start_time[pin_name] = current_time
-        # print(f"[{datetime.now().strftime('%H:%M:%S')}] {pin_name} PRESSED!") # For debugging
-
-        # Perform action based on the pressed button
-        if menu_instance.current_screen == "main_menu":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_menu_selection(menu_instance.get_selected_item())
-            elif pin_name == "KEY1":
-                if menu_instance.selected_item != len(menu_instance.items) - 1:
-                    menu_instance.selected_item = len(menu_instance.items) - 1
-                    menu_instance.draw()
-            elif pin_name == "KEY2":
-                show_info()
-                menu_instance.draw()
-        elif menu_instance.current_screen == "settings":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_settings_selection(menu_instance.get_selected_item())
-            elif pin_name == "KEY1":
-                show_main_menu()
-        elif menu_instance.current_screen == "display_settings":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_display_selection(menu_instance.get_selected_item())
-            elif pin_name == "KEY1":
-                show_settings_menu()
-        elif menu_instance.current_screen == "brightness":
-            global brightness_level
-            if pin_name == "JOY_LEFT" and brightness_level > 0:
-                brightness_level = max(0, brightness_level - 10)
-                update_backlight()
-                draw_brightness_screen()
-            elif pin_name == "JOY_RIGHT" and brightness_level < 100:
-                brightness_level = min(100, brightness_level + 10)
-                update_backlight()
-                draw_brightness_screen()
-            elif pin_name == "JOY_PRESS" or pin_name == "KEY1":
-                show_display_menu()
-        elif menu_instance.current_screen == "font_menu":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_font_selection(menu_instance.get_selected_item())
-            elif pin_name == "KEY1":
-                show_display_menu()
-        elif menu_instance.current_screen == "text_size_menu":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_text_size_selection(menu_instance.get_selected_item())
-            elif pin_name == "KEY1":
-                show_display_menu()
-        elif menu_instance.current_screen == "color_scheme_menu":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_color_scheme_selection(menu_instance.get_selected_item())
-            elif pin_name == "KEY1":
-                show_display_menu()
-        elif menu_instance.current_screen == "console_color_scheme_menu":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_console_color_scheme_selection(
-                    menu_instance.get_selected_item()
-                )
-            elif pin_name == "KEY1":
-                start_console()
-        elif menu_instance.current_screen == "wifi_list":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                selection = menu_instance.get_selected_item()
-                if selection == "Back" or selection == "No Networks Found":
-                    show_settings_menu()
-                else:
-                    connect_to_wifi(selection)
-            elif pin_name == "KEY1":
-                show_settings_menu()
-        elif menu_instance.current_screen == "bluetooth_menu":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_bluetooth_menu_selection(menu_instance.get_selected_item())
-            elif pin_name == "KEY1":
-                show_settings_menu()
-        elif menu_instance.current_screen == "bluetooth_list":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                selection = menu_instance.get_selected_item()
-                if selection == "Back" or selection == "No Devices Found":
-                    show_settings_menu()
-            elif pin_name == "KEY1":
-                selection = menu_instance.get_selected_item()
-                if selection == "Back" or selection == "No Devices Found":
-                    show_settings_menu()
-                else:
-                    connect_bluetooth_device(selection)
-            elif pin_name == "KEY2":
-                selection = menu_instance.get_selected_item()
-                if selection == "Back" or selection == "No Devices Found":
-                    show_settings_menu()
-                else:
-                    connect_bluetooth_device_with_pin(selection)
-        elif menu_instance.current_screen == "bluetooth_pairing":
-            if pin_name == "KEY1":
-                global bt_pairing_cancel
-                bt_pairing_cancel = True
-        elif menu_instance.current_screen == "games":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_games_selection(menu_instance.get_selected_item())
-            elif pin_name == "KEY1":
-                show_main_menu()
-        elif menu_instance.current_screen == "utilities":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_utilities_selection(menu_instance.get_selected_item())
-            elif pin_name == "KEY1":
-                show_main_menu()
-        elif menu_instance.current_screen == "weather":
-            if pin_name in BUTTON_PINS:
-                handle_weather_input(pin_name)
-        elif menu_instance.current_screen == "zip_entry":
-            if pin_name in BUTTON_PINS:
-                handle_zip_entry_input(pin_name)
-        elif menu_instance.current_screen == "notes_menu":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS":
-                handle_notes_menu_selection(menu_instance.get_selected_item())
-            elif pin_name == "KEY1":
-                show_main_menu()
-        elif menu_instance.current_screen == "notes_list":
-            if pin_name == "JOY_UP":
-                menu_instance.navigate("up")
-            elif pin_name == "JOY_DOWN":
-                menu_instance.navigate("down")
-            elif pin_name == "JOY_PRESS" and menu_instance.items[0] != "No Notes Found":
-                view_note(menu_instance.get_selected_item())
-            elif pin_name == "KEY3":
-                show_main_menu()
-        elif menu_instance.current_screen == "note_view":
-            if pin_name == "JOY_UP":
-                scroll_note(-1)
-            elif pin_name == "JOY_DOWN":
-                scroll_note(1)
-            elif pin_name == "KEY1":
-                if current_note_file:
-                    try:
-                        with open(os.path.join(NOTES_DIR, current_note_file), "r") as f:
-                            text = f.read()
-                    except Exception:
-                        text = ""
-                    start_notes(text, current_note_file)
-            elif pin_name == "KEY2":
-                delete_current_note()
-            elif pin_name == "KEY3":
-                show_notes_list()
-        elif menu_instance.current_screen == "nyt_headline":
-            if pin_name == "JOY_UP" and current_story_index > 0:
-                draw_headline(current_story_index - 1)
-            elif pin_name == "JOY_DOWN" and current_story_index < len(nyt_stories) - 1:
-                draw_headline(current_story_index + 1)
-            elif pin_name == "KEY1":
-                draw_story_detail(current_story_index)
-            elif pin_name == "KEY3":
-                show_main_menu()
-        elif menu_instance.current_screen == "nyt_story":
-            if pin_name == "JOY_UP":
-                scroll_story(-1)
-            elif pin_name == "JOY_DOWN":
-                scroll_story(1)
-            elif pin_name == "JOY_LEFT" and current_story_index > 0:
-                draw_story_detail(current_story_index - 1)
-            elif pin_name == "JOY_RIGHT" and current_story_index < len(nyt_stories) - 1:
-                draw_story_detail(current_story_index + 1)
-            elif pin_name == "KEY1":
-                open_current_story()
-            elif pin_name == "KEY3":
-                show_top_stories()
-        elif menu_instance.current_screen == "button_game":
-            if pin_name in BUTTON_NAMES:
-                handle_game_input(pin_name)
-        elif menu_instance.current_screen == "launch_codes":
-            if pin_name in BUTTON_PINS:
-                handle_launch_input(pin_name)
-        elif menu_instance.current_screen == "snake":
-            if pin_name in BUTTON_PINS:
-                handle_snake_input(pin_name)
-        elif menu_instance.current_screen == "tetris":
-            if pin_name in BUTTON_PINS:
-                handle_tetris_input(pin_name)
-        elif menu_instance.current_screen == "rps":
-            if pin_name in BUTTON_PINS:
-                handle_rps_input(pin_name)
-        elif menu_instance.current_screen == "space_invaders":
-            if pin_name in BUTTON_PINS:
-                handle_space_invaders_input(pin_name)
-        elif menu_instance.current_screen == "vet_adventure":
-            if pin_name in BUTTON_PINS:
-                handle_vet_adventure_input(pin_name)
-        elif menu_instance.current_screen == "axe":
-            if pin_name in BUTTON_PINS:
-                handle_axe_input(pin_name)
-        elif menu_instance.current_screen == "trivia":
-            if pin_name in BUTTON_PINS:
-                handle_trivia_input(pin_name)
-        elif menu_instance.current_screen == "two_player_trivia":
-            if pin_name in BUTTON_PINS:
-                handle_two_player_trivia_input(pin_name)
-        elif menu_instance.current_screen == "hack_in":
-            if pin_name in BUTTON_PINS:
-                handle_hack_in_input(pin_name)
-        elif menu_instance.current_screen == "pico_wow":
-            if pin_name in BUTTON_PINS:
-                handle_pico_wow_input(pin_name)
-        elif menu_instance.current_screen == "gta_1997":
-            if pin_name in BUTTON_PINS:
-                handle_gta_1997_input(pin_name)
-        elif menu_instance.current_screen == "ai_cases":
-            if pin_name in BUTTON_PINS:
-                handle_ai_cases_input(pin_name)
-        elif menu_instance.current_screen == "doctor_mode":
-            if pin_name in BUTTON_PINS:
-                handle_doctor_mode_input(pin_name)
-        elif menu_instance.current_screen == "notes":
-            if pin_name in BUTTON_PINS:
-                handle_notes_input(pin_name)
-        elif menu_instance.current_screen == "novel_typer":
-            if pin_name in BUTTON_PINS:
-                handle_novel_typer_input(pin_name)
-        elif menu_instance.current_screen == "shell":
-            if pin_name in BUTTON_PINS:
-                handle_shell_input(pin_name)
-        elif menu_instance.current_screen == "sudo_password":
-            if pin_name in BUTTON_PINS:
-                handle_sudo_password_input(pin_name)
-        elif menu_instance.current_screen == "image_gallery":
-            if pin_name in ["JOY_LEFT", "JOY_RIGHT", "JOY_PRESS"]:
-                handle_gallery_input(pin_name)
-        elif menu_instance.current_screen == "scroll_message":
-            if pin_name == "JOY_UP":
-                scroll_message(-1)
-            elif pin_name == "JOY_DOWN":
-                scroll_message(1)
-            elif pin_name == "KEY3":
-                show_main_menu()
-        elif menu_instance.current_screen == "raspi_config":
-            handle_raspi_input(pin_name)
-        elif menu_instance.current_screen == "irc_chat":
-            handle_irc_chat_input(pin_name)
-        elif menu_instance.current_screen == "web_browser":
-            handle_web_browser_input(pin_name)
-        elif menu_instance.current_screen == "rdp_input":
-            handle_rdp_input(pin_name)
-        elif menu_instance.current_screen == "rdp_session":
-            handle_rdp_session_input(pin_name)
+        screens.press(screen, pin_name)
+        if screens.repeats(screen, pin_name):
+            key_repeater.press(channel, current_time)
     else: # Button released
         button_states[pin_name] = False
+        key_repeater.release(channel)
         hold_time = current_time - press_start_time.get(pin_name, current_time)
-        if menu_instance.current_screen == "shell" and pin_name == "KEY1":
-            global shell_pending_char, shell_text
-            if hold_time >= 1:
-                shell_text = shell_text[:-1]
-            elif shell_pending_char:
-                shell_text += shell_pending_char
-            shell_pending_char = None
-            draw_shell_screen()
-        elif menu_instance.current_screen == "shell" and pin_name == "KEY2":
-            if hold_time >= 1:
-                global shell_keyboard_visible
-                shell_keyboard_visible = False
-            else:
-                shell_page = (shell_page + 1) % len(SHELL_GROUP_SETS)
-                shell_selected_group = None
-                shell_group_index = 0
-            draw_shell_screen()
-        elif menu_instance.current_screen == "shell" and pin_name == "KEY3":
-            if hold_time >= 1:
-                show_main_menu()
-            else:
-                if console_mode:
-                    autocomplete_shell()
-                else:
-                    shell_enter()
-        elif (
-            menu_instance.current_screen == "shell"
-            and console_mode
-            and pin_name == "JOY_PRESS"
-        ):
-            if hold_time >= 1:
-                show_console_color_scheme_menu()
-        elif menu_instance.current_screen == "ai_cases" and pin_name == "JOY_LEFT":
-            if hold_time >= 1:
-                show_main_menu()
-        elif menu_instance.current_screen == "vet_adventure" and pin_name == "JOY_LEFT":
-            if hold_time >= 1:
-                show_main_menu()
-        # print(f"[{datetime.now().strftime('%H:%M:%S')}] {pin_name} RELEASED.") # For debugging
-    
+        screens.release(screen, pin_name, hold_time)
+
     last_event_time[pin_name] = current_time
 
 
+def dispatch_input(event):
+    """Dispatcher entry point: handle the event and time it for the latency stats."""
+    screen = menu_instance.current_screen if menu_instance else None
+    trace = latency_tracker.begin(screen, event.time)
+    try:
+        handle_button_event(event)
+    finally:
+        latency_tracker.end(trace)
+
+
+input_events = EventDispatcher(dispatch_input)
+
+
+def redraw_if_showing(screen, draw):
+    """Queue ``draw()`` on the input dispatcher, to run only if ``screen`` still shows.
+
+    Timers and readers on the event loop redraw through this, so a frame they
+    start can't land after a key press has switched to another screen.
+    """
+    def redraw():
+        if menu_instance and menu_instance.current_screen == screen:
+            draw()
+    input_events.call(redraw)
+
+input_recorder = None  # replay.Recorder when MINI_OS_RECORD is set
+# Held keys listed in a screen's repeat_pins repeat, speeding up from
+# KEY_REPEAT_RATE to KEY_REPEAT_MAX_RATE steps/s over KEY_REPEAT_RAMP seconds
+KEY_REPEAT_DELAY = 0.4
+KEY_REPEAT_RATE = 8.0
+KEY_REPEAT_MAX_RATE = 60.0
+KEY_REPEAT_RAMP = 2.5
+key_repeater = KeyRepeater(
+    input_events.post,
+    idle=display_worker.flush,
+    delay=KEY_REPEAT_DELAY,
+    rate=KEY_REPEAT_RATE,
+    max_rate=KEY_REPEAT_MAX_RATE,
+    ramp=KEY_REPEAT_RAMP,
+)
+# Filled in by register_screens() once every handler is defined
+screens = ScreenRegistry()
+# Screens drawn by Menu.draw, the ones that show the status icons
+menu_screens = set()
 
 # Global menu instance will be created in the main block.  Defining it here
 # prevents NameError in callbacks triggered before initialization.
@@ -1051,6 +1079,7 @@ def start_image_gallery():
     """Load images from the images directory and display the first one."""
     global gallery_images, gallery_index
     stop_scrolling()
+    gallery_cache.clear()
     try:
         gallery_images = [
             f for f in sorted(os.listdir(IMAGES_DIR))
@@ -1074,12 +1103,19 @@ def show_gallery_image():
     if not gallery_images:
         return
     path = os.path.join(IMAGES_DIR, gallery_images[gallery_index])
+    if path in gallery_cache:
+        thread_safe_display(gallery_cache[path])
+        return
     try:
         img = Image.open(path).convert("RGB")
         img = img.resize((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+        if partial_display.use_numpy:
+            # Convert once so flipping back to this image skips decode and resize
+            img = to_rgb565(img)
+            gallery_cache[path] = img
     except Exception:
         img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), "black")
-        draw = ImageDraw.Draw(img)
+        draw = text_cache.Draw(img)
         draw.text((5, 5), "Load error", font=font_small, fill=(255, 0, 0))
     thread_safe_display(img)
 
@@ -1102,14 +1138,14 @@ def show_top_stories():
     stop_scrolling()
     global nyt_stories
     try:
-        resp = requests.get(
-            f"https://api.nytimes.com/svc/topstories/v2/home.json?api-key={NYT_API_KEY}",
-            timeout=5,
+        data = http_client.get_json(
+            f"https://api.nytimes.com/svc/topstories/v2/home.json?api-key={NYT_API_KEY}"
         )
-        data = resp.json()
         nyt_stories = data.get("results", [])[:20]
     except Exception:
         nyt_stories = []
+    if job_cancelled():
+        return
 
     if not nyt_stories:
         menu_instance.display_message_screen("NYT", "Failed to fetch stories", delay=3)
@@ -1127,7 +1163,7 @@ def draw_headline(index):
     story = nyt_stories[index]
     title = story.get("title", "")
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
     max_width = DISPLAY_WIDTH - 10
     lines = wrap_text(title, font_medium, max_width, draw)
     line_h = draw.textbbox((0, 0), "A", font=font_medium)[3] + 2
@@ -1138,12 +1174,12 @@ def draw_headline(index):
         y += line_h
     footer = f"{index + 1}/{len(nyt_stories)} 1=Read 3=Back"
     draw.text((5, DISPLAY_HEIGHT - 10), footer, font=font_small, fill=(0, 255, 255))
-    device.display(img)
+    thread_safe_display(img)
 
 
 def draw_story_detail(index):
     """Display selected story with manual scrolling."""
-    global story_lines, story_line_h, story_offset, story_max_offset, story_render, current_story_index
+    global story_view, story_render, current_story_index
     stop_scrolling()
     current_story_index = index
     menu_instance.current_screen = "nyt_story"
@@ -1151,26 +1187,16 @@ def draw_story_detail(index):
     header = "NYT Story"
     text = f"{story.get('title','')}\n\n{story.get('abstract','')}"
 
-    dummy_img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT))
-    dummy_draw = ImageDraw.Draw(dummy_img)
-    max_width = DISPLAY_WIDTH - 10
-    story_lines = wrap_text(text, font_small, max_width, dummy_draw)
-    story_line_h = dummy_draw.textbbox((0, 0), "A", font=font_small)[3] + 2
-    story_offset = 0
-    available_h = DISPLAY_HEIGHT - 35
-    story_max_offset = max(0, len(story_lines) * story_line_h - available_h)
+    story_view = make_text_view(text)
 
     def render():
         img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-        draw = ImageDraw.Draw(img)
+        draw = text_cache.Draw(img)
         draw.text((5, 5), header, font=font_large, fill=(255, 255, 0))
-        y = 25 - story_offset
-        for line in story_lines:
-            draw.text((5, y), line, font=font_small, fill=(255, 255, 255))
-            y += story_line_h
+        story_view.render(img)
         # Only show the back hint; opening a link isn't supported here
         draw.text((5, DISPLAY_HEIGHT - 10), "1=Menu 3=Back", font=font_small, fill=(0, 255, 255))
-        device.display(img)
+        thread_safe_display(img)
 
     story_render = render
     story_render()
@@ -1178,15 +1204,8 @@ def draw_story_detail(index):
 
 def scroll_story(direction):
     """Scroll the currently viewed story up (-1) or down (1)."""
-    global story_offset
-    if not story_render:
-        return
-    story_offset += direction * story_line_h
-    if story_offset < 0:
-        story_offset = 0
-    if story_offset > story_max_offset:
-        story_offset = story_max_offset
-    story_render()
+    if story_render and story_view.scroll(direction):
+        story_render()
 
 
 def open_current_story():
@@ -1291,12 +1310,16 @@ def show_bluetooth_devices():
         nonlocal devices
         devices = scan_devices()
 
-    scan_thread = threading.Thread(target=do_scan)
+    scan_thread = threading.Thread(target=do_scan, name="bt-scan")
     scan_thread.start()
 
     dot_cycle = ["", ".", "..", "..."]
     idx = 0
     while scan_thread.is_alive():
+        if job_cancelled():
+            # Leave the scan to finish on its own and drop the result
+            show_bluetooth_menu()
+            return
         msg = f"Searching for bluetooth devices{dot_cycle[idx % len(dot_cycle)]}"
         menu_instance.display_message_screen("Bluetooth", msg, delay=0.5, clear_after=False)
         idx += 1
@@ -1476,7 +1499,7 @@ def start_bluetooth_pairing():
                 bt_pairing_proc.terminate()
             bt_pairing_proc = None
 
-    t = threading.Thread(target=pair_thread)
+    t = threading.Thread(target=pair_thread, name="bt-pair")
     t.start()
 
     menu_instance.current_screen = "bluetooth_pairing"
@@ -1540,26 +1563,16 @@ def toggle_wifi():
 
 def show_scroll_message(title, message):
     """Display a scrollable message screen."""
-    global message_lines, message_line_h, message_offset, message_max_offset, message_render
+    global message_view, message_render
     stop_scrolling()
     menu_instance.current_screen = "scroll_message"
-    dummy_img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT))
-    dummy_draw = ImageDraw.Draw(dummy_img)
-    max_width = DISPLAY_WIDTH - 10
-    message_lines = wrap_text(message, font_small, max_width, dummy_draw)
-    message_line_h = dummy_draw.textbbox((0, 0), "A", font=font_small)[3] + 2
-    message_offset = 0
-    available_h = DISPLAY_HEIGHT - 35
-    message_max_offset = max(0, len(message_lines) * message_line_h - available_h)
+    message_view = make_text_view(message)
 
     def render():
         img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-        draw = ImageDraw.Draw(img)
+        draw = text_cache.Draw(img)
         draw.text((5, 5), title, font=font_large, fill=(255, 255, 0))
-        y = 25 - message_offset
-        for line in message_lines:
-            draw.text((5, y), line, font=font_small, fill=(255, 255, 255))
-            y += message_line_h
+        message_view.render(img)
         draw.text((5, DISPLAY_HEIGHT - 10), "1=Menu 3=Back", font=font_small, fill=(0, 255, 255))
         thread_safe_display(img)
 
@@ -1569,110 +1582,136 @@ def show_scroll_message(title, message):
 
 def scroll_message(direction):
     """Scroll the current message up (-1) or down (1)."""
-    global message_offset
-    if not message_render:
-        return
-    message_offset += direction * message_line_h
-    if message_offset < 0:
-        message_offset = 0
-    if message_offset > message_max_offset:
-        message_offset = message_max_offset
-    message_render()
+    if message_render and message_view.scroll(direction):
+        message_render()
 
 # --- IRC Chat Functions ---
 
 def connect_irc():
-    """Connect to the IRC server and start listener thread."""
-    global irc_socket, irc_thread
-    try:
-        irc_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        irc_socket.connect((IRC_SERVER, IRC_PORT))
-        irc_socket.sendall(f"NICK {IRC_NICK}\r\n".encode())
-        irc_socket.sendall(f"USER {IRC_NICK} 0 * :{IRC_NICK}\r\n".encode())
-        irc_socket.sendall(f"JOIN {IRC_CHANNEL}\r\n".encode())
-    except Exception as e:
-        err_msg = f"IRC connection failed: {e}"
-        print(err_msg)
-        chat_messages.append(err_msg)
-        if len(chat_messages) > 100:
-            chat_messages.pop(0)
-        irc_socket = None
-        return
+    """Connect to IRC in the background, or retry now if waiting to reconnect."""
+    irc_client.start()
 
-    def listen():
-        buffer = ""
-        while True:
-            try:
-                data = irc_socket.recv(4096)
-                if not data:
-                    break
-                buffer += data.decode(errors="ignore")
-                while "\r\n" in buffer:
-                    line, buffer = buffer.split("\r\n", 1)
-                    handle_irc_line(line)
-            except Exception as e:
-                err_msg = f"IRC listener error: {e}"
-                print(err_msg)
-                chat_messages.append(err_msg)
-                if len(chat_messages) > 100:
-                    chat_messages.pop(0)
-                break
 
-    irc_thread = threading.Thread(target=listen, daemon=True)
-    irc_thread.start()
+def add_chat_line(text):
+    """Append ``text`` to the scrollback and redraw the chat if it is showing."""
+    chat_messages.append(text)
+    request_chat_redraw()
 
 
-def handle_irc_line(line):
-    """Process a single line received from IRC."""
-    if line.startswith("PING"):
-        token = line.split(":", 1)[1] if ":" in line else ""
-        try:
-            irc_socket.sendall(f"PONG :{token}\r\n".encode())
-        except Exception as e:
-            print(f"Failed to send PONG: {e}")
+def on_irc_message(nick, message):
+    chat_log.append(nick, message)
+    add_chat_line(f"{nick}> {message}")
+
+
+def load_chat_history():
+    """Fill the scrollback with the newest messages from the chat log."""
+    chat_messages.extend(f"{nick}> {text}" for _, nick, text in chat_log.tail(CHAT_SCROLLBACK))
+
+
+def on_irc_status(text):
+    # Don't fill the scrollback with the same failure on every retry
+    if not chat_messages or chat_messages[-1] != text:
+        add_chat_line(text)
+
+
+chat_log = ChatLog(CHAT_LOG_FILE)
+irc_client = IrcClient(
+    runtime, IRC_SERVER, IRC_PORT, IRC_NICK, IRC_CHANNEL,
+    on_message=on_irc_message, on_status=on_irc_status,
+    connect_timeout=IRC_CONNECT_TIMEOUT,
+)
+
+
+def request_chat_redraw():
+    """Redraw the chat view at most once per CHAT_REDRAW_INTERVAL.
+
+    A burst of messages is folded into one frame.  The event loop only times
+    it; the frame is drawn on the input dispatcher, so a key press can't open
+    the keyboard between the screen check and the draw.
+    """
+    global chat_redraw_pending
+    if chat_redraw_pending:
         return
+    chat_redraw_pending = True
+    delay = max(0.0, chat_last_redraw + CHAT_REDRAW_INTERVAL - time.monotonic())
+    runtime.call_later(delay, queue_chat_redraw)
+
+
+def queue_chat_redraw():
+    global chat_redraw_pending
+    if not input_events.call(redraw_chat):
+        chat_redraw_pending = False  # input queue full; the next message retries
 
-    parts = line.split()
-    if len(parts) >= 4 and parts[1] == "PRIVMSG" and parts[2] == IRC_CHANNEL:
-        prefix = parts[0]
-        message = line.split(" :", 1)[1] if " :" in line else ""
-        nick = prefix.split("!")[0][1:] if prefix.startswith(":") else prefix
-        chat_messages.append(f"{nick}> {message}")
-        if len(chat_messages) > 100:
-            chat_messages.pop(0)
-        if menu_instance and menu_instance.current_screen == "irc_chat":
-            draw_chat_screen()
+
+def redraw_chat():
+    global chat_redraw_pending, chat_last_redraw
+    chat_redraw_pending = False
+    if menu_instance and menu_instance.current_screen == "irc_chat" and not irc_typing:
+        chat_last_redraw = time.monotonic()
+        draw_chat_screen()
 
 
 def draw_chat_screen():
     """Render the chat screen."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
 
     max_width = DISPLAY_WIDTH - 10
     line_h = draw.textbbox((0, 0), "A", font=font_small)[3] + 2
     available_h = DISPLAY_HEIGHT - 15
 
-    lines = []
-    for msg in chat_messages:
-        lines.extend(wrap_text(msg, font_small, max_width, draw))
-
+    # Wrap from the newest message back and stop once the screen is full;
+    # the copy is taken in one step while IRC may be appending
     max_lines = available_h // line_h
-    visible = lines[-max_lines:]
+    if chat_history_end is None:
+        messages = list(chat_messages)
+        tips = "Press=Type 3=Back"
+    else:
+        # Paging back: read just the messages that can fit from the log
+        messages = [
+            f"{nick}> {text}"
+            for _, nick, text in chat_log.read(chat_history_end - max_lines, chat_history_end)
+        ]
+        tips = f"{chat_history_end}/{len(chat_log)} Dn=Newer"
+    visible = []
+    for msg in reversed(messages):
+        visible[:0] = wrap_text(msg, font_small, max_width, draw)
+        if len(visible) >= max_lines:
+            break
+    visible = visible[-max_lines:]
 
     y = 5
     for line in visible:
         draw.text((5, y), line, font=font_small, fill=(255, 255, 255))
         y += line_h
 
-    draw.text((5, DISPLAY_HEIGHT - 10), "Press=Type 3=Back", font=font_small, fill=(0, 255, 255))
+    draw.text((5, DISPLAY_HEIGHT - 10), tips, font=font_small, fill=(0, 255, 255))
     thread_safe_display(img)
 
 
+def scroll_chat(direction):
+    """Page back (-1) or forward (1) through the chat log; return True if moved."""
+    global chat_history_end
+    total = len(chat_log)
+    if chat_history_end is None:
+        if direction > 0 or not total:
+            return False
+        end = total
+    else:
+        end = chat_history_end
+    end += direction * CHAT_PAGE_STEP
+    # Scrolling past the newest logged message goes back to following the chat
+    end = None if end >= total else max(1, end)
+    if end == chat_history_end:
+        return False
+    chat_history_end = end
+    return True
+
+
 def draw_irc_input_screen():
     """Display the on-screen keyboard for IRC input."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
 
     max_width = DISPLAY_WIDTH - 10
     line_h = draw.textbbox((0, 0), "A", font=font_medium)[3] + 2
@@ -1686,29 +1725,7 @@ def draw_irc_input_screen():
         draw.text((5, y), line, font=font_medium, fill=(255, 255, 255))
         y += line_h
 
-    row_h = (DISPLAY_HEIGHT - kb_y - tips_height) // len(IRC_KEY_LAYOUT)
-    key_w = DISPLAY_WIDTH // 10
-    for r, row in enumerate(IRC_KEY_LAYOUT):
-        if r == len(IRC_KEY_LAYOUT) - 1 and len(row) == 1:
-            offset_x = 5
-            this_key_w = DISPLAY_WIDTH - offset_x * 2
-        else:
-            offset_x = (DISPLAY_WIDTH - len(row) * key_w) // 2
-            this_key_w = key_w
-        for c, ch in enumerate(row):
-            x = offset_x + c * this_key_w
-            y = kb_y + r * row_h
-            rect = (x + 1, y + 1, x + this_key_w - 2, y + row_h - 2)
-            if r == typer_row and c == typer_col:
-                draw.rectangle(rect, fill=(0, 255, 0))
-                text_color = (0, 0, 0)
-            else:
-                draw.rectangle(rect, outline=(255, 255, 255))
-                text_color = (255, 255, 255)
-            bbox = draw.textbbox((0, 0), ch, font=font_small)
-            tx = x + (this_key_w - (bbox[2] - bbox[0])) // 2
-            ty = y + (row_h - (bbox[3] - bbox[1])) // 2
-            draw.text((tx, ty), ch, font=font_small, fill=text_color)
+    keyboard.draw(img, IRC_KEY_LAYOUT, kb_y, DISPLAY_HEIGHT - tips_height, typer_row, typer_col)
 
     tips = "Press=Send 1=Select 2=Shift 3=Cancel"
     draw.text((5, DISPLAY_HEIGHT - tips_height + 2), tips, font=font_small, fill=(0, 255, 255))
@@ -1733,14 +1750,11 @@ def send_irc_message(msg):
     """Send a message to the IRC channel."""
     if not msg:
         return
-    try:
-        if irc_socket:
-            irc_socket.sendall(f"PRIVMSG {IRC_CHANNEL} :{msg}\r\n".encode())
-    except Exception as e:
-        chat_messages.append(f"Send failed: {e}")
-    chat_messages.append(f"{IRC_NICK}> {msg}")
-    if len(chat_messages) > 100:
-        chat_messages.pop(0)
+    if irc_client.send(f"PRIVMSG {IRC_CHANNEL} :{msg}"):
+        chat_log.append(IRC_NICK, msg)
+        chat_messages.append(f"{IRC_NICK}> {msg}")
+    else:
+        chat_messages.append("Not connected, message not sent")
 
 
 def handle_irc_chat_input(pin_name):
@@ -1752,6 +1766,9 @@ def handle_irc_chat_input(pin_name):
             start_irc_input()
         elif pin_name == "KEY3":
             show_main_menu()
+        elif pin_name in ("JOY_UP", "JOY_DOWN"):
+            if scroll_chat(-1 if pin_name == "JOY_UP" else 1):
+                draw_chat_screen()
     else:
         if pin_name == "JOY_LEFT" and typer_col > 0:
             typer_col -= 1
@@ -1789,84 +1806,197 @@ def handle_irc_chat_input(pin_name):
 def start_chat():
     """Enter the IRC chat view."""
     stop_scrolling()
-    if irc_socket is None:
+    if not irc_client.connected:
         connect_irc()
     menu_instance.current_screen = "irc_chat"
-    global irc_typing, irc_input_text
+    global irc_typing, irc_input_text, chat_history_end
     irc_typing = False
+    chat_history_end = None
     irc_input_text = ""
     draw_chat_screen()
 
+def start_metrics():
+    """Record system readings every METRICS_INTERVAL on the event loop."""
+    global metrics
+    if metrics is not None:
+        return
+    try:
+        metrics = MetricsStore(metric_names(sysinfo.cpu_count()), METRICS_FILE)
+    except (OSError, ValueError) as e:
+        print(f"Metrics history not saved: {e}")
+        metrics = MetricsStore(metric_names(sysinfo.cpu_count()))
+    runtime.every(METRICS_INTERVAL, Sampler(sysinfo, metrics).sample, delay=0)
+
+
+def draw_sparkline(draw, box, values, color, low=None, high=None):
+    """Plot ``values`` across ``box``, one column per pixel; NaN leaves a gap.
+
+    Each column shows the highest value that falls into it, so a short spike
+    survives the squeeze.  Without ``low``/``high`` the range fits the data.
+    """
+    left, top, right, bottom = box
+    width = right - left
+    count = len(values)
+    columns = []
+    for x in range(width):
+        chunk = values[x * count // width:max(x * count // width + 1, (x + 1) * count // width)]
+        chunk = [v for v in chunk if not math.isnan(v)]
+        columns.append(max(chunk) if chunk else None)
+    draw.line([(left, bottom), (right - 1, bottom)], fill=(60, 60, 60))
+    seen = [v for v in columns if v is not None]
+    if not seen:
+        return
+    low = min(seen) if low is None else low
+    high = max(seen) if high is None else high
+    span = (high - low) or 1
+    previous = None
+    for x, value in enumerate(columns):
+        if value is None:
+            previous = None
+            continue
+        y = bottom - round((min(max(value, low), high) - low) / span * (bottom - top))
+        if previous is None:
+            draw.point((left + x, y), fill=color)
+        else:
+            draw.line([(left + x - 1, previous), (left + x, y)], fill=color)
+        previous = y
+
+
+def monitor_series(name, window):
+    if name == "disk_io":
+        read = metrics.series("disk_read", window)
+        write = metrics.series("disk_write", window)
+        return [r + w for r, w in zip(read, write)]
+    return metrics.series(name, window)
+
+
+# label, metric, value format, graph range (None fits the data), colour
+MONITOR_ROWS = (
+    ("Temp", "temp", "{:.0f}C", (30, 85), (255, 96, 64)),
+    ("CPU", "cpu", "{:.0f}%", (0, 100), (64, 255, 64)),
+    ("Load", "load", "{:.2f}", (0, None), (64, 200, 255)),
+    ("Freq", "freq", "{:.0f}M", (None, None), (255, 255, 64)),
+    ("Mem", "mem", "{:.0f}%", (0, 100), (200, 128, 255)),
+    ("I/O", "disk_io", "{:.0f}K", (0, None), (255, 160, 200)),
+)
+# Firmware throttling bits that are active right now
+THROTTLED_NOW = 0xF
+
+
+def draw_system_monitor():
+    window = METRIC_WINDOWS[monitor_window][0]
+    img = Image.new('RGB', (DISPLAY_WIDTH, DISPLAY_HEIGHT), color='black')
+    draw = text_cache.Draw(img)
+    title = f"Monitor {window}"
+    draw.text((5, 3), title, font=font_medium, fill=(255, 255, 0))
+    title_end = 5 + draw.textbbox((0, 0), title, font=font_medium)[2]
+    right = DISPLAY_WIDTH - 3
+    throttled = metrics.latest("throttled")
+    if throttled is not None and int(throttled) & THROTTLED_NOW:
+        thr_width = draw.textbbox((0, 0), "THR", font=font_small)[2]
+        right -= thr_width
+        draw.text((right, 5), "THR", font=font_small, fill=(255, 0, 0))
+        right -= 4
+    disk = sysinfo.disk("/")
+    if disk:
+        disk_str = f"{disk[0] // (1024**3)}/{disk[1] // (1024**3)}G"
+        x = right - draw.textbbox((0, 0), disk_str, font=font_small)[2]
+        # The throttling flag matters more than the disk label when both don't fit
+        if x >= title_end + 4:
+            draw.text((x, 5), disk_str, font=font_small, fill=(160, 160, 160))
+
+    graph_left = 68
+    y = 22
+    for label, name, fmt, (low, high), color in MONITOR_ROWS:
+        values = monitor_series(name, window)
+        # The number is always the newest reading, whatever the graph spans
+        recent = values if window == METRIC_WINDOWS[0][0] else monitor_series(name, METRIC_WINDOWS[0][0])
+        latest = next((v for v in reversed(recent[-3:]) if not math.isnan(v)), None)
+        text = fmt.format(latest) if latest is not None else "--"
+        draw.text((5, y), label, font=font_small, fill=(255, 255, 255))
+        draw.text((36, y), text, font=font_small, fill=(255, 255, 255))
+        draw_sparkline(draw, (graph_left, y, DISPLAY_WIDTH - 3, y + 11), values, color, low, high)
+        y += 15
+
+    draw.text((5, DISPLAY_HEIGHT - 10), "1=Window 3=Back", font=font_small, fill=(0, 255, 255))
+    thread_safe_display(img)
+
+
 def run_system_monitor():
-    """Continuously display CPU temperature, load and memory usage until the user exits."""
-    next_update = 0
-    while True:
-        if button_states.get("KEY3"):
-            break
-        now = time.time()
-        if now >= next_update:
-            next_update = now + 1
-            # CPU temperature using vcgencmd if available
-            try:
-                output = subprocess.check_output(["vcgencmd", "measure_temp"]).decode()
-                temp = output.strip().replace("temp=", "").replace("'C", "")
-            except Exception:
-                temp = "N/A"
+    """Graph temperature, CPU, load, frequency, memory and disk I/O until KEY3.
 
-            # CPU load (1 minute average)
-            try:
-                load = os.getloadavg()[0]
-            except Exception:
-                load = 0.0
+    KEY1 cycles between the last 2 minutes, hour and day.
+    """
+    global monitor_window
+    stop_scrolling()
+    start_metrics()
+    monitor_window = 0
+    menu_instance.current_screen = "system_monitor"
+    draw_system_monitor()
 
-            # Current CPU frequency in MHz
-            try:
-                with open("/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq") as f:
-                    cpu_freq = int(f.read().strip()) / 1000  # kHz -> MHz
-            except Exception:
-                cpu_freq = None
 
-            # Disk usage for root filesystem
-            try:
-                usage = shutil.disk_usage("/")
-                disk_str = f"{usage.used // (1024**3)}/{usage.total // (1024**3)}GB"
-            except Exception:
-                disk_str = "N/A"
+def cycle_monitor_window():
+    global monitor_window
+    monitor_window = (monitor_window + 1) % len(METRIC_WINDOWS)
+    draw_system_monitor()
 
-            # Memory usage from /proc/meminfo
-            mem_total = 0
-            mem_available = 0
-            try:
-                with open("/proc/meminfo") as f:
-                    for line in f:
-                        if line.startswith("MemTotal"):
-                            mem_total = int(line.split()[1])
-                        elif line.startswith("MemAvailable"):
-                            mem_available = int(line.split()[1])
-            except Exception:
-                pass
-            mem_used = mem_total - mem_available
-            if mem_total:
-                mem_str = f"{mem_used//1024}/{mem_total//1024}MB"
-            else:
-                mem_str = "N/A"
 
-            img = Image.new('RGB', (DISPLAY_WIDTH, DISPLAY_HEIGHT), color='black')
-            draw = ImageDraw.Draw(img)
-            draw.text((5, 5), "System Monitor", font=font_large, fill=(255, 255, 0))
-            draw.text((5, 25), f"Temp: {temp}C", font=font_medium, fill=(255, 255, 255))
-            draw.text((5, 40), f"Load: {load:.2f}", font=font_medium, fill=(255, 255, 255))
-            if cpu_freq is not None:
-                draw.text((5, 55), f"Freq: {cpu_freq:.0f}MHz", font=font_medium, fill=(255, 255, 255))
-            else:
-                draw.text((5, 55), "Freq: N/A", font=font_medium, fill=(255, 255, 255))
-            draw.text((5, 70), f"Mem: {mem_str}", font=font_medium, fill=(255, 255, 255))
-            draw.text((5, 85), f"Disk: {disk_str}", font=font_medium, fill=(255, 255, 255))
-            draw.text((5, DISPLAY_HEIGHT - 10), "3=Back", font=font_small, fill=(0, 255, 255))
-            thread_safe_display(img)
-        time.sleep(0.1)
-    menu_instance.clear_display()
-    show_utilities_menu()
+def start_monitor_timer(draw=draw_system_monitor, screen="system_monitor"):
+    """Redraw the System Monitor (or ``screen`` with ``draw``) as each new sample comes in.
+
+    The redraw runs on the input dispatcher and only while ``screen`` shows.
+    """
+    global monitor_timer
+    stop_monitor_timer()
+    monitor_timer = runtime.every(METRICS_INTERVAL, redraw_if_showing, screen, draw)
+
+
+def stop_monitor_timer():
+    global monitor_timer
+    if monitor_timer:
+        monitor_timer.cancel()
+        monitor_timer = None
+
+def show_threads_screen():
+    """Show CPU use and wakeups per thread of Mini OS, refreshed every second."""
+    global threads_offset
+    stop_scrolling()
+    threads_offset = 0
+    thread_stats.sample()
+    menu_instance.current_screen = "threads"
+    draw_threads_screen()
+
+
+def scroll_threads(direction):
+    global threads_offset
+    threads_offset = max(0, min(len(thread_stats.last) - 1, threads_offset + direction))
+    draw_threads_screen()
+
+
+def draw_threads_screen():
+    """One row per thread: name, CPU percent and wakeups a second.
+
+    Threads that wake often without doing any work are drawn in orange.
+    """
+    usage = thread_stats.sample()
+    img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
+    draw = text_cache.Draw(img)
+    draw.text((5, 2), "Threads", font=font_medium, fill=(255, 255, 0))
+    draw.text((DISPLAY_WIDTH - 50, 5), "cpu  w/s", font=font_small, fill=(160, 160, 160))
+    line_h = font_small.getbbox("A")[3] + 3
+    y = 20
+    for u in usage[threads_offset:]:
+        if y + line_h > DISPLAY_HEIGHT - 12:
+            break
+        color = (255, 160, 0) if u.polling else (255, 255, 255)
+        name = u.name if len(u.name) <= 12 else u.name[:11] + "~"
+        draw.text((5, y), name, font=font_small, fill=color)
+        draw.text((DISPLAY_WIDTH - 52, y), f"{u.cpu:3.0f}", font=font_small, fill=color)
+        draw.text((DISPLAY_WIDTH - 28, y), f"{u.wakeups:3.0f}", font=font_small, fill=color)
+        y += line_h
+    draw.text((5, DISPLAY_HEIGHT - 10), "Up/Dn 3=Back", font=font_small, fill=(0, 255, 255))
+    thread_safe_display(img)
+
 
 def show_info():
     menu_instance.display_message_screen("System Info", "Raspberry Pi Mini-OS\nVersion 1.0\nST7735S Display", delay=4)
@@ -1880,7 +2010,7 @@ def show_date_time(duration=10):
             break
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         img = Image.new('RGB', (DISPLAY_WIDTH, DISPLAY_HEIGHT), color='black')
-        draw = ImageDraw.Draw(img)
+        draw = text_cache.Draw(img)
         draw.text((5, 5), "Date & Time", font=font_large, fill=(255, 255, 0))
         max_width = DISPLAY_WIDTH - 10
         lines = wrap_text(now, font_medium, max_width, draw)
@@ -1896,14 +2026,18 @@ def show_date_time(duration=10):
     show_utilities_menu()
 
 
+def zip_location(zip_code):
+    """Return ``(latitude, longitude)`` for a US ZIP code, looked up once."""
+    if zip_code not in zip_locations:
+        place = http_client.get_json(f"https://api.zippopotam.us/us/{zip_code}")["places"][0]
+        zip_locations[zip_code] = (place["latitude"], place["longitude"])
+    return zip_locations[zip_code]
+
+
 def fetch_weather_data(zip_code):
     """Fetch weather information for the given US ZIP code."""
     try:
-        r = requests.get(f"https://api.zippopotam.us/us/{zip_code}", timeout=5)
-        loc = r.json()
-        place = loc["places"][0]
-        lat = place["latitude"]
-        lon = place["longitude"]
+        lat, lon = zip_location(zip_code)
     except Exception:
         return None
 
@@ -1913,7 +2047,7 @@ def fetch_weather_data(zip_code):
         "&timezone=America%2FLos_Angeles"
     )
     try:
-        data = requests.get(url, timeout=5).json()
+        data = http_client.get_json(url)
     except Exception:
         return None
 
@@ -1955,7 +2089,7 @@ def draw_weather_screen():
         if data:
             weather_cache[zip_code] = data
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
     line_h = draw.textbbox((0, 0), "A", font=font_medium)[3]
     draw.text((5, 5), f"Weather {zip_code}", font=font_large, fill=(255, 255, 0))
     y = 25
@@ -1992,7 +2126,7 @@ def draw_weather_screen():
 def draw_zip_entry_screen():
     """Render the numeric keypad for adding a ZIP code."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
     draw.text((5, 5), "New ZIP", font=font_large, fill=(255, 255, 0))
     draw.text((5, 25), zip_input_text, font=font_medium, fill=(255, 255, 255))
 
@@ -2081,17 +2215,8 @@ def handle_weather_input(pin_name):
 
 def show_network_info():
     """Display basic network information until the user exits."""
-    try:
-        ip_output = subprocess.check_output(["hostname", "-I"]).decode().strip()
-        ip_addr = ip_output if ip_output else "N/A"
-    except Exception:
-        ip_addr = "N/A"
-
-    try:
-        ssid_output = subprocess.check_output(["iwgetid", "-r"]).decode().strip()
-        ssid = ssid_output if ssid_output else "N/A"
-    except Exception:
-        ssid = "N/A"
+    ip_addr = " ".join(sysinfo.addresses()) or "N/A"
+    ssid = sysinfo.ssid() or "N/A"
 
     next_update = 0
     while True:
@@ -2101,7 +2226,7 @@ def show_network_info():
         if now >= next_update:
             next_update = now + 1
             img = Image.new('RGB', (DISPLAY_WIDTH, DISPLAY_HEIGHT), color='black')
-            draw = ImageDraw.Draw(img)
+            draw = text_cache.Draw(img)
             draw.text((5, 5), "Network Info", font=font_large, fill=(255, 255, 0))
             max_width = DISPLAY_WIDTH - 10
             y = 25
@@ -2120,15 +2245,11 @@ def show_network_info():
 
 def start_web_server():
     """Start the lightweight Flask web server."""
-    try:
-        ip_output = subprocess.check_output(["hostname", "-I"]).decode().strip()
-        ip_addr = ip_output.split()[0] if ip_output else "localhost"
-    except Exception:
-        ip_addr = "localhost"
+    ip_addr = sysinfo.primary_address()
 
     try:
         from utilities import web_server
-        threading.Thread(target=web_server.run, daemon=True).start()
+        threading.Thread(target=web_server.run, name="web-server", daemon=True).start()
         menu_instance.display_message_screen(
             "Web Server", f"Running on http://{ip_addr}:8000", delay=3
         )
@@ -2141,15 +2262,11 @@ def start_web_server():
 
 def start_mini_games():
     """Launch the web-based mini games."""
-    try:
-        ip_output = subprocess.check_output(["hostname", "-I"]).decode().strip()
-        ip_addr = ip_output.split()[0] if ip_output else "localhost"
-    except Exception:
-        ip_addr = "localhost"
+    ip_addr = sysinfo.primary_address()
 
     try:
         from utilities import web_server
-        threading.Thread(target=web_server.run, daemon=True).start()
+        threading.Thread(target=web_server.run, name="web-server", daemon=True).start()
     except Exception:
         pass
 
@@ -2167,29 +2284,22 @@ def start_mini_games():
 
 def fetch_web_content(url):
     """Fetch the given URL and convert HTML to plain text."""
-    global web_lines, web_line_h, web_offset, web_max_offset
+    global web_view
     try:
-        resp = requests.get(url, timeout=5)
+        resp = http_client.get(url)
         html_text = resp.text
         html_text = re.sub(r"<(script|style).*?>.*?</\1>", "", html_text, flags=re.S | re.I)
         text = re.sub(r"<[^>]+>", "", html_text)
         text = html.unescape(text)
     except Exception as e:
         text = f"Failed to load: {e}"
-    dummy_img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT))
-    dummy_draw = ImageDraw.Draw(dummy_img)
-    max_width = DISPLAY_WIDTH - 10
-    web_lines = wrap_text(text, font_small, max_width, dummy_draw)
-    web_line_h = dummy_draw.textbbox((0, 0), "A", font=font_small)[3] + 2
-    available_h = DISPLAY_HEIGHT - 35
-    web_max_offset = max(0, len(web_lines) * web_line_h - available_h)
-    web_offset = 0
+    web_view = make_text_view(text, top=5, heading=url)
 
 
 def draw_web_browser_screen():
     """Render the current web page or URL entry."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
     max_width = DISPLAY_WIDTH - 10
     tips_height = 10
     if web_keyboard_visible:
@@ -2201,39 +2311,12 @@ def draw_web_browser_screen():
             draw.text((5, y), line, font=font_small, fill=(255, 255, 255))
             y += line_h
 
-        row_h = (DISPLAY_HEIGHT - kb_y - tips_height) // len(KEY_LAYOUT)
-        key_w = DISPLAY_WIDTH // 10
-        for r, row in enumerate(KEY_LAYOUT):
-            if r == len(KEY_LAYOUT) - 1 and len(row) == 1:
-                offset_x = 5
-                this_key_w = DISPLAY_WIDTH - offset_x * 2
-            else:
-                offset_x = (DISPLAY_WIDTH - len(row) * key_w) // 2
-                this_key_w = key_w
-            for c, ch in enumerate(row):
-                x = offset_x + c * this_key_w
-                y = kb_y + r * row_h
-                rect = (x + 1, y + 1, x + this_key_w - 2, y + row_h - 2)
-                if r == web_row and c == web_col:
-                    draw.rectangle(rect, fill=(0, 255, 0))
-                    text_color = (0, 0, 0)
-                else:
-                    draw.rectangle(rect, outline=(255, 255, 255))
-                    text_color = (255, 255, 255)
-                bbox = draw.textbbox((0, 0), ch, font=font_small)
-                tx = x + (this_key_w - (bbox[2] - bbox[0])) // 2
-                ty = y + (row_h - (bbox[3] - bbox[1])) // 2
-                draw.text((tx, ty), ch, font=font_small, fill=text_color)
+        keyboard.draw(img, KEY_LAYOUT, kb_y, DISPLAY_HEIGHT - tips_height, web_row, web_col)
 
         draw.text((5, DISPLAY_HEIGHT - tips_height + 2), "1=Shift 2=Del 3=Go", font=font_small, fill=(0, 255, 255))
     else:
-        y = 5 - web_offset
-        line_h = web_line_h
-        draw.text((5, y), web_url, font=font_small, fill=(255, 255, 0))
-        y += line_h + 2
-        for line in web_lines:
-            draw.text((5, y), line, font=font_small, fill=(255, 255, 255))
-            y += line_h
+        if web_view:
+            web_view.render(img)
         draw.text((5, DISPLAY_HEIGHT - 10), "3=Keyboard 1=Back", font=font_small, fill=(0, 255, 255))
 
     thread_safe_display(img)
@@ -2255,7 +2338,7 @@ def start_web_browser():
 
 def handle_web_browser_input(pin_name):
     """Handle joystick and button input for the web browser."""
-    global web_row, web_col, web_url, web_keyboard_state, KEY_LAYOUT, web_keyboard_visible, web_offset
+    global web_row, web_col, web_url, web_keyboard_state, KEY_LAYOUT, web_keyboard_visible
 
     if web_keyboard_visible:
         if pin_name == "JOY_LEFT" and web_col > 0:
@@ -2282,10 +2365,9 @@ def handle_web_browser_input(pin_name):
             fetch_web_content(web_url)
         draw_web_browser_screen()
     else:
-        if pin_name == "JOY_UP":
-            web_offset = max(0, web_offset - web_line_h)
-        elif pin_name == "JOY_DOWN":
-            web_offset = min(web_max_offset, web_offset + web_line_h)
+        if pin_name in ("JOY_UP", "JOY_DOWN"):
+            if not (web_view and web_view.scroll(-1 if pin_name == "JOY_UP" else 1)):
+                return
         elif pin_name == "KEY3":
             web_keyboard_visible = True
         elif pin_name == "KEY1":
@@ -2298,7 +2380,7 @@ def handle_web_browser_input(pin_name):
 def draw_rdp_input_screen():
     """Show on-screen keyboard for RDP connection details."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
     fields = ["Host", "User", "Password"]
     values = [rdp_host, rdp_user, "*" * len(rdp_pass)]
     draw.text((5, 2), f"RDP {fields[rdp_stage]}", font=font_large, fill=(255,255,0))
@@ -2313,29 +2395,7 @@ def draw_rdp_input_screen():
         draw.text((5, y), line, font=font_medium, fill=(255,255,255))
         y += line_h
 
-    row_h = (DISPLAY_HEIGHT - kb_y - tips_h)//len(KEY_LAYOUT)
-    key_w = DISPLAY_WIDTH // 10
-    for r,row in enumerate(KEY_LAYOUT):
-        if r == len(KEY_LAYOUT)-1 and len(row)==1:
-            ox = 5
-            kw = DISPLAY_WIDTH - ox*2
-        else:
-            ox = (DISPLAY_WIDTH - len(row)*key_w)//2
-            kw = key_w
-        for c,ch in enumerate(row):
-            x = ox + c*kw
-            y = kb_y + r*row_h
-            rect=(x+1,y+1,x+kw-2,y+row_h-2)
-            if r==rdp_row and c==rdp_col:
-                draw.rectangle(rect, fill=(0,255,0))
-                text_color=(0,0,0)
-            else:
-                draw.rectangle(rect, outline=(255,255,255))
-                text_color=(255,255,255)
-            bbox=draw.textbbox((0,0),ch,font=font_small)
-            tx=x+(kw-(bbox[2]-bbox[0]))//2
-            ty=y+(row_h-(bbox[3]-bbox[1]))//2
-            draw.text((tx,ty),ch,font=font_small,fill=text_color)
+    keyboard.draw(img, KEY_LAYOUT, kb_y, DISPLAY_HEIGHT - tips_h, rdp_row, rdp_col)
 
     tips="1=Shift 2=Del 3=Next"
     draw.text((5, DISPLAY_HEIGHT - tips_h + 2), tips, font=font_small, fill=(0,255,255))
@@ -2451,7 +2511,7 @@ def handle_rdp_session_input(pin_name):
 def draw_game_screen(prompt, time_left=None):
     """Display the current round prompt and countdown timer."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
     draw.text((5, 5), f"Round {game_round+1}", font=font_medium, fill=(255, 255, 255))
     draw.text((5, 20), f"Score: {game_score}", font=font_medium, fill=(255, 255, 255))
 
@@ -2478,63 +2538,57 @@ def stop_scrolling():
 
 def start_timer():
     """Start the countdown timer for the reaction game."""
-    global timer_thread
+    global game_timer
     stop_timer()
 
-    def timer_task():
-        global timer_thread
-        while not timer_stop_event.is_set():
-            remaining = timer_end_time - time.time()
-            if remaining <= 0:
-                break
-            draw_game_screen(f"Press {BUTTON_NAMES[game_prompt]}", remaining)
-            time.sleep(0.1)
-
-        if not timer_stop_event.is_set():
-            menu_instance.display_message_screen("Time's Up!", f"Score: {game_score}", delay=2)
-            show_main_menu()
-        timer_thread = None
+    def times_up():
+        menu_instance.display_message_screen("Time's Up!", f"Score: {game_score}", delay=2)
+        show_main_menu()
+
+    def tick():
+        global game_timer
+        remaining = timer_end_time - time.time()
+        if remaining > 0:
+            redraw_if_showing(
+                "button_game",
+                lambda: draw_game_screen(f"Press {BUTTON_NAMES[game_prompt]}", remaining),
+            )
+            return True
+        game_timer = None
+        # The message screen sleeps, which must not happen on the event loop
+        worker_pool.submit(times_up, name="times_up")
+        return False
 
-    timer_stop_event.clear()
-    timer_thread = threading.Thread(target=timer_task, daemon=True)
-    timer_thread.start()
+    game_timer = runtime.every(0.1, tick, delay=0)
 
 
 def stop_timer():
-    """Stop the reaction game timer thread."""
-    global timer_thread
-    if timer_thread:
-        timer_stop_event.set()
-        timer_thread.join()
-        timer_thread = None
+    """Stop the reaction game countdown."""
+    global game_timer
+    if game_timer:
+        game_timer.cancel()
+        game_timer = None
 
 
 def start_cursor():
-    """Start blinking cursor thread for the shell."""
-    global cursor_thread
+    """Start blinking the shell cursor twice a second."""
+    global cursor_timer
     stop_cursor()
 
-    def cursor_task():
-        global cursor_thread, cursor_visible
-        while not cursor_stop_event.is_set():
-            cursor_visible = not cursor_visible
-            draw_shell_screen()
-            time.sleep(0.5)
-
-        cursor_thread = None
+    def blink():
+        global cursor_visible
+        cursor_visible = not cursor_visible
+        redraw_if_showing("shell", draw_shell_screen)
 
-    cursor_stop_event.clear()
-    cursor_thread = threading.Thread(target=cursor_task, daemon=True)
-    cursor_thread.start()
+    cursor_timer = runtime.every(0.5, blink, delay=0)
 
 
 def stop_cursor():
     """Stop the blinking cursor."""
-    global cursor_thread
-    if cursor_thread:
-        cursor_stop_event.set()
-        cursor_thread.join()
-        cursor_thread = None
+    global cursor_timer
+    if cursor_timer:
+        cursor_timer.cancel()
+        cursor_timer = None
 
 
 def start_button_game():
@@ -2593,7 +2647,7 @@ def generate_launch_sequence():
 def draw_launch_code(show_sequence=False):
     """Display either the code to memorize or the input prompt."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
     draw.text(
         (5, 5),
         f"Round {launch_round}/{TOTAL_LAUNCH_ROUNDS}",
@@ -2872,6 +2926,103 @@ KEY_LAYOUT = KEY_LAYOUTS[keyboard_state]
 IRC_KEY_LAYOUTS = [KEYBOARD_LOWER, KEYBOARD_UPPER, KEYBOARD_PUNCT]
 IRC_KEY_LAYOUT = IRC_KEY_LAYOUTS[irc_keyboard_state]
 
+
+class OnScreenKeyboard:
+    """Grid keyboard shared by the text-entry screens.
+
+    Each layout is rendered once with no key selected.  Drawing pastes that
+    strip and repaints just the area around the selected key, so moving the
+    selection only changes two key cells on screen.
+    """
+
+    def __init__(self):
+        self.strips = {}
+        self.font = None  # font_small the cached strips were drawn with
+
+    def cells(self, layout, top, bottom):
+        """Return ``(row, col, char, x, y, width, height, extent)`` for every key.
+
+        ``extent`` is the box covering the key's outline and label.
+        """
+        cells = []
+        row_h = (bottom - top) // len(layout)
+        key_w = DISPLAY_WIDTH // 10
+        for r, row in enumerate(layout):
+            if r == len(layout) - 1 and len(row) == 1:
+                offset_x = 5
+                this_key_w = DISPLAY_WIDTH - offset_x * 2
+            else:
+                offset_x = (DISPLAY_WIDTH - len(row) * key_w) // 2
+                this_key_w = key_w
+            for c, ch in enumerate(row):
+                x = offset_x + c * this_key_w
+                y = top + r * row_h
+                tx, ty = self.label_position(ch, x, y, this_key_w, row_h)
+                bbox = font_small.getbbox(ch)
+                extent = (
+                    min(x + 1, tx + bbox[0]),
+                    min(y + 1, ty + bbox[1]),
+                    max(x + this_key_w - 1, tx + bbox[2]),
+                    max(y + row_h - 1, ty + bbox[3]),
+                )
+                cells.append((r, c, ch, x, y, this_key_w, row_h, extent))
+        return cells
+
+    def label_position(self, ch, x, y, key_w, row_h):
+        bbox = font_small.getbbox(ch)
+        return x + (key_w - (bbox[2] - bbox[0])) // 2, y + (row_h - (bbox[3] - bbox[1])) // 2
+
+    def draw_key(self, draw, ch, x, y, key_w, row_h, selected):
+        rect = (x + 1, y + 1, x + key_w - 2, y + row_h - 2)
+        if selected:
+            draw.rectangle(rect, fill=(0, 255, 0))
+            text_color = (0, 0, 0)
+        else:
+            draw.rectangle(rect, outline=(255, 255, 255))
+            text_color = (255, 255, 255)
+        draw.text(self.label_position(ch, x, y, key_w, row_h), ch, font=font_small, fill=text_color)
+
+    def strip(self, layout, top, bottom):
+        """Return the cached image of ``layout`` with no key selected, and its cells."""
+        if self.font is not font_small:
+            # The text size changed: strips in the old font would never be used again
+            self.strips.clear()
+            self.font = font_small
+        key = (tuple(map(tuple, layout)), top, bottom)
+        entry = self.strips.get(key)
+        if entry is None:
+            img = Image.new("RGB", (DISPLAY_WIDTH, bottom - top), color="black")
+            draw = text_cache.Draw(img)
+            cells = self.cells(layout, 0, bottom - top)
+            for _, _, ch, x, y, key_w, row_h, _ in cells:
+                self.draw_key(draw, ch, x, y, key_w, row_h, False)
+            entry = self.strips[key] = (img, cells)
+        return entry
+
+    def draw(self, img, layout, top, bottom, row, col):
+        """Draw ``layout`` between ``top`` and ``bottom`` with key (row, col) selected."""
+        strip, cells = self.strip(layout, top, bottom)
+        img.paste(strip, (0, top))
+        selected = next((cell for cell in cells if cell[0] == row and cell[1] == col), None)
+        if selected is None:
+            return
+        # Labels can spill past their key, so redraw every key touching the
+        # selected one, in the original order, into a patch covering it.
+        left, upper, right, lower = selected[7]
+        left, upper = max(left, 0), max(upper, 0)
+        right, lower = min(right, strip.width), min(lower, strip.height)
+        patch = Image.new("RGB", (right - left, lower - upper), color="black")
+        draw = text_cache.Draw(patch)
+        for cell in cells:
+            extent = cell[7]
+            if extent[0] < right and extent[2] > left and extent[1] < lower and extent[3] > upper:
+                _, _, ch, x, y, key_w, row_h, _ = cell
+                self.draw_key(draw, ch, x - left, y - upper, key_w, row_h, cell is selected)
+        img.paste(patch, (left, top + upper))
+
+
+keyboard = OnScreenKeyboard()
+
 # --- Novel Typer ---
 # Groups of letters for each page. Each joystick direction selects a group and
 # repeated presses cycle through the letters in that group. KEY1 toggles pages,
@@ -2919,10 +3070,7 @@ novel_group_index = 0
 # Note viewing state
 notes_files = []
 current_note_index = 0
-note_lines = []
-note_line_h = 0
-note_offset = 0
-note_max_offset = 0
+note_view = None
 note_render = None
 current_note_file = None  # filename of the note being viewed
 editing_note_filename = None  # filename when editing an existing note
@@ -2931,7 +3079,7 @@ editing_note_filename = None  # filename when editing an existing note
 def draw_notes_screen():
     """Render the current text and onscreen keyboard."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
 
     # Draw typed text in the top half
     max_width = DISPLAY_WIDTH - 10
@@ -2947,29 +3095,7 @@ def draw_notes_screen():
         y += line_h
 
     # Keyboard layout in bottom half
-    row_h = (DISPLAY_HEIGHT - kb_y - tips_height) // len(KEY_LAYOUT)
-    key_w = DISPLAY_WIDTH // 10
-    for r, row in enumerate(KEY_LAYOUT):
-        if r == len(KEY_LAYOUT) - 1 and len(row) == 1:
-            offset_x = 5
-            this_key_w = DISPLAY_WIDTH - offset_x * 2
-        else:
-            offset_x = (DISPLAY_WIDTH - len(row) * key_w) // 2
-            this_key_w = key_w
-        for c, ch in enumerate(row):
-            x = offset_x + c * this_key_w
-            y = kb_y + r * row_h
-            rect = (x + 1, y + 1, x + this_key_w - 2, y + row_h - 2)
-            if r == typer_row and c == typer_col:
-                draw.rectangle(rect, fill=(0, 255, 0))
-                text_color = (0, 0, 0)
-            else:
-                draw.rectangle(rect, outline=(255, 255, 255))
-                text_color = (255, 255, 255)
-            bbox = draw.textbbox((0, 0), ch, font=font_small)
-            tx = x + (this_key_w - (bbox[2] - bbox[0])) // 2
-            ty = y + (row_h - (bbox[3] - bbox[1])) // 2
-            draw.text((tx, ty), ch, font=font_small, fill=text_color)
+    keyboard.draw(img, KEY_LAYOUT, kb_y, DISPLAY_HEIGHT - tips_height, typer_row, typer_col)
 
     tips_text = "1=Shift 2=Delete 3=Save"
     draw.text((5, DISPLAY_HEIGHT - tips_height + 2), tips_text,
@@ -3103,17 +3229,15 @@ def start_bt_log_monitor():
     if not shutil.which("journalctl"):
         return
 
-    def monitor():
-        proc = subprocess.Popen(
-            ["journalctl", "-fu", "bluetooth", "-n", "0", "--since", "now"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
+    async def monitor():
+        proc = await asyncio.create_subprocess_exec(
+            "journalctl", "-fu", "bluetooth", "-n", "0", "--since", "now",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
         )
         buffer = []
-        for line in iter(proc.stdout.readline, ""):
-            if not line:
-                break
+        async for raw in proc.stdout:
+            line = raw.decode(errors="ignore")
             buffer.append(line.strip())
             lower = line.lower()
             if any(word in lower for word in ["failed", "error"]):
@@ -3121,8 +3245,7 @@ def start_bt_log_monitor():
                 save_connect_failure(details)
                 buffer = []
 
-    t = threading.Thread(target=monitor, daemon=True)
-    t.start()
+    runtime.spawn(monitor(), name="bt_log_monitor")
 
 
 
@@ -3151,7 +3274,7 @@ def show_notes_list():
 
 def view_note(filename):
     """Show the contents of a single note with scrolling."""
-    global note_lines, note_line_h, note_offset, note_max_offset, note_render, current_note_file
+    global note_view, note_render, current_note_file
     stop_scrolling()
     menu_instance.current_screen = "note_view"
     current_note_file = filename
@@ -3162,23 +3285,13 @@ def view_note(filename):
     except Exception:
         text = "Error reading file"
 
-    dummy_img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT))
-    dummy_draw = ImageDraw.Draw(dummy_img)
-    max_width = DISPLAY_WIDTH - 10
-    note_lines = wrap_text(text, font_small, max_width, dummy_draw)
-    note_line_h = dummy_draw.textbbox((0, 0), "A", font=font_small)[3] + 2
-    note_offset = 0
-    available_h = DISPLAY_HEIGHT - 35
-    note_max_offset = max(0, len(note_lines) * note_line_h - available_h)
+    note_view = make_text_view(text)
 
     def render():
         img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-        draw = ImageDraw.Draw(img)
+        draw = text_cache.Draw(img)
         draw.text((5, 5), filename, font=font_large, fill=(255, 255, 0))
-        y = 25 - note_offset
-        for line in note_lines:
-            draw.text((5, y), line, font=font_small, fill=(255, 255, 255))
-            y += note_line_h
+        note_view.render(img)
         draw.text((5, DISPLAY_HEIGHT - 10), "1=Edit 2=Delete 3=Back", font=font_small, fill=(0, 255, 255))
         thread_safe_display(img)
 
@@ -3187,15 +3300,8 @@ def view_note(filename):
 
 
 def scroll_note(direction):
-    global note_offset
-    if not note_render:
-        return
-    note_offset += direction * note_line_h
-    if note_offset < 0:
-        note_offset = 0
-    if note_offset > note_max_offset:
-        note_offset = note_max_offset
-    note_render()
+    if note_render and note_view.scroll(direction):
+        note_render()
 
 
 def delete_current_note():
@@ -3216,7 +3322,7 @@ def delete_current_note():
 def draw_novel_typer_screen():
     """Render typed text and the joystick letter groups."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
 
     max_width = DISPLAY_WIDTH - 10
     line_h = draw.textbbox((0, 0), "A", font=font_medium)[3] + 2
@@ -3304,7 +3410,12 @@ shell_pending_char = None  # store KEY1 char until release
 
 
 shell_proc = None
-shell_lines = []
+# Lines of history kept for the shell and console; older output is dropped
+SHELL_SCROLLBACK = 500
+shell_lines = text_layout.WrappedLines(SHELL_SCROLLBACK)
+# Last rendered shell frame without the prompt, and the state it was drawn for
+shell_frame = None
+shell_frame_key = None
 sudo_pre_output = ""
 console_mode = False
 console_log_path = os.path.join(os.path.dirname(__file__), "logs", "console.log")
@@ -3319,25 +3430,60 @@ sudo_pw_col = 0
 
 def draw_shell_screen():
     """Render the shell with history and input using the novel keyboard."""
-    img = Image.new(
-        "RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color=current_color_scheme["background"]
-    )
-    draw = ImageDraw.Draw(img)
-
+    global shell_frame, shell_frame_key
     max_width = DISPLAY_WIDTH - 10
     tips_height = 0 if console_mode else 10
     kb_y = DISPLAY_HEIGHT // 2 if shell_keyboard_visible else DISPLAY_HEIGHT - tips_height
-    line_h = draw.textbbox((0, 0), "A", font=font_small)[3] + 1
+    line_h = font_small.getbbox("A")[3] + 1
+    max_lines = (kb_y - 5) // line_h
 
-    history_lines = []
-    for ln in shell_lines:
-        history_lines.extend(wrap_text(ln, font_small, max_width, draw))
     cursor = "_" if cursor_visible else " "
-    history_lines.extend(wrap_text(f"$ {shell_text}{cursor}", font_small, max_width, draw))
-    max_lines = (kb_y - 5) // line_h
-    start = max(0, len(history_lines) - max_lines)
+    prompt_lines = wrap_text(f"$ {shell_text}{cursor}", font_small, max_width)[-max_lines:] if max_lines > 0 else []
+    history_count = max_lines - len(prompt_lines)
+
+    # Everything but the prompt only changes when history or the keyboard
+    # does, so the cursor blink just redraws the prompt over a cached frame.
+    key = (
+        shell_lines.version,
+        history_count,
+        shell_keyboard_visible,
+        shell_page,
+        shell_selected_group,
+        shell_group_index,
+        console_mode,
+        font_small,
+        current_color_scheme_name,
+    )
+    if key != shell_frame_key:
+        shell_frame = render_shell_frame(history_count, kb_y, tips_height, line_h, max_width)
+        shell_frame_key = key
+
+    base, history_drawn = shell_frame
+    img = base.copy()
+    draw = text_cache.Draw(img)
+    y = 5 + history_drawn * line_h
+    for line in prompt_lines:
+        draw.text(
+            (5, y), line, font=font_small, fill=current_color_scheme["text"]
+        )
+        y += line_h
+
+    thread_safe_display(img)
+
+
+def render_shell_frame(history_count, kb_y, tips_height, line_h, max_width):
+    """Draw the shell history, keyboard and tips without the prompt.
+
+    Returns the image and the number of history lines drawn on it.
+    """
+    img = Image.new(
+        "RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color=current_color_scheme["background"]
+    )
+    draw = text_cache.Draw(img)
+
+    history = shell_lines.tail(history_count, font_small, max_width)
     y = 5
-    for line in history_lines[start:]:
+    for line in history:
         draw.text(
             (5, y), line, font=font_small, fill=current_color_scheme["text"]
         )
@@ -3373,8 +3519,7 @@ def draw_shell_screen():
             font=font_small,
             fill=current_color_scheme["header"],
         )
-
-    thread_safe_display(img)
+    return img, len(history)
 
 
 def start_shell(show_keyboard=True):
@@ -3390,7 +3535,6 @@ def start_shell(show_keyboard=True):
     shell_keyboard_visible = show_keyboard
     menu_instance.current_screen = "shell"
     draw_shell_screen()
-    start_cursor()
 
 
 def start_console():
@@ -3406,7 +3550,7 @@ def start_console():
 def draw_sudo_password_screen():
     """Render the password entry screen for sudo."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
 
     max_width = DISPLAY_WIDTH - 10
     line_h = draw.textbbox((0, 0), "A", font=font_medium)[3] + 2
@@ -3423,29 +3567,7 @@ def draw_sudo_password_screen():
         draw.text((5, y), line, font=font_medium, fill=(255, 255, 255))
         y += line_h
 
-    row_h = (DISPLAY_HEIGHT - kb_y - tips_height) // len(KEY_LAYOUT)
-    key_w = DISPLAY_WIDTH // 10
-    for r, row in enumerate(KEY_LAYOUT):
-        if r == len(KEY_LAYOUT) - 1 and len(row) == 1:
-            offset_x = 5
-            this_key_w = DISPLAY_WIDTH - offset_x * 2
-        else:
-            offset_x = (DISPLAY_WIDTH - len(row) * key_w) // 2
-            this_key_w = key_w
-        for c, ch in enumerate(row):
-            x = offset_x + c * this_key_w
-            yk = kb_y + r * row_h
-            rect = (x + 1, yk + 1, x + this_key_w - 2, yk + row_h - 2)
-            if r == sudo_pw_row and c == sudo_pw_col:
-                draw.rectangle(rect, fill=(0, 255, 0))
-                text_color = (0, 0, 0)
-            else:
-                draw.rectangle(rect, outline=(255, 255, 255))
-                text_color = (255, 255, 255)
-            bbox = draw.textbbox((0, 0), ch, font=font_small)
-            tx = x + (this_key_w - (bbox[2] - bbox[0])) // 2
-            ty = yk + (row_h - (bbox[3] - bbox[1])) // 2
-            draw.text((tx, ty), ch, font=font_small, fill=text_color)
+    keyboard.draw(img, KEY_LAYOUT, kb_y, DISPLAY_HEIGHT - tips_height, sudo_pw_row, sudo_pw_col)
 
     tips = "1=Shift 2=Del 3=OK/Exit"
     draw.text((5, DISPLAY_HEIGHT - tips_height + 2), tips, font=font_small, fill=(0, 255, 255))
@@ -3457,7 +3579,6 @@ def start_sudo_password(cmd):
     """Prompt the user to enter the sudo password."""
     global sudo_pending_cmd, sudo_pw_text, sudo_pw_keyboard_state, KEY_LAYOUT, sudo_pw_row, sudo_pw_col
     stop_scrolling()
-    stop_cursor()
     sudo_pending_cmd = cmd
     sudo_pw_text = ""
     sudo_pw_keyboard_state = 1
@@ -3487,7 +3608,6 @@ def run_sudo_command(cmd, password):
     menu_instance.current_screen = "shell"
     shell_keyboard_visible = False
     draw_shell_screen()
-    start_cursor()
 
 
 def handle_sudo_password_input(pin_name):
@@ -3518,7 +3638,6 @@ def handle_sudo_password_input(pin_name):
         else:
             menu_instance.current_screen = "shell"
             draw_shell_screen()
-            start_cursor()
         return
     draw_sudo_password_screen()
 
@@ -3570,6 +3689,12 @@ def autocomplete_shell():
     draw_shell_screen()
 
 
+def interrupt_shell():
+    """Send Ctrl-C to the shell so a running command stops early."""
+    if shell_proc is not None:
+        shell_proc.sendintr()
+
+
 def shell_enter():
     """Execute current command and reset selection."""
     global shell_selected_group, shell_group_index
@@ -3618,7 +3743,7 @@ raspi_lock = threading.Lock()
 def draw_raspi_screen():
     """Render output from raspi-config in a small font."""
     img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
     draw.text((5, 5), "raspi-config", font=font_small, fill=(255, 255, 0))
     with raspi_lock:
         lines = raspi_lines[-10:]
@@ -3651,23 +3776,25 @@ def start_raspi_config():
     except Exception:
         pass
 
-    def reader():
-        global raspi_proc
-        while True:
-            try:
-                data = raspi_proc.read_nonblocking(size=1024, timeout=0.1)
-            except pexpect.exceptions.TIMEOUT:
-                continue
-            except pexpect.exceptions.EOF:
-                break
-            with raspi_lock:
-                for l in data.splitlines():
-                    raspi_lines.append(l)
-                    if len(raspi_lines) > 50:
-                        raspi_lines.pop(0)
-            draw_raspi_screen()
-
-    threading.Thread(target=reader, daemon=True).start()
+    proc = raspi_proc
+
+    def on_output():
+        # Runs on the event loop whenever raspi-config has written something
+        try:
+            data = proc.read_nonblocking(size=1024, timeout=0)
+        except pexpect.exceptions.TIMEOUT:
+            return
+        except Exception:
+            runtime.remove_reader(proc.child_fd)
+            return
+        with raspi_lock:
+            for l in data.splitlines():
+                raspi_lines.append(l)
+                if len(raspi_lines) > 50:
+                    raspi_lines.pop(0)
+        redraw_if_showing("raspi_config", draw_raspi_screen)
+
+    runtime.add_reader(proc.child_fd, on_output)
     menu_instance.current_screen = "raspi_config"
     draw_raspi_screen()
 
@@ -3689,6 +3816,7 @@ def handle_raspi_input(pin_name):
         raspi_proc.send("\n")
     elif pin_name == "KEY1":
         raspi_proc.sendcontrol("c")
+        runtime.remove_reader(raspi_proc.child_fd)
         raspi_proc.terminate(force=True)
         raspi_proc = None
         show_settings_menu()
@@ -3702,7 +3830,7 @@ def update_backlight():
 
 def draw_brightness_screen():
     img = Image.new('RGB', (DISPLAY_WIDTH, DISPLAY_HEIGHT), color='black')
-    draw = ImageDraw.Draw(img)
+    draw = text_cache.Draw(img)
     draw.text((5, 5), "Brightness", font=font_large, fill=(255, 255, 0))
     bar_width = int((DISPLAY_WIDTH - 10) * brightness_level / 100)
     draw.rectangle([(5, 30), (5 + bar_width, 50)], fill=(0, 255, 0))
@@ -3858,9 +3986,10 @@ def show_bluetooth_menu():
 
 def handle_bluetooth_menu_selection(selection):
     if selection == "Discover devices":
-        show_bluetooth_devices()
+        run_in_background(show_bluetooth_devices)
     elif selection == "Pairing mode":
-        start_bluetooth_pairing()
+        # Waits for a connection; KEY1 cancels through the job
+        run_in_background(start_bluetooth_pairing, on_cancel=cancel_bluetooth_pairing)
     elif selection == "Back":
         show_settings_menu()
 
@@ -3898,7 +4027,7 @@ def handle_games_selection(selection):
         start_doctor_mode()
         return
     if selection == "AI Cases":
-        start_ai_cases()
+        run_in_background(start_ai_cases)
         return
     if selection == "Button Game":
         start_button_game()
@@ -3919,7 +4048,7 @@ def handle_games_selection(selection):
         start_space_invaders()
         return
     elif selection == "Vet Adventure":
-        start_vet_adventure()
+        run_in_background(start_vet_adventure)
         return
     elif selection == "Axe":
         start_axe()
@@ -3976,6 +4105,7 @@ def show_utilities_menu():
     menu_instance.max_visible_items = compute_max_visible_items(menu_instance.font)
     menu_instance.items = [
         "System Monitor",
+        "Threads",
         "Network Info",
         "Date & Time",
         "Show Info",
@@ -3995,6 +4125,8 @@ def show_utilities_menu():
 def handle_utilities_selection(selection):
     if selection == "System Monitor":
         run_system_monitor()
+    elif selection == "Threads":
+        show_threads_screen()
     elif selection == "Network Info":
         show_network_info()
     elif selection == "Date & Time":
@@ -4018,7 +4150,6 @@ def handle_utilities_selection(selection):
 def show_main_menu():
     global console_mode
     console_mode = False
-    stop_cursor()
     stop_scrolling()
     menu_instance.max_visible_items = compute_max_visible_items(menu_instance.font)
     menu_instance.items = [
@@ -4086,7 +4217,7 @@ def handle_menu_selection(selection):
         show_weather()
         return
     elif selection == "Top Stories":
-        show_top_stories()
+        run_in_background(show_top_stories)
         return
     elif selection == "Settings":
         show_settings_menu()
@@ -4094,15 +4225,489 @@ def handle_menu_selection(selection):
     # After any program finishes, redraw the menu
     menu_instance.draw()
 
+# --- Latency Diagnostics ---
+# Hidden screen: hold KEY1 on the main menu for two seconds
+latency_screen_index = 0
+
+
+def show_latency_screen():
+    global latency_screen_index
+    stop_scrolling()
+    latency_screen_index = 0
+    menu_instance.current_screen = "latency"
+    draw_latency_screen()
+
+
+def draw_latency_screen():
+    """Show stage percentiles and an edge-to-frame histogram for one screen."""
+    img = Image.new("RGB", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color="black")
+    draw = text_cache.Draw(img)
+    names = latency_tracker.screens()
+    line_h = font_small.getbbox("A")[3] + 2
+    draw.text((5, 2), "Latency (ms)", font=font_medium, fill=(255, 255, 0))
+    y = 18
+    if not names:
+        draw.text((5, y), "No input yet", font=font_small, fill=(255, 255, 255))
+    else:
+        name = names[latency_screen_index % len(names)]
+        stages = latency_tracker.stages(name)
+        total = stages.get("total")
+        draw.text((5, y), f"{latency_screen_index % len(names) + 1}/{len(names)} {name}",
+                  font=font_small, fill=(0, 255, 0))
+        y += line_h
+        columns = (5, 50, 76, 102)
+        for x, label in zip(columns, ("stage", "p50", "p95", "max")):
+            draw.text((x, y), label, font=font_small, fill=(160, 160, 160))
+        y += line_h
+        for stage in STAGES:
+            hist = stages.get(stage)
+            if hist is None:
+                continue
+            values = (hist.percentile(0.5), hist.percentile(0.95), hist.max)
+            draw.text((columns[0], y), stage, font=font_small, fill=(255, 255, 255))
+            for x, ms in zip(columns[1:], values):
+                text = f"{ms:.1f}" if ms < 10 else f"{ms:.0f}"
+                draw.text((x, y), text, font=font_small, fill=(255, 255, 255))
+            y += line_h
+        if total is not None and total.count:
+            # One bar per bucket, scaled to the fullest one
+            top, bottom = y + 2, DISPLAY_HEIGHT - 12
+            peak = max(total.counts)
+            bar_w = (DISPLAY_WIDTH - 10) // len(total.counts)
+            for i, n in enumerate(total.counts):
+                if not n:
+                    continue
+                h = max(1, (bottom - top) * n // peak)
+                x = 5 + i * bar_w
+                draw.rectangle((x, bottom - h, x + bar_w - 2, bottom), fill=(0, 160, 255))
+    draw.text((5, DISPLAY_HEIGHT - 10), "<> 2=Save 3=Back", font=font_small, fill=(0, 255, 255))
+    thread_safe_display(img)
+
+
+def step_latency_screen(step):
+    global latency_screen_index
+    latency_screen_index += step
+    draw_latency_screen()
+
+
+# Older latency dumps are deleted so one is not left behind per run forever
+LATENCY_DUMPS_KEPT = 5
+
+
+def dump_latency_stats():
+    """Write the latency histograms to logs/latency-<time>.json and return the path."""
+    log_dir = os.path.join(os.path.dirname(__file__), "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    path = os.path.join(log_dir, f"latency-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    latency_tracker.dump(path)
+    # The timestamped names sort oldest first
+    pattern = re.compile(r"latency-\d{8}-\d{6}\.json")
+    dumps = sorted(f for f in os.listdir(log_dir) if pattern.fullmatch(f))
+    for name in dumps[:-LATENCY_DUMPS_KEPT]:
+        try:
+            os.remove(os.path.join(log_dir, name))
+        except OSError:
+            pass
+    return path
+
+
+def dump_import_times():
+    """Write this boot's import times to logs/imports.json and return the path."""
+    log_dir = os.path.join(os.path.dirname(__file__), "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    path = os.path.join(log_dir, "imports.json")
+    import_timer.dump(path)
+    return path
+
+
+def save_latency_stats():
+    try:
+        path = dump_latency_stats()
+        menu_instance.display_message_screen("Latency", f"Saved {os.path.basename(path)}", delay=2, clear_after=False)
+    except Exception as e:
+        menu_instance.display_message_screen("Latency", f"Save failed: {e}", delay=2, clear_after=False)
+    draw_latency_screen()
+
+
+def main_menu_release(pin_name, hold_time):
+    if hold_time >= 2:
+        show_latency_screen()
+
+
+# --- Screen Registry ---
+
+def menu_keys(select, back, back_pin="KEY1"):
+    """Key table shared by list menus: move, select the item, go back."""
+    return {
+        "JOY_UP": lambda: menu_instance.navigate("up"),
+        "JOY_DOWN": lambda: menu_instance.navigate("down"),
+        "JOY_PRESS": lambda: select(menu_instance.get_selected_item()),
+        back_pin: back,
+    }
+
+
+def jump_to_settings_item():
+    """Main menu KEY1: move the highlight to the last item (Settings)."""
+    if menu_instance.selected_item != len(menu_instance.items) - 1:
+        menu_instance.selected_item = len(menu_instance.items) - 1
+        menu_instance.draw()
+
+
+def show_info_screen():
+    show_info()
+    menu_instance.draw()
+
+
+def change_brightness(step):
+    global brightness_level
+    level = min(100, max(0, brightness_level + step))
+    if level != brightness_level:
+        brightness_level = level
+        update_backlight()
+        draw_brightness_screen()
+
+
+def select_wifi_network(selection):
+    if selection == "Back" or selection == "No Networks Found":
+        show_settings_menu()
+    else:
+        connect_to_wifi(selection)
+
+
+def select_bluetooth_device(connect=None):
+    """Bluetooth list action: go back on the placeholder rows, else ``connect``."""
+    selection = menu_instance.get_selected_item()
+    if selection == "Back" or selection == "No Devices Found":
+        show_settings_menu()
+    elif connect:
+        connect(selection)
+
+
+def cancel_bluetooth_pairing():
+    global bt_pairing_cancel
+    bt_pairing_cancel = True
+
+
+def open_selected_note():
+    if menu_instance.items[0] != "No Notes Found":
+        view_note(menu_instance.get_selected_item())
+
+
+def edit_current_note():
+    if current_note_file:
+        try:
+            with open(os.path.join(NOTES_DIR, current_note_file), "r") as f:
+                text = f.read()
+        except Exception:
+            text = ""
+        start_notes(text, current_note_file)
+
+
+def step_headline(step):
+    index = current_story_index + step
+    if 0 <= index < len(nyt_stories):
+        draw_headline(index)
+
+
+def step_story(step):
+    index = current_story_index + step
+    if 0 <= index < len(nyt_stories):
+        draw_story_detail(index)
+
+
+def scroll_repeat(scroll):
+    """Repeat hook for text views: scroll ``count`` lines, draw once."""
+    def on_repeat(pin_name, count):
+        scroll(count if pin_name == "JOY_DOWN" else -count)
+    return on_repeat
+
+
+def web_browser_repeat(pin_name, count):
+    """Scroll a loaded page in one step; repeat keyboard moves one by one."""
+    if not web_keyboard_visible and pin_name in ("JOY_UP", "JOY_DOWN"):
+        if web_view and web_view.scroll(count if pin_name == "JOY_DOWN" else -count):
+            draw_web_browser_screen()
+        return
+    for _ in range(count):
+        handle_web_browser_input(pin_name)
+
+
+def handle_shell_release(pin_name, hold_time):
+    """Shell keys act on release so a long hold can mean something else."""
+    global shell_pending_char, shell_text, shell_keyboard_visible
+    global shell_page, shell_selected_group, shell_group_index
+    if pin_name == "KEY1":
+        if hold_time >= 1:
+            shell_text = shell_text[:-1]
+        elif shell_pending_char:
+            shell_text += shell_pending_char
+        shell_pending_char = None
+        draw_shell_screen()
+    elif pin_name == "KEY2":
+        if hold_time >= 1:
+            shell_keyboard_visible = False
+        else:
+            shell_page = (shell_page + 1) % len(SHELL_GROUP_SETS)
+            shell_selected_group = None
+            shell_group_index = 0
+        draw_shell_screen()
+    elif pin_name == "KEY3":
+        if hold_time >= 1:
+            show_main_menu()
+        elif console_mode:
+            run_in_background(autocomplete_shell)
+        else:
+            run_in_background(shell_enter, on_cancel=interrupt_shell)
+    elif pin_name == "JOY_PRESS" and console_mode:
+        if hold_time >= 1:
+            show_console_color_scheme_menu()
+
+
+def leave_on_long_left(pin_name, hold_time):
+    """Holding the joystick left for a second quits the AI story games."""
+    if hold_time >= 1:
+        show_main_menu()
+
+
+def story_game_input(handler):
+    """Input hook for AI story games: option keys wait on the chat API."""
+    def on_press(pin_name):
+        if pin_name in ("KEY1", "KEY2", "KEY3"):
+            run_in_background(handler, pin_name)
+        else:
+            handler(pin_name)
+    return on_press
+
+
+def register_screens():
+    """Fill ``screens`` with the input and drawing hooks of every screen."""
+    add = screens.add
+    all_pins = tuple(BUTTON_PINS)
+    joystick = ("JOY_UP", "JOY_DOWN", "JOY_LEFT", "JOY_RIGHT")
+    up_down = ("JOY_UP", "JOY_DOWN")
+    draw_menu = lambda: menu_instance.draw()
+
+    def add_menu(name, select, back, back_pin="KEY1", extra_keys=None, **hooks):
+        keys = menu_keys(select, back, back_pin)
+        keys.update(extra_keys or {})
+        add(name, keys=keys, render=draw_menu, repeat_pins=up_down, **hooks)
+        menu_screens.add(name)
+
+    # List menus
+    add_menu("main_menu", handle_menu_selection, jump_to_settings_item,
+             extra_keys={"KEY2": show_info_screen},
+             on_release=main_menu_release, release_pins=("KEY1",))
+    add_menu("settings", handle_settings_selection, show_main_menu)
+    add_menu("display_settings", handle_display_selection, show_settings_menu)
+    add_menu("font_menu", handle_font_selection, show_display_menu)
+    add_menu("text_size_menu", handle_text_size_selection, show_display_menu)
+    add_menu("color_scheme_menu", handle_color_scheme_selection, show_display_menu)
+    add_menu("console_color_scheme_menu", handle_console_color_scheme_selection, start_console)
+    add_menu("wifi_list", select_wifi_network, show_settings_menu)
+    add_menu("bluetooth_menu", handle_bluetooth_menu_selection, show_settings_menu)
+    add_menu(
+        "bluetooth_list",
+        lambda item: select_bluetooth_device(),
+        lambda: select_bluetooth_device(connect_bluetooth_device),
+        extra_keys={"KEY2": lambda: select_bluetooth_device(connect_bluetooth_device_with_pin)},
+    )
+    add_menu("games", handle_games_selection, show_main_menu)
+    add_menu("utilities", handle_utilities_selection, show_main_menu)
+    add_menu("notes_menu", handle_notes_menu_selection, show_main_menu)
+    add_menu("notes_list", lambda item: open_selected_note(), show_main_menu, back_pin="KEY3")
+
+    # Settings screens
+    add("brightness", render=draw_brightness_screen, repeat_pins=("JOY_LEFT", "JOY_RIGHT"), keys={
+        "JOY_LEFT": lambda: change_brightness(-10),
+        "JOY_RIGHT": lambda: change_brightness(10),
+        "JOY_PRESS": show_display_menu,
+        "KEY1": show_display_menu,
+    })
+    add("bluetooth_pairing", keys={"KEY1": cancel_bluetooth_pairing}, cancel_pins=("KEY1", "KEY3"))
+    add("weather", pins=all_pins, on_press=handle_weather_input)
+    add("zip_entry", pins=all_pins, on_press=handle_zip_entry_input, render=draw_zip_entry_screen)
+
+    add("system_monitor", render=draw_system_monitor, enter=start_monitor_timer,
+        exit=stop_monitor_timer, keys={"KEY1": cycle_monitor_window, "KEY3": show_utilities_menu})
+    add("threads", render=draw_threads_screen, repeat_pins=up_down,
+        enter=lambda: start_monitor_timer(draw_threads_screen, "threads"), exit=stop_monitor_timer, keys={
+            "JOY_UP": lambda: scroll_threads(-1),
+            "JOY_DOWN": lambda: scroll_threads(1),
+            "KEY3": show_utilities_menu,
+        })
+    add("latency", render=draw_latency_screen, keys={
+        "JOY_LEFT": lambda: step_latency_screen(-1),
+        "JOY_RIGHT": lambda: step_latency_screen(1),
+        "KEY2": save_latency_stats,
+        "KEY3": show_main_menu,
+    })
+
+    # Scrolling text views
+    add("note_view", render=lambda: note_render(), repeat_pins=up_down,
+        on_repeat=scroll_repeat(scroll_note), keys={
+        "JOY_UP": lambda: scroll_note(-1),
+        "JOY_DOWN": lambda: scroll_note(1),
+        "KEY1": edit_current_note,
+        "KEY2": delete_current_note,
+        "KEY3": show_notes_list,
+    })
+    add("nyt_headline", render=lambda: draw_headline(current_story_index), repeat_pins=up_down, keys={
+        "JOY_UP": lambda: step_headline(-1),
+        "JOY_DOWN": lambda: step_headline(1),
+        "KEY1": lambda: draw_story_detail(current_story_index),
+        "KEY3": show_main_menu,
+    })
+    add("nyt_story", render=lambda: story_render(), repeat_pins=up_down,
+        on_repeat=scroll_repeat(scroll_story), keys={
+        "JOY_UP": lambda: scroll_story(-1),
+        "JOY_DOWN": lambda: scroll_story(1),
+        "JOY_LEFT": lambda: step_story(-1),
+        "JOY_RIGHT": lambda: step_story(1),
+        "KEY1": open_current_story,
+        "KEY3": lambda: run_in_background(show_top_stories),
+    })
+    add("scroll_message", render=lambda: message_render(), repeat_pins=up_down,
+        on_repeat=scroll_repeat(scroll_message), keys={
+        "JOY_UP": lambda: scroll_message(-1),
+        "JOY_DOWN": lambda: scroll_message(1),
+        "KEY3": show_main_menu,
+    })
+    add("image_gallery", pins=("JOY_LEFT", "JOY_RIGHT", "JOY_PRESS"),
+        on_press=handle_gallery_input, render=show_gallery_image)
+
+    # Games
+    add("button_game", pins=tuple(BUTTON_NAMES), on_press=handle_game_input)
+    add("launch_codes", pins=all_pins, on_press=handle_launch_input)
+    for name, handler in (
+        ("snake", handle_snake_input),
+        ("tetris", handle_tetris_input),
+        ("rps", handle_rps_input),
+        ("space_invaders", handle_space_invaders_input),
+        ("axe", handle_axe_input),
+        ("trivia", handle_trivia_input),
+        ("two_player_trivia", handle_two_player_trivia_input),
+        ("hack_in", handle_hack_in_input),
+        ("pico_wow", handle_pico_wow_input),
+        ("gta_1997", handle_gta_1997_input),
+        ("doctor_mode", handle_doctor_mode_input),
+    ):
+        add(name, pins=all_pins, on_press=handler)
+    for name, handler in (
+        ("vet_adventure", handle_vet_adventure_input),
+        ("ai_cases", handle_ai_cases_input),
+    ):
+        add(name, pins=all_pins, on_press=story_game_input(handler),
+            on_release=leave_on_long_left, release_pins=("JOY_LEFT",))
+
+    # Text entry and tools
+    add("notes", pins=all_pins, on_press=handle_notes_input, render=draw_notes_screen,
+        repeat_pins=joystick)
+    add("novel_typer", pins=all_pins, on_press=handle_novel_typer_input,
+        render=draw_novel_typer_screen)
+    add("shell", pins=all_pins, on_press=handle_shell_input, render=draw_shell_screen,
+        on_release=handle_shell_release, release_pins=("KEY1", "KEY2", "KEY3", "JOY_PRESS"),
+        enter=start_cursor, exit=stop_cursor)
+    add("sudo_password", pins=all_pins, on_press=handle_sudo_password_input,
+        render=draw_sudo_password_screen, repeat_pins=joystick)
+    add("raspi_config", pins=all_pins, on_press=handle_raspi_input, render=draw_raspi_screen)
+    add("irc_chat", pins=all_pins, on_press=handle_irc_chat_input, repeat_pins=joystick,
+        render=lambda: draw_irc_input_screen() if irc_typing else draw_chat_screen())
+    add("web_browser", pins=all_pins, on_press=handle_web_browser_input,
+        render=draw_web_browser_screen, repeat_pins=joystick, on_repeat=web_browser_repeat)
+    add("rdp_input", pins=all_pins, on_press=handle_rdp_input, render=draw_rdp_input_screen,
+        repeat_pins=joystick)
+    add("rdp_session", pins=all_pins, on_press=handle_rdp_session_input,
+        render=draw_rdp_session_screen)
+
+
+register_screens()
+
+
+# --- Boot ---
+# Seconds after the menu is up before non-essential services start
+BACKGROUND_START_DELAY = 0.5
+
+
+def prefetch_weather():
+    """Fill the weather cache for the first ZIP so the screen opens at once."""
+    zip_code = WEATHER_ZIPS[0]
+    if zip_code not in weather_cache:
+        data = fetch_weather_data(zip_code)
+        if data:
+            weather_cache[zip_code] = data
+
+
+def update_splash(menu_frame):
+    """Cache ``menu_frame`` as the next boot's splash if it has changed."""
+    if menu_frame is None:
+        return
+    if boot_splash is not None and (boot_splash == menu_frame).all():
+        return
+    try:
+        boot.save_splash(SPLASH_FILE, menu_frame)
+        print(f"Boot splash saved to {SPLASH_FILE}")
+    except Exception as e:
+        print(f"Failed to save boot splash: {e}")
+
+
+def dump_boot_timeline():
+    """Write the boot milestones to logs/boot.json and return the path."""
+    log_dir = os.path.join(os.path.dirname(__file__), "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    path = os.path.join(log_dir, "boot.json")
+    boot_timeline.dump(path)
+    return path
+
+
+def start_background_services(menu_frame):
+    """Start everything the menu doesn't need, then log how boot went.
+
+    Runs on the event loop shortly after the menu is taking input. IRC
+    connects with IRC_CONNECT_TIMEOUT and the weather prefetch runs on the
+    worker pool with its own request timeouts.
+    """
+    connect_irc()
+    start_wifi_monitor()
+    start_metrics()
+    start_bt_log_monitor()
+    worker_pool.submit(prefetch_weather, name="prefetch_weather")
+    if WARM_UP_APPS:
+        threading.Thread(target=apps.warm_up, name="warm-up", daemon=True).start()
+    boot_timeline.mark("services started")
+
+    update_splash(menu_frame)
+    print("Boot timeline:")
+    for line in boot_timeline.lines():
+        print(f"  {line}")
+    print(f"Imports: {import_timer.report()}")
+    try:
+        dump_boot_timeline()
+        dump_import_times()
+    except Exception as e:
+        print(f"Failed to save boot logs: {e}")
+
+
 # --- Main Execution ---
 if __name__ == "__main__":
+    if os.environ.get(replay.RECORD_ENV):
+        # Record every edge for benchmarks/replay.py; the seed makes games repeatable
+        input_recorder = replay.Recorder(os.environ[replay.RECORD_ENV], BUTTON_PINS)
+        random.seed(input_recorder.seed)
+        print(f"Recording input to {os.environ[replay.RECORD_ENV]}")
     load_settings()
+    load_chat_history()
+    wifi_monitor.refresh()
+    boot_timeline.mark("settings loaded")
     menu_instance = Menu([])
-    connect_irc()
     show_main_menu()
-    start_bt_log_monitor()
+    display_worker.flush()
+    boot_timeline.mark("menu shown")
+    import_timer.uninstall()
+    menu_frame = partial_display.snapshot_565()
 
     # Attach event detection to all desired pins after the menu is ready
+    input_events.start()
+    key_repeater.start()
     for pin_name, pin_num in BUTTON_PINS.items():
         # Detect both rising and falling edges to track press/release for robustness
         GPIO.add_event_detect(pin_num, GPIO.BOTH, callback=button_event_handler, bouncetime=100)
@@ -4114,13 +4719,19 @@ if __name__ == "__main__":
         backlight_pwm = GPIO.PWM(BL_PIN, 1000)
         backlight_pwm.start(brightness_level)
 
-        menu_instance.draw() # Initial draw of the menu
+        if HARDWARE_BACKEND == "virtual":
+            # Drive the fake buttons from a script or stdin if one is configured
+            GPIO.start_input(BUTTON_PINS)
+        boot_timeline.mark("input ready")
+
+        # IRC, the bluetooth monitor and friends start once the loop is running
+        runtime.call_later(BACKGROUND_START_DELAY, start_background_services, menu_frame)
 
         print("Mini-OS running. Awaiting input...")
 
-        # Keep the script running, main logic is now handled by button_event_handler callbacks
-        while True:
-            time.sleep(1) # Sleep to reduce CPU usage. Callbacks wake it up.
+        # Input is handled by the dispatcher thread; the main thread runs the
+        # event loop, which sleeps until a timer is due or a socket has data
+        runtime.run()
 
     except KeyboardInterrupt:
         print("Mini-OS interrupted by user (Ctrl+C).")
@@ -4133,11 +4744,39 @@ if __name__ == "__main__":
             print(f"Could not display error on screen: {display_e}")
     finally:
         print("Cleaning up display and GPIO resources...")
+        print(f"Display updates: {partial_display.report()}")
+        print(f"Text cache: {text_cache.report()}")
+        print(f"Input events: {input_events.report()}")
+        print(f"Key repeat: {key_repeater.report()}")
+        print(f"Latency: {latency_tracker.report()}")
+        if latency_tracker.screens():
+            try:
+                print(f"Latency histograms saved to {dump_latency_stats()}")
+            except Exception as e:
+                print(f"Failed to save latency histograms: {e}")
+        print(f"Background jobs: {worker_pool.report()}")
+        print(f"Event loop: {runtime.report()}")
+        print(f"IRC: {irc_client.report()}")
+        print(f"Wi-Fi: {wifi_monitor.report()}")
+        print(f"System info: {sysinfo.report()}")
+        print(f"Threads: {thread_stats.report()}")
+        print(f"HTTP: {http_client.report()}")
+        if metrics is not None:
+            print(f"Metrics: {metrics.report()}")
+            metrics.flush()
+        print(f"Chat log: {chat_log.report()}")
+        print(f"Lazy modules: {apps.report()}")
+        worker_pool.cancel_all()
+        if input_recorder:
+            input_recorder.close()
+            print(f"Recorded {input_recorder.count} input edges")
         try:
             menu_instance.clear_display()
+            display_worker.stop()
             if backlight_pwm:
                 backlight_pwm.stop()
             GPIO.output(BL_PIN, GPIO.LOW)
+            partial_display.close() # Back to 18-bit pixels, which luma's cleanup sends
             device.cleanup() # Releases luma.lcd resources
         except Exception as cleanup_e:
             print(f"Error during cleanup: {cleanup_e}")
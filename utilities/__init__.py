@@ -1,2 +1,33 @@
-from . import web_server, update_repo
-__all__ = ["web_server", "update_repo"]
+"""Helper modules for Mini OS, imported on first use to keep boot fast."""
+
+import importlib
+
+__all__ = [
+    "web_server",
+    "update_repo",
+    "display",
+    "hardware",
+    "text_layout",
+    "text_cache",
+    "scroll_view",
+    "events",
+    "screens",
+    "latency",
+    "replay",
+    "runtime",
+    "apps",
+    "boot",
+    "irc",
+    "chat_log",
+    "network",
+    "sysinfo",
+    "metrics",
+    "thread_stats",
+    "http_client",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,216 @@
+"""Lazy loading of games and heavy libraries, plus an import-time report.
+
+Importing every game at boot pulled in ``openai`` and built the trivia
+question bank before the first menu frame.  :class:`AppRegistry` hands out
+:class:`LazyModule` stand-ins instead; the real module is imported the first
+time one of its attributes is used, normally when its menu entry is
+selected.  :class:`ImportTimer` records how long each module took to import
+so the slow ones are easy to spot.
+"""
+
+import importlib
+import json
+import sys
+import threading
+import time
+
+
+class _TimedLoader:
+    """Loader wrapper that times ``exec_module`` for :class:`ImportTimer`."""
+
+    def __init__(self, loader, timer):
+        self.loader = loader
+        self.timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Nothing after import should see the wrapper
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+        self.timer.begin(module.__name__)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer.end(module.__name__)
+
+
+class ImportTimer:
+    """Meta path hook recording self and cumulative import time per module.
+
+    Like ``python -X importtime``, but kept in memory so Mini OS can write
+    its own report.  Install it before the imports to be measured.
+    """
+
+    def __init__(self):
+        self.modules = {}  # name -> [self seconds, cumulative seconds]
+        self.local = threading.local()
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            sys.meta_path.insert(0, self)
+            self.installed = True
+
+    def uninstall(self):
+        if self.installed:
+            sys.meta_path.remove(self)
+            self.installed = False
+
+    def find_spec(self, name, path, target=None):
+        if getattr(self.local, "finding", False):
+            return None
+        self.local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self.local.finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def begin(self, name):
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        # name, start time, time spent importing nested modules
+        stack.append([name, time.perf_counter(), 0.0])
+
+    def end(self, name):
+        name, start, nested = self.local.stack.pop()
+        elapsed = time.perf_counter() - start
+        self.modules[name] = [elapsed - nested, elapsed]
+        if self.local.stack:
+            self.local.stack[-1][2] += elapsed
+
+    def slowest(self, count=None):
+        """Return ``(name, self ms, cumulative ms)`` sorted by self time."""
+        rows = [(name, s * 1000, c * 1000) for name, (s, c) in self.modules.items()]
+        rows.sort(key=lambda row: -row[1])
+        return rows[:count] if count else rows
+
+    def dump(self, path, extra=None):
+        """Write every timed module to ``path`` as JSON."""
+        data = {
+            "time": time.time(),
+            "total_ms": round(sum(s for s, _ in self.modules.values()) * 1000, 3),
+            "modules": [
+                {"name": name, "self_ms": round(s, 3), "cumulative_ms": round(c, 3)}
+                for name, s, c in self.slowest()
+            ],
+        }
+        if extra:
+            data.update(extra)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1)
+
+    def report(self):
+        if not self.modules:
+            return "no imports timed"
+        total = sum(s for s, _ in self.modules.values()) * 1000
+        top = ", ".join(f"{name} {ms:.0f}ms" for name, ms, _ in self.slowest(3))
+        return f"{len(self.modules)} modules in {total:.0f}ms (slowest: {top})"
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __init__(self, registry, name):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.load(self._name), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._registry.load(self._name), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self._name in self._registry.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+class AppRegistry:
+    """Modules that are imported on demand, with the time each load took."""
+
+    def __init__(self):
+        self.names = []
+        self.loaded = {}  # name -> seconds spent importing it here
+        self.warmed = set()  # names loaded by warm_up() rather than on demand
+        self.lock = threading.Lock()
+        self.hooks = []
+
+    def lazy(self, name):
+        """Return a :class:`LazyModule` for ``name``, imported on first use."""
+        if name not in self.names:
+            self.names.append(name)
+        return LazyModule(self, name)
+
+    def on_load(self, hook):
+        """Call ``hook(module)`` for every module this registry loads from now on."""
+        self.hooks.append(hook)
+
+    def load(self, name, warming=False):
+        """Import ``name`` if needed and return the module.
+
+        ``warming`` marks a load made by :meth:`warm_up` for the report.
+        """
+        if name in self.loaded:
+            return sys.modules[name]
+        # importlib already serialises imports of the same module
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            if name in self.loaded:
+                return module
+            self.loaded[name] = elapsed
+            if warming:
+                self.warmed.add(name)
+        for hook in self.hooks:
+            hook(module)
+        if elapsed > 0.005:
+            print(f"Loaded {name} in {elapsed * 1000:.0f}ms")
+        return module
+
+    def pending(self):
+        return [name for name in self.names if name not in self.loaded]
+
+    def warm_up(self, pause=0.2, stop=None):
+        """Load every module not loaded yet, pausing between them.
+
+        Meant to run on a background thread once the first frame is up, so
+        later menu selections don't wait for imports.  ``stop`` is an
+        optional ``threading.Event`` that ends the warm-up early.
+        """
+        for name in self.pending():
+            if stop is not None and stop.is_set():
+                return
+            try:
+                self.load(name, warming=True)
+            except Exception as e:
+                print(f"Warm-up of {name} failed: {e}")
+            time.sleep(pause)
+
+    def report(self):
+        with self.lock:
+            loaded = dict(self.loaded)
+            warmed = set(self.warmed)
+        demand = sum(t for name, t in loaded.items() if name not in warmed) * 1000
+        warm = sum(t for name, t in loaded.items() if name in warmed) * 1000
+        return (
+            f"{len(loaded)}/{len(self.names)} loaded: {len(loaded) - len(warmed)} on demand "
+            f"in {demand:.0f}ms, {len(warmed)} by warm-up in {warm:.0f}ms"
+        )
@@ -0,0 +1,91 @@
+"""Boot timeline and the cached splash frame shown before the menu is ready.
+
+The splash is the main menu exactly as last sent to the panel, stored as raw
+big-endian RGB565 (the controller's wire format, 32 KB for 128x128).  It can
+be pushed as soon as the display exists, long before fonts, settings and the
+rest of Mini OS have loaded.
+"""
+
+import json
+import os
+import time
+
+try:
+    import numpy as np
+except ImportError:  # Without NumPy there is no RGB565 path, so no splash
+    np = None
+
+
+def process_age():
+    """Return seconds since this process started, or 0.0 if unknown."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the command name; starttime is field 22 overall
+            fields = f.read().rsplit(")", 1)[1].split()
+        start_ticks = int(fields[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class BootTimeline:
+    """Named milestones in milliseconds since the process started."""
+
+    def __init__(self):
+        self.start = time.monotonic() - process_age()
+        self.marks = []
+
+    def mark(self, name):
+        """Record that ``name`` has just happened; return ms since process start."""
+        ms = (time.monotonic() - self.start) * 1000
+        self.marks.append((name, ms))
+        return ms
+
+    def lines(self):
+        """Return one ``"   123ms  name"`` line per mark with the gap since the previous one."""
+        lines = []
+        previous = 0.0
+        for name, ms in self.marks:
+            lines.append(f"{ms:7.0f}ms  +{ms - previous:5.0f}  {name}")
+            previous = ms
+        return lines
+
+    def dump(self, path):
+        """Write the marks to ``path`` as JSON."""
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "time": time.time(),
+                    "marks": [{"name": name, "ms": round(ms, 1)} for name, ms in self.marks],
+                },
+                f,
+                indent=1,
+            )
+
+    def report(self):
+        if not self.marks:
+            return "no boot marks"
+        name, ms = self.marks[-1]
+        return f"{name} after {ms:.0f}ms"
+
+
+def load_splash(path, width, height):
+    """Return the cached splash as a ``(height, width)`` uint16 array, or None."""
+    if np is None:
+        return None
+    try:
+        raw = np.fromfile(path, dtype=">u2")
+    except (OSError, ValueError):
+        return None
+    if raw.size != width * height:
+        return None
+    return raw.reshape(height, width).astype(np.uint16)
+
+
+def save_splash(path, frame):
+    """Store RGB565 ``frame`` as the splash, replacing the old file atomically."""
+    tmp = f"{path}.tmp"
+    frame.astype(">u2").tofile(tmp)
+    os.replace(tmp, path)
@@ -0,0 +1,190 @@
+"""Append-only chat history on disk with a fixed-size record index.
+
+Messages go to a text file, one ``time<TAB>nick<TAB>text`` line each, so the
+log stays readable with ``less``.  Beside it a binary index holds one
+:data:`RECORD` per line: the time, the line's byte offset and a CRC of the
+lower-cased nick.  Line *n* is found with one 20 byte read of the index and
+a range of lines with one read of the log, so the chat screen can show the
+newest lines at boot and page back without loading the history.  A nick
+search only reads the index plus the lines that match, and a substring
+search reads the log backwards a chunk at a time and stops once it has
+enough hits.
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+
+# time (float seconds), byte offset of the line, crc32 of the lower-cased nick
+RECORD = struct.Struct("<dQI")
+# Index records read per chunk when searching backwards
+SEARCH_CHUNK = 1024
+
+
+def nick_key(nick):
+    return zlib.crc32(nick.lower().encode())
+
+
+class ChatLog:
+    """Thread-safe append-only log of ``(time, nick, text)`` messages."""
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or f"{os.path.splitext(path)[0]}.idx"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self.index_fd = os.open(self.index_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self.size = os.fstat(self.fd).st_size
+        self.count = 0
+        self.repaired = self._repair()
+        self.appended = 0
+        self.bytes_read = 0
+
+    def close(self):
+        with self.lock:
+            os.close(self.fd)
+            os.close(self.index_fd)
+
+    def __len__(self):
+        return self.count
+
+    def _repair(self):
+        """Bring the index in line with the log after a crash; return lines re-indexed.
+
+        The log is written before the index, so at worst the index is
+        missing the last few lines or ends in a partial record.
+        """
+        index_size = os.fstat(self.index_fd).st_size
+        self.count = index_size // RECORD.size
+        while self.count and self._read_record(self.count - 1)[1] >= self.size:
+            self.count -= 1
+        if self.count * RECORD.size != index_size:
+            os.ftruncate(self.index_fd, self.count * RECORD.size)
+
+        # Index whatever follows the last indexed line
+        start = 0
+        if self.count:
+            offset = self._read_record(self.count - 1)[1]
+            start = self._line_end(offset)
+        tail = os.pread(self.fd, self.size - start, start) if start < self.size else b""
+        if tail and not tail.endswith(b"\n"):
+            # A torn final write; finish the line so the next append starts clean
+            os.write(self.fd, b"\n")
+            tail += b"\n"
+            self.size += 1
+        records = []
+        offset = start
+        for raw in tail.splitlines(keepends=True):
+            entry = self._parse(raw)
+            if entry is not None:
+                records.append(RECORD.pack(entry[0], offset, nick_key(entry[1])))
+            offset += len(raw)
+        if records:
+            os.write(self.index_fd, b"".join(records))
+            self.count += len(records)
+        return len(records)
+
+    def _line_end(self, offset):
+        """Return the offset just past the line starting at ``offset``."""
+        pos = offset
+        while pos < self.size:
+            chunk = os.pread(self.fd, 4096, pos)
+            newline = chunk.find(b"\n")
+            if newline >= 0:
+                return pos + newline + 1
+            pos += len(chunk)
+        return self.size
+
+    def _read_record(self, i):
+        return RECORD.unpack(os.pread(self.index_fd, RECORD.size, i * RECORD.size))
+
+    def _read_records(self, start, stop):
+        data = os.pread(self.index_fd, (stop - start) * RECORD.size, start * RECORD.size)
+        self.bytes_read += len(data)
+        return list(RECORD.iter_unpack(data))
+
+    @staticmethod
+    def _parse(raw):
+        try:
+            when, nick, text = raw.decode(errors="replace").rstrip("\n").split("\t", 2)
+            return float(when), nick, text
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _clean(value):
+        return value.replace("\t", " ").replace("\r", " ").replace("\n", " ")
+
+    def append(self, nick, text, when=None):
+        """Add a message and return its line number."""
+        when = time.time() if when is None else when
+        nick = self._clean(nick)
+        data = f"{when:.3f}\t{nick}\t{self._clean(text)}\n".encode(errors="replace")
+        with self.lock:
+            offset = self.size
+            os.write(self.fd, data)
+            self.size += len(data)
+            os.write(self.index_fd, RECORD.pack(when, offset, nick_key(nick)))
+            self.count += 1
+            self.appended += 1
+            return self.count - 1
+
+    def read(self, start, stop):
+        """Return messages ``start`` to ``stop`` (exclusive) as ``(time, nick, text)``."""
+        with self.lock:
+            start = max(0, start)
+            stop = min(stop, self.count)
+            if start >= stop:
+                return []
+            first = self._read_record(start)[1]
+            end = self._read_record(stop)[1] if stop < self.count else self.size
+            data = os.pread(self.fd, end - first, first)
+        self.bytes_read += len(data) + 2 * RECORD.size
+        entries = (self._parse(raw) for raw in data.splitlines())
+        return [entry for entry in entries if entry is not None]
+
+    def tail(self, n):
+        """Return the newest ``n`` messages, oldest first."""
+        return self.read(self.count - n, self.count)
+
+    def search(self, nick=None, text=None, limit=50, before=None):
+        """Return up to ``limit`` of the newest matches as ``(number, (time, nick, text))``.
+
+        ``nick`` matches exactly (ignoring case) and ``text`` as a
+        case-insensitive substring; only lines before ``before`` are looked
+        at.  The results are oldest first.
+        """
+        key = nick_key(nick) if nick else None
+        needle = text.lower() if text else None
+        hits = []
+        stop = min(self.count if before is None else before, self.count)
+        while stop > 0 and len(hits) < limit:
+            start = max(0, stop - SEARCH_CHUNK)
+            if key is None:
+                lines = self.read(start, stop)
+                numbers = range(start, start + len(lines))
+            else:
+                # Read only the lines whose nick CRC matches
+                records = self._read_records(start, stop)
+                numbers = [start + i for i, record in enumerate(records) if record[2] == key]
+                lines = [entry for number in numbers for entry in self.read(number, number + 1)]
+            for number, entry in reversed(list(zip(numbers, lines))):
+                if nick and entry[1].lower() != nick.lower():
+                    continue
+                if needle and needle not in entry[2].lower():
+                    continue
+                hits.append((number, entry))
+                if len(hits) >= limit:
+                    break
+            stop = start
+        hits.reverse()
+        return hits
+
+    def report(self):
+        return (
+            f"{self.count} lines ({self.size // 1024} KB), {self.appended} appended, "
+            f"{self.repaired} re-indexed, {self.bytes_read // 1024} KB read"
+        )
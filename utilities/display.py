@@ -0,0 +1,370 @@
+"""Frame-diffing display layer that only pushes changed regions over SPI."""
+
+import threading
+import time
+from PIL import ImageChops
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to the slower PIL path
+    np = None
+
+# luma drives the ST7735 in 18-bit mode, which sends one byte per channel.
+# With NumPy available the controller is switched to 16-bit RGB565 instead.
+BYTES_PER_PIXEL = 3
+RGB565_BYTES_PER_PIXEL = 2
+# Approximate cost of opening a window (CASET/RASET/RAMWR plus arguments).
+WINDOW_OVERHEAD_BYTES = 11
+
+
+def to_rgb565(image, out=None):
+    """Convert a PIL RGB image to a ``(height, width)`` uint16 RGB565 array.
+
+    Callers that show the same bitmap repeatedly (such as the gallery) can
+    keep the result and pass it straight to :meth:`PartialDisplay.display`.
+    When ``out`` is given the result is written into it instead of a new array.
+    """
+    rgb = np.asarray(image.convert("RGB") if image.mode != "RGB" else image)
+    if out is None:
+        out = np.empty(rgb.shape[:2], dtype=np.uint16)
+    scratch = np.empty_like(out)
+    _pack_rgb565(rgb, out, scratch)
+    return out
+
+
+def _pack_rgb565(rgb, out, scratch):
+    """Pack an ``(h, w, 3)`` uint8 array into ``out`` using ``scratch`` as a temporary."""
+    np.copyto(out, rgb[..., 0])
+    out &= 0xF8
+    out <<= 8
+    np.copyto(scratch, rgb[..., 1])
+    scratch &= 0xFC
+    scratch <<= 3
+    out |= scratch
+    np.copyto(scratch, rgb[..., 2])
+    scratch >>= 3
+    out |= scratch
+
+
+class PartialDisplay:
+    """Wrap an ST7735 device and send only the windows that changed.
+
+    The last frame pushed is kept so each new frame can be diffed against it.
+    Changes are found per horizontal band and neighbouring bands are merged
+    when one larger window is cheaper than two separate ones.  The device
+    should be created with ``full_frame()`` so luma does not diff a second time.
+
+    When NumPy is installed the controller is put in RGB565 mode and frames
+    are converted into preallocated buffers, so no pixel data is allocated
+    per frame.  Frames may then also be passed as uint16 RGB565 arrays.
+    """
+
+    def __init__(self, device, band_height=8, use_numpy=None, bus_speed_hz=None):
+        self.device = device
+        self.band_height = band_height
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+        self.prev_image = None
+        width, height = device.width, device.height
+        if self.use_numpy:
+            self.bytes_per_pixel = RGB565_BYTES_PER_PIXEL
+            device.command(0x3A, 0x05)  # interface pixel format: 16-bit
+            self._cur = np.empty((height, width), dtype=np.uint16)
+            self._prev = np.empty((height, width), dtype=np.uint16)
+            self._scratch = np.empty((height, width), dtype=np.uint16)
+            self._mask = np.empty((height, width), dtype=bool)
+            # Big-endian wire buffer reused for every window that is sent
+            self._wire = bytearray(width * height * RGB565_BYTES_PER_PIXEL)
+            self._have_prev = False
+        else:
+            self.bytes_per_pixel = BYTES_PER_PIXEL
+        self.full_bytes = width * height * self.bytes_per_pixel
+        # Seconds the SPI clock takes per byte, used to estimate savings;
+        # without a known clock no time saving is reported
+        self.byte_time = 8 / bus_speed_hz if bus_speed_hz else None
+        self.last_frame = {}
+        self.totals = {
+            "frames": 0,
+            "skipped": 0,
+            "bytes_sent": 0,
+            "bytes_saved": 0,
+            "time_spent": 0.0,
+            "time_saved": 0.0,
+        }
+
+    def close(self):
+        """Put the controller back in luma's 18-bit mode before luma uses it again.
+
+        luma's ``clear()`` and ``cleanup()`` send three bytes per pixel, which
+        the panel would misread while it is still in RGB565 mode.
+        """
+        if self.use_numpy:
+            self.device.command(0x3A, 0x06)  # interface pixel format: 18-bit
+            self.use_numpy = False
+            self.bytes_per_pixel = BYTES_PER_PIXEL
+            self.invalidate()
+
+    def invalidate(self):
+        """Forget the previous frame so the next one is sent in full."""
+        self.prev_image = None
+        if self.use_numpy:
+            self._have_prev = False
+
+    def snapshot_565(self):
+        """Return a copy of the last frame sent as an RGB565 array, or None.
+
+        The copy is what the panel shows, after the device's preprocessing, so
+        passing it back to :meth:`display` redraws the same picture.
+        """
+        if np is None:
+            return None
+        if self.use_numpy:
+            return self._prev.copy() if self._have_prev else None
+        if self.prev_image is None:
+            return None
+        return to_rgb565(self.prev_image)
+
+    def changed_boxes(self, image):
+        """Return bounding boxes covering every pixel that differs from the last frame."""
+        width, height = image.size
+        if self.prev_image is None or self.prev_image.size != image.size:
+            return [(0, 0, width, height)]
+        diff = ImageChops.difference(self.prev_image, image)
+        bbox = diff.getbbox()
+        if bbox is None:
+            return []
+
+        boxes = []
+        top = bbox[1] - bbox[1] % self.band_height
+        for y in range(top, bbox[3], self.band_height):
+            band = (bbox[0], y, bbox[2], min(y + self.band_height, bbox[3]))
+            sub = diff.crop(band).getbbox()
+            if sub is None:
+                continue
+            self._add_box(boxes, (band[0] + sub[0], y + sub[1], band[0] + sub[2], y + sub[3]))
+        return boxes
+
+    def changed_boxes_565(self):
+        """Return changed boxes between the current and previous RGB565 buffers."""
+        height, width = self._cur.shape
+        if not self._have_prev:
+            return [(0, 0, width, height)]
+        mask = self._mask
+        np.not_equal(self._cur, self._prev, out=mask)
+        rows = np.flatnonzero(mask.any(axis=1))
+        if not len(rows):
+            return []
+
+        boxes = []
+        band_h = self.band_height
+        first_band = rows[0] - rows[0] % band_h
+        for y in range(first_band, rows[-1] + 1, band_h):
+            band_rows = rows[(rows >= y) & (rows < y + band_h)]
+            if not len(band_rows):
+                continue
+            top, bottom = band_rows[0], band_rows[-1] + 1
+            cols = np.flatnonzero(mask[top:bottom].any(axis=0))
+            self._add_box(boxes, (int(cols[0]), int(top), int(cols[-1]) + 1, int(bottom)))
+        return boxes
+
+    def _add_box(self, boxes, box):
+        """Append ``box`` or merge it into the previous one if that is cheaper."""
+        if boxes and self._worth_merging(boxes[-1], box):
+            last = boxes[-1]
+            boxes[-1] = (min(last[0], box[0]), last[1], max(last[2], box[2]), box[3])
+        else:
+            boxes.append(box)
+
+    def _worth_merging(self, a, b):
+        """Return True if sending ``a`` and ``b`` as one window costs less."""
+        merged = (min(a[0], b[0]), a[1], max(a[2], b[2]), b[3])
+        separate = self._box_bytes(a) + self._box_bytes(b) + WINDOW_OVERHEAD_BYTES
+        return self._box_bytes(merged) <= separate
+
+    def _box_bytes(self, box):
+        """Return the number of pixel bytes needed to send ``box``."""
+        return (box[2] - box[0]) * (box[3] - box[1]) * self.bytes_per_pixel
+
+    def _set_window(self, box):
+        """Point the controller's RAM write window at ``box``."""
+        dev = self.device
+        left, top, right, bottom = dev.apply_offsets(box)
+        dev.command(0x2A, left >> 8, left & 0xFF, (right - 1) >> 8, (right - 1) & 0xFF)
+        dev.command(0x2B, top >> 8, top & 0xFF, (bottom - 1) >> 8, (bottom - 1) & 0xFF)
+        dev.command(0x2C)
+
+    def send_window(self, image, box):
+        """Write the pixels inside ``box`` to the matching controller window."""
+        self._set_window(box)
+        self.device.data(list(image.crop(box).tobytes()))
+
+    def send_window_565(self, box):
+        """Write ``box`` from the current RGB565 buffer via the reused wire buffer."""
+        left, top, right, bottom = box
+        count = (right - left) * (bottom - top)
+        wire = np.frombuffer(self._wire, dtype=">u2", count=count)
+        wire.shape = (bottom - top, right - left)
+        wire[...] = self._cur[top:bottom, left:right]
+        self._set_window(box)
+        self.device.data(memoryview(self._wire)[:count * RGB565_BYTES_PER_PIXEL])
+
+    def _load_565(self, frame):
+        """Fill the current buffer from a PIL image or an RGB565 array."""
+        if isinstance(frame, np.ndarray):
+            np.copyto(self._cur, frame)
+            return
+        if frame.mode != "RGB":
+            frame = frame.convert("RGB")
+        frame = self.device.preprocess(frame)
+        _pack_rgb565(np.asarray(frame), self._cur, self._scratch)
+
+    def display(self, frame):
+        """Diff ``frame`` against the previous one and send the changes.
+
+        ``frame`` is a PIL image, or a uint16 RGB565 array when NumPy is in use.
+        """
+        start = time.perf_counter()
+        if self.use_numpy:
+            self._load_565(frame)
+            boxes = self.changed_boxes_565()
+            for box in boxes:
+                self.send_window_565(box)
+            self._cur, self._prev = self._prev, self._cur
+            self._have_prev = True
+        else:
+            if frame.mode != self.device.mode:
+                frame = frame.convert(self.device.mode)
+            frame = self.device.preprocess(frame)
+            boxes = self.changed_boxes(frame)
+            for box in boxes:
+                self.send_window(frame, box)
+            self.prev_image = frame.copy()
+        if boxes and hasattr(self.device, "frame_done"):
+            # Lets virtual devices know a whole frame has been written
+            self.device.frame_done()
+        elapsed = time.perf_counter() - start
+        sent = sum(self._box_bytes(box) for box in boxes)
+
+        saved = self.full_bytes - sent
+        time_saved = saved * self.byte_time if self.byte_time else 0.0
+        self.last_frame = {
+            "windows": len(boxes),
+            "bytes_sent": sent,
+            "bytes_saved": saved,
+            "time_spent": elapsed,
+            "time_saved": time_saved,
+        }
+        totals = self.totals
+        totals["frames"] += 1
+        if not boxes:
+            totals["skipped"] += 1
+        totals["bytes_sent"] += sent
+        totals["bytes_saved"] += saved
+        totals["time_spent"] += elapsed
+        totals["time_saved"] += time_saved
+        return self.last_frame
+
+    def report(self):
+        """Return a one-line summary of the savings so far."""
+        t = self.totals
+        frames = t["frames"] or 1
+        text = (
+            f"{t['frames']} frames ({t['skipped']} unchanged), "
+            f"avg {t['bytes_sent'] // frames}B sent / {t['bytes_saved'] // frames}B saved"
+        )
+        if self.byte_time:
+            text += f", {t['time_saved'] * 1000:.0f}ms of SPI transfer saved total"
+        return text
+
+
+class DisplayWorker:
+    """Single thread that owns the display, fed by a one-slot mailbox.
+
+    Producers call :meth:`submit` and return immediately.  If a frame is still
+    waiting when a newer one arrives the older frame is dropped, so the screen
+    always catches up to the latest state instead of replaying stale frames.
+
+    A frame may carry a ``tag``.  Once it has been written, ``on_sent(tag,
+    seconds)`` is called with the time the sink took.  A tag on a dropped
+    frame moves to the frame that replaced it, which shows the same change.
+    """
+
+    def __init__(self, sink, lock=None, on_sent=None):
+        self.sink = sink
+        self.lock = lock or threading.Lock()
+        self.on_sent = on_sent
+        self._cond = threading.Condition()
+        self._pending = None
+        self._pending_tag = None
+        self._busy = False
+        self._running = False
+        self._thread = None
+        self.submitted = 0
+        self.dropped = 0
+
+    def start(self):
+        """Start the worker thread if it is not already running."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="display", daemon=True)
+        self._thread.start()
+
+    def submit(self, image, tag=None):
+        """Queue ``image`` for display, replacing any frame not yet sent."""
+        with self._cond:
+            if self._pending is not None:
+                self.dropped += 1
+                if tag is None:
+                    tag = self._pending_tag
+            self._pending = image
+            self._pending_tag = tag
+            self.submitted += 1
+            self._cond.notify()
+
+    def flush(self, timeout=1.0):
+        """Block until the mailbox is empty and the last frame has been sent."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending is not None or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout=1.0):
+        """Send any pending frame then stop the worker thread."""
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and self._running:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                image = self._pending
+                tag = self._pending_tag
+                self._pending = None
+                self._pending_tag = None
+                self._busy = True
+            try:
+                with self.lock:
+                    start = time.monotonic()
+                    self.sink(image)
+                    elapsed = time.monotonic() - start
+                if tag is not None and self.on_sent:
+                    self.on_sent(tag, elapsed)
+            except Exception as e:
+                print(f"Display update failed: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
@@ -0,0 +1,334 @@
+"""Input event queue, dispatcher thread and a small pool for slow actions.
+
+GPIO edge callbacks should return immediately, so they only timestamp the
+edge and :meth:`EventDispatcher.post` it.  A single dispatcher thread hands
+events to the handler in order, and anything that may block for seconds
+(network fetches, shell commands, scans) is pushed onto a
+:class:`WorkerPool` where it can be cancelled.
+"""
+
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+
+from .latency import nearest_rank
+
+# ``time`` is the ``time.monotonic()`` time of the edge and ``level`` the pin
+# level read then.  ``repeat`` is 0 for real edges; for events made by a
+# :class:`KeyRepeater` it is the number of repeat steps the event stands for.
+InputEvent = namedtuple("InputEvent", "channel level time repeat", defaults=(0,))
+
+# Work from another thread that must run in order with the input events
+_Call = namedtuple("_Call", "func")
+
+# Number of recent handler latencies kept for the percentile in stats()
+LATENCY_SAMPLES = 256
+
+
+class EventDispatcher:
+    """Bounded FIFO of input events drained by one thread.
+
+    ``handler`` is called with each :class:`InputEvent`.  If the queue is
+    full the newest event is dropped rather than blocking the poster.
+    Other threads can run a function between events with :meth:`call`.
+    """
+
+    def __init__(self, handler, maxsize=64):
+        self.handler = handler
+        self.queue = queue.Queue(maxsize)
+        self.thread = None
+        self.posted = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.handled = 0
+        self.calls = 0  # functions run through call(), kept out of the latency stats
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._run, name="input", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop after the events already queued have been handled."""
+        if not self.thread:
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+        self.thread = None
+
+    def idle(self):
+        """Return True once every posted event has been handled."""
+        return self.handled + self.calls >= self.posted
+
+    def post(self, event):
+        """Queue ``event`` without blocking; return False if it was dropped."""
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.posted += 1
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return True
+
+    def call(self, func):
+        """Queue ``func()`` to run on the dispatcher thread; return False if dropped."""
+        return self.post(_Call(func))
+
+    def _run(self):
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            if isinstance(event, _Call):
+                try:
+                    event.func()
+                except Exception as e:
+                    print(f"Dispatcher call {getattr(event.func, '__name__', event.func)} failed: {e}")
+                self.calls += 1
+                continue
+            try:
+                self.handler(event)
+            except Exception as e:
+                print(f"Input handler failed: {e}")
+            # Measured from the edge, so time spent queued is included
+            latency = time.monotonic() - event.time
+            self.latencies.append(latency)
+            self.handled += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def stats(self):
+        """Return queue depth and handler latency figures as a dict."""
+        recent = sorted(self.latencies)
+        p95 = nearest_rank(recent, 0.95)
+        return {
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "posted": self.posted,
+            "dropped": self.dropped,
+            "handled": self.handled,
+            "avg_ms": self.total_latency / self.handled * 1000 if self.handled else 0.0,
+            "p95_ms": p95 * 1000,
+            "max_ms": self.max_latency * 1000,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (
+            f"{s['handled']} handled ({s['dropped']} dropped, max depth {s['max_depth']}), "
+            f"latency avg {s['avg_ms']:.1f}ms p95 {s['p95_ms']:.1f}ms max {s['max_ms']:.1f}ms"
+        )
+
+
+class Job:
+    """Handle for work submitted to a :class:`WorkerPool`."""
+
+    def __init__(self, func, args, name, on_cancel):
+        self.func = func
+        self.args = args
+        self.name = name or getattr(func, "__name__", "job")
+        self.on_cancel = on_cancel
+        self.cancel_event = threading.Event()
+        self.done = threading.Event()
+        self.thread = None  # ident of the worker running it
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Ask the job to stop; runs its ``on_cancel`` hook once."""
+        if self.cancel_event.is_set() or self.done.is_set():
+            return
+        self.cancel_event.set()
+        if self.on_cancel:
+            try:
+                self.on_cancel()
+            except Exception as e:
+                print(f"Cancel hook for {self.name} failed: {e}")
+
+
+class WorkerPool:
+    """Fixed number of daemon threads with a bounded backlog of jobs."""
+
+    def __init__(self, workers=2, max_pending=4):
+        self.jobs = queue.Queue(max_pending)
+        self.local = threading.local()
+        self.active = set()
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.rejected = 0
+        self.cancelled = 0
+        for i in range(workers):
+            t = threading.Thread(target=self._run, name=f"worker-{i}", daemon=True)
+            t.start()
+
+    def submit(self, func, *args, name=None, on_cancel=None):
+        """Queue ``func(*args)``; return its :class:`Job`, or None if the pool is full."""
+        job = Job(func, args, name, on_cancel)
+        with self.lock:
+            self.active.add(job)
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            with self.lock:
+                self.active.discard(job)
+            self.rejected += 1
+            return None
+        self.submitted += 1
+        return job
+
+    def current(self):
+        """Return the job running on the calling thread, if any."""
+        return getattr(self.local, "job", None)
+
+    def cancel_all(self):
+        """Cancel every queued and running job."""
+        with self.lock:
+            jobs = list(self.active)
+        for job in jobs:
+            job.cancel()
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if not job.cancelled:
+                job.thread = threading.get_ident()
+                self.local.job = job
+                try:
+                    job.func(*job.args)
+                except Exception as e:
+                    print(f"Background job {job.name} failed: {e}")
+                finally:
+                    self.local.job = None
+            if job.cancelled:
+                self.cancelled += 1
+            job.done.set()
+            with self.lock:
+                self.active.discard(job)
+
+    def report(self):
+        with self.lock:
+            running = len(self.active)
+        return (
+            f"{self.submitted} jobs ({self.rejected} rejected, {self.cancelled} cancelled), "
+            f"{running} active"
+        )
+
+
+class KeyRepeater:
+    """Turn a held key into repeat events that speed up the longer it is held.
+
+    After ``delay`` seconds the key repeats ``rate`` times a second, rising
+    linearly to ``max_rate`` over the next ``ramp`` seconds.  Only one repeat
+    is in flight at a time: the next is posted once the dispatcher has
+    handled the last one (see :meth:`handled`) and ``idle(timeout)`` reports
+    its frame has been drawn.  Steps that came due meanwhile are folded into
+    the event's ``repeat`` count, so a slow screen scrolls just as far but
+    draws fewer frames.
+    """
+
+    def __init__(self, post, idle=None, delay=0.4, rate=8.0, max_rate=60.0, ramp=2.5):
+        self.post = post
+        self.idle = idle
+        self.delay = delay
+        self.rate = rate
+        self.max_rate = max_rate
+        self.ramp = ramp
+        self.cond = threading.Condition()
+        self.channel = None
+        self.pressed_at = 0.0
+        self.next_due = 0.0
+        self.steps = 0
+        self.in_flight = False
+        self.thread = None
+        self.posted = 0
+        self.coalesced = 0
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._run, name="key-repeat", daemon=True)
+        self.thread.start()
+
+    def press(self, channel, when):
+        """Start repeating ``channel``, pressed at monotonic time ``when``."""
+        with self.cond:
+            self.channel = channel
+            self.pressed_at = when
+            self.next_due = when + self.delay
+            self.steps = 0
+            self.in_flight = False
+            self.cond.notify()
+
+    def release(self, channel=None):
+        """Stop repeating ``channel`` (or whatever key is repeating)."""
+        with self.cond:
+            if channel is None or channel == self.channel:
+                self.channel = None
+                self.cond.notify()
+
+    def handled(self):
+        """Called by the dispatcher once it has acted on a repeat event."""
+        with self.cond:
+            self.in_flight = False
+            self.cond.notify()
+
+    def steps_due(self, held):
+        """Return how many repeats a key held for ``held`` seconds has earned."""
+        t = held - self.delay
+        if t < 0:
+            return 0
+        extra = self.max_rate - self.rate
+        if t < self.ramp:
+            count = self.rate * t + extra * t * t / (2 * self.ramp)
+        else:
+            count = self.rate * t + extra * (t - self.ramp / 2)
+        return int(count) + 1
+
+    def _interval(self, held):
+        t = max(0.0, held - self.delay)
+        rate = self.rate + (self.max_rate - self.rate) * min(1.0, t / self.ramp)
+        return 1.0 / rate
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while True:
+                    if self.channel is None or self.in_flight:
+                        self.cond.wait()
+                        continue
+                    now = time.monotonic()
+                    if now < self.next_due:
+                        self.cond.wait(self.next_due - now)
+                        continue
+                    break
+                held = now - self.pressed_at
+                count = max(1, self.steps_due(held) - self.steps)
+                self.steps += count
+                self.next_due = now + self._interval(held)
+                self.in_flight = True
+                channel = self.channel
+            self.posted += 1
+            self.coalesced += count - 1
+            if not self.post(InputEvent(channel, 0, now, count)):
+                self.handled()
+                continue
+            if self.idle is not None:
+                # Hold the next repeat until this one's frame is on the screen
+                with self.cond:
+                    while self.in_flight and self.channel is not None:
+                        self.cond.wait()
+                self.idle(0.5)
+
+    def report(self):
+        return f"{self.posted} repeats posted ({self.coalesced} steps coalesced)"
@@ -0,0 +1,268 @@
+"""Headless stand-ins for the LCD and GPIO so Mini OS can run off the Pi.
+
+Set ``MINI_OS_BACKEND=virtual`` to use them.  The virtual display keeps an
+in-memory framebuffer (optionally dumping a PNG per frame to
+``MINI_OS_FRAME_DIR``) and the fake GPIO fires the same edge callbacks that
+RPi.GPIO would, driven by a script file (``MINI_OS_INPUT_SCRIPT``) or by pin
+names typed on stdin (``MINI_OS_INPUT=stdin``).
+"""
+
+import os
+import sys
+import threading
+import time
+from PIL import Image
+
+BACKEND_ENV = "MINI_OS_BACKEND"
+FRAME_DIR_ENV = "MINI_OS_FRAME_DIR"
+INPUT_SCRIPT_ENV = "MINI_OS_INPUT_SCRIPT"
+INPUT_ENV = "MINI_OS_INPUT"
+
+# Long enough for the 200ms software debounce in handle_button_event
+DEFAULT_HOLD = 0.25
+
+
+def backend_name():
+    """Return the configured hardware backend ("pi" or "virtual")."""
+    return os.environ.get(BACKEND_ENV, "pi").strip().lower()
+
+
+class VirtualDevice:
+    """In-memory replacement for the luma st7735 device.
+
+    It understands the column/row address and memory write commands that
+    :class:`utilities.display.PartialDisplay` sends, in both the 18-bit and
+    16-bit RGB565 pixel formats, so the real partial-update path is exercised.
+    """
+
+    def __init__(self, width=128, height=128, dump_dir=None):
+        self.width = width
+        self.height = height
+        self.size = (width, height)
+        self.mode = "RGB"
+        self.persist = False
+        self.framebuffer = Image.new("RGB", self.size)
+        self.dump_dir = dump_dir
+        if dump_dir:
+            os.makedirs(dump_dir, exist_ok=True)
+        self.frame_count = 0
+        self.bytes_written = 0
+        self._bytes_per_pixel = 3
+        self._window = (0, 0, width, height)
+        self._last_cmd = None
+
+    def apply_offsets(self, bbox):
+        return bbox
+
+    def preprocess(self, image):
+        return image
+
+    def command(self, cmd, *args):
+        """Track the controller state changed by a command."""
+        self._last_cmd = cmd
+        if cmd == 0x3A and args:
+            self._bytes_per_pixel = 2 if args[0] == 0x05 else 3
+        elif cmd == 0x2A and len(args) == 4:
+            left = (args[0] << 8) | args[1]
+            right = ((args[2] << 8) | args[3]) + 1
+            self._window = (left, self._window[1], right, self._window[3])
+        elif cmd == 0x2B and len(args) == 4:
+            top = (args[0] << 8) | args[1]
+            bottom = ((args[2] << 8) | args[3]) + 1
+            self._window = (self._window[0], top, self._window[2], bottom)
+
+    def data(self, data):
+        """Write pixel data into the current window of the framebuffer."""
+        if self._last_cmd != 0x2C:
+            return
+        raw = bytes(data)
+        self.bytes_written += len(raw)
+        left, top, right, bottom = self._window
+        size = (right - left, bottom - top)
+        if self._bytes_per_pixel == 2:
+            region = _decode_rgb565(raw, size)
+        else:
+            region = Image.frombytes("RGB", size, raw)
+        self.framebuffer.paste(region, (left, top))
+
+    def frame_done(self):
+        """Called once all windows of a frame are written; dumps a PNG if enabled."""
+        self.frame_count += 1
+        if self.dump_dir:
+            path = os.path.join(self.dump_dir, f"frame_{self.frame_count:05d}.png")
+            self.framebuffer.save(path)
+
+    def display(self, image):
+        """Show a full PIL image, matching the luma device API."""
+        self.framebuffer.paste(image.convert("RGB"), (0, 0))
+        self.frame_done()
+
+    def snapshot(self):
+        """Return a copy of what is currently on the virtual screen."""
+        return self.framebuffer.copy()
+
+    def show(self):
+        pass
+
+    def hide(self):
+        pass
+
+    def clear(self):
+        self.framebuffer = Image.new("RGB", self.size)
+
+    def cleanup(self):
+        if self.dump_dir:
+            self.framebuffer.save(os.path.join(self.dump_dir, "last.png"))
+
+
+def _decode_rgb565(raw, size):
+    """Decode big-endian RGB565 bytes into a PIL RGB image."""
+    # PIL only unpacks little-endian 5-6-5, so swap each byte pair first
+    swapped = bytearray(len(raw))
+    swapped[0::2] = raw[1::2]
+    swapped[1::2] = raw[0::2]
+    return Image.frombytes("RGB", size, bytes(swapped), "raw", "BGR;16")
+
+
+class FakePWM:
+    """No-op replacement for ``RPi.GPIO.PWM``."""
+
+    def __init__(self, pin, frequency):
+        self.pin = pin
+        self.frequency = frequency
+        self.duty_cycle = 0
+
+    def start(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+
+    def ChangeDutyCycle(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+
+    def stop(self):
+        pass
+
+
+class FakeGPIO:
+    """Scriptable object with the parts of the ``RPi.GPIO`` API Mini OS uses.
+
+    Inputs idle HIGH like the pulled-up buttons on the HAT.  :meth:`press`
+    and :meth:`release` change the level and call the registered edge
+    callbacks with the channel number, just as RPi.GPIO does.
+    """
+
+    BCM = 11
+    BOARD = 10
+    IN = 1
+    OUT = 0
+    PUD_UP = 22
+    PUD_DOWN = 21
+    LOW = 0
+    HIGH = 1
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+    PWM = FakePWM
+
+    def __init__(self):
+        self.levels = {}
+        self.callbacks = {}
+        self.lock = threading.Lock()
+
+    def setmode(self, mode):
+        pass
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, pin, direction, pull_up_down=None, initial=None):
+        if direction == self.IN:
+            self.levels[pin] = self.LOW if pull_up_down == self.PUD_DOWN else self.HIGH
+        else:
+            self.levels[pin] = self.LOW if initial is None else initial
+
+    def input(self, pin):
+        return self.levels.get(pin, self.HIGH)
+
+    def output(self, pin, value):
+        self.levels[pin] = value
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=None):
+        self.callbacks[pin] = (edge, callback)
+
+    def remove_event_detect(self, pin):
+        self.callbacks.pop(pin, None)
+
+    def cleanup(self, *args):
+        self.callbacks.clear()
+
+    def _set_level(self, pin, level):
+        with self.lock:
+            if self.levels.get(pin, self.HIGH) == level:
+                return
+            self.levels[pin] = level
+            edge, callback = self.callbacks.get(pin, (None, None))
+        if callback is None:
+            return
+        falling = level == self.LOW
+        if edge == self.BOTH or edge == (self.FALLING if falling else self.RISING):
+            callback(pin)
+
+    def press(self, pin):
+        """Drive ``pin`` LOW, firing a falling edge."""
+        self._set_level(pin, self.LOW)
+
+    def release(self, pin):
+        """Drive ``pin`` HIGH, firing a rising edge."""
+        self._set_level(pin, self.HIGH)
+
+    def tap(self, pin, hold=DEFAULT_HOLD):
+        """Press ``pin``, hold it for ``hold`` seconds and release it."""
+        self.press(pin)
+        time.sleep(hold)
+        self.release(pin)
+
+    def run_script(self, lines, pins):
+        """Replay ``lines`` of ``<delay> <PIN_NAME> [hold]`` against ``pins``.
+
+        ``pins`` maps button names to channel numbers.  Blank lines and lines
+        starting with ``#`` are ignored.
+        """
+        for line in lines:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split()
+            try:
+                delay = float(parts[0])
+                pin = pins[parts[1].upper()]
+                hold = float(parts[2]) if len(parts) > 2 else DEFAULT_HOLD
+            except (IndexError, KeyError, ValueError):
+                print(f"Ignoring bad input script line: {line}")
+                continue
+            time.sleep(delay)
+            self.tap(pin, hold)
+
+    def start_input(self, pins):
+        """Feed button presses from the configured script or stdin in the background."""
+        script = os.environ.get(INPUT_SCRIPT_ENV)
+        if script:
+            with open(script) as f:
+                lines = f.readlines()
+            target, args = self.run_script, (lines, pins)
+        elif os.environ.get(INPUT_ENV, "").lower() == "stdin":
+            target, args = self._read_stdin, (pins,)
+        else:
+            return None
+        t = threading.Thread(target=target, args=args, name="fake-gpio", daemon=True)
+        t.start()
+        return t
+
+    def _read_stdin(self, pins):
+        """Tap each pin name typed on stdin, one per line."""
+        print(f"Virtual buttons: {', '.join(pins)}")
+        for line in sys.stdin:
+            name = line.strip().upper()
+            if name in pins:
+                self.tap(pins[name])
+            elif name:
+                print(f"Unknown button: {name}")
@@ -0,0 +1,174 @@
+"""Shared HTTP client that keeps connections to each host alive.
+
+Every outbound fetch goes through one :class:`HttpClient`.  It keeps a
+``requests.Session`` per host, so a second request to the same API reuses
+the TCP connection and TLS session instead of handshaking again, which on
+a Pi Zero over Wi-Fi is most of the time a request takes.  Sessions ask for
+gzip, use separate connect and read timeouts and retry requests that fail
+to connect or get a 429/5xx, backing off between tries.  A server that
+accepts and then never answers is not retried, and every request, retries
+included, gives up after ``deadline`` seconds, since callers still wait on
+the input thread.
+
+``requests`` is imported when the first request is made, not at boot.
+Latency per host is kept for :meth:`HttpClient.report` and
+:meth:`HttpClient.stats`.
+"""
+
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+# (connect, read) seconds; connecting should be quick, some APIs are slow to answer
+DEFAULT_TIMEOUT = (3.05, 5)
+# Seconds a request may take in total, retries and backoff included
+DEADLINE = 5.0
+RETRIES = 2
+BACKOFF = 0.5  # seconds before the first retry, doubling after that
+RETRY_STATUS = (429, 500, 502, 503, 504)
+POOL_SIZE = 4  # connections kept per host
+# Latencies kept per host for the median
+RECENT = 50
+HEADERS = {"User-Agent": "Mini-OS", "Accept-Encoding": "gzip, deflate"}
+
+
+class HostStats:
+    """Request count, failures and latency for one host."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.recent = deque(maxlen=RECENT)
+
+    def add(self, seconds, ok):
+        self.requests += 1
+        self.errors += 0 if ok else 1
+        self.total += seconds
+        self.slowest = max(self.slowest, seconds)
+        self.recent.append(seconds)
+
+    def median(self):
+        ordered = sorted(self.recent)
+        return ordered[len(ordered) // 2] if ordered else 0.0
+
+    def to_json(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round(1000 * self.total / self.requests, 1) if self.requests else None,
+            "median_ms": round(1000 * self.median(), 1),
+            "max_ms": round(1000 * self.slowest, 1),
+        }
+
+
+class HttpClient:
+    """Pooled, retrying GETs with per-host sessions and latency stats."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=RETRIES, backoff=BACKOFF, deadline=DEADLINE):
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.sessions = {}
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def session(self, host):
+        """Return the session for ``host`` ("scheme://name:port"), creating it once."""
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = self.sessions[host] = self._new_session()
+                self.hosts[host] = HostStats()
+            return session
+
+    def _new_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # Retries are done in get() so they can share one deadline
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=0)
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get(self, url, **kwargs):
+        """GET ``url`` like ``requests.get``, on the host's pooled session.
+
+        Connection failures and 429/5xx answers are retried while the
+        deadline allows; the last response or error is returned or raised.
+        """
+        import requests
+
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        session = self.session(host)
+        timeout = kwargs.pop("timeout", self.timeout)
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        start = time.perf_counter()
+        deadline = start + self.deadline
+        response = error = None
+        ok = False
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    pause = self.backoff * 2 ** (attempt - 1)
+                    if time.perf_counter() + pause >= deadline:
+                        break  # no time for another try: report the last one
+                    time.sleep(pause)
+                    if response is not None:
+                        response.close()
+                remaining = deadline - time.perf_counter()
+                try:
+                    response = session.get(
+                        url, timeout=(min(connect, remaining), min(read, remaining)), **kwargs
+                    )
+                    error = None
+                except requests.ConnectionError as e:
+                    # Covers connect timeouts but not read timeouts, which aren't retried
+                    response, error = None, e
+                    continue
+                if response.status_code not in RETRY_STATUS:
+                    break
+            if error is not None:
+                raise error
+            ok = response.ok
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.hosts[host].add(elapsed, ok)
+
+    def get_json(self, url, **kwargs):
+        """GET ``url`` and return its decoded JSON; raise for HTTP errors."""
+        response = self.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+    def stats(self):
+        """Return ``{host: {...}}`` with request counts and latencies in ms."""
+        with self.lock:
+            return {host: stats.to_json() for host, stats in self.hosts.items()}
+
+    def report(self):
+        if not self.hosts:
+            return "no requests"
+        parts = []
+        for host, stats in self.stats().items():
+            name = urlsplit(host).hostname
+            parts.append(
+                f"{name} {stats['requests']}x median {stats['median_ms']:.0f}ms "
+                f"max {stats['max_ms']:.0f}ms" + (f" ({stats['errors']} failed)" if stats["errors"] else "")
+            )
+        return "; ".join(parts)
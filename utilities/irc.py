@@ -0,0 +1,188 @@
+"""Asyncio IRC client for the chat screen that keeps itself connected.
+
+The client runs on a :class:`~utilities.runtime.Runtime` loop.  Connecting
+has a timeout, and a dropped or refused connection is retried after an
+exponentially growing, jittered delay, so an unreachable server costs one
+timer instead of a blocked thread.  Lines are framed on bytes with
+``StreamReader.readline`` and decoded one at a time.
+"""
+
+import asyncio
+import random
+
+# Longest line accepted from the server; longer ones are skipped
+MAX_LINE = 4096
+
+
+class IrcClient:
+    """One nick in one channel, reconnecting until :meth:`stop` is called.
+
+    ``on_message(nick, text)`` is called on the loop for every message sent
+    to the channel and ``on_status(text)`` when the connection changes.
+    """
+
+    def __init__(self, runtime, host, port, nick, channel, on_message, on_status=None,
+                 connect_timeout=10.0, min_backoff=2.0, max_backoff=300.0):
+        self.runtime = runtime
+        self.host = host
+        self.port = port
+        self.nick = nick
+        self.channel = channel
+        self.on_message = on_message
+        self.on_status = on_status
+        self.connect_timeout = connect_timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.state = "idle"  # connecting, connected, waiting or idle
+        self.writer = None
+        self.task = None
+        self.retry_now = None
+        self.stopping = False
+        self.lines_in = 0
+        self.lines_out = 0
+        self.connects = 0
+        self.failures = 0
+
+    @property
+    def connected(self):
+        return self.writer is not None
+
+    def start(self):
+        """Connect in the background, or retry at once if waiting to reconnect."""
+        if self.task is not None and not self.task.done():
+            self.runtime.call_soon(self._wake)
+            return
+        self.stopping = False
+        self.task = self.runtime.spawn(self._run(), name="irc")
+
+    def stop(self):
+        self.stopping = True
+        if self.task is not None:
+            self.task.cancel()
+
+    def send(self, line):
+        """Queue ``line`` for the server from any thread; return False if offline."""
+        writer = self.writer
+        if writer is None:
+            return False
+        self.lines_out += 1
+        self.runtime.call_soon(self._write, writer, line)
+        return True
+
+    def _write(self, writer, line):
+        if not writer.is_closing():
+            writer.write(f"{line}\r\n".encode(errors="replace"))
+
+    def _wake(self):
+        if self.retry_now is not None:
+            self.retry_now.set()
+
+    def _status(self, text):
+        print(text)
+        if self.on_status:
+            self.on_status(text)
+
+    async def _run(self):
+        self.retry_now = asyncio.Event()
+        delay = self.min_backoff
+        try:
+            while not self.stopping:
+                if await self._session():
+                    delay = self.min_backoff
+                if self.stopping:
+                    break
+                wait = delay * random.uniform(0.8, 1.2)
+                delay = min(delay * 2, self.max_backoff)
+                self.state = "waiting"
+                print(f"IRC reconnecting in {wait:.1f}s")
+                self.retry_now.clear()
+                try:
+                    await asyncio.wait_for(self.retry_now.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.state = "idle"
+
+    async def _session(self):
+        """Connect and read until the connection drops.
+
+        Return True if the server sent anything, so a server that accepts
+        and then resets the connection still backs off.
+        """
+        self.state = "connecting"
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, limit=MAX_LINE),
+                self.connect_timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            self.failures += 1
+            self._status(f"IRC connection failed: {e or 'timed out'}")
+            return False
+
+        self.connects += 1
+        lines_before = self.lines_in
+        self.state = "connected"
+        self.writer = writer
+        for line in (
+            f"NICK {self.nick}",
+            f"USER {self.nick} 0 * :{self.nick}",
+            f"JOIN {self.channel}",
+        ):
+            writer.write(f"{line}\r\n".encode())
+        self._status(f"Connected to {self.channel}")
+        try:
+            while True:
+                try:
+                    data = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    data = e.partial  # the connection closed mid-line
+                except asyncio.LimitOverrunError:
+                    # Line longer than MAX_LINE: skip all of it, so its tail
+                    # isn't parsed as a line of its own
+                    await self._skip_line(reader)
+                    continue
+                if not data:
+                    self._status("IRC connection closed")
+                    break
+                self.lines_in += 1
+                try:
+                    self.handle_line(data.rstrip(b"\r\n").decode(errors="ignore"))
+                except Exception as e:
+                    print(f"IRC line not handled: {e}")
+        except OSError as e:
+            self._status(f"IRC listener error: {e}")
+        finally:
+            self.writer = None
+            writer.close()
+        return self.lines_in > lines_before
+
+    def handle_line(self, line):
+        """Answer PINGs and pass channel messages to ``on_message``."""
+        if line.startswith("PING"):
+            token = line.split(":", 1)[1] if ":" in line else ""
+            self.writer.write(f"PONG :{token}\r\n".encode())
+            return
+        parts = line.split(" ", 3)
+        if len(parts) >= 4 and parts[1] == "PRIVMSG" and parts[2] == self.channel:
+            prefix = parts[0]
+            message = parts[3][1:] if parts[3].startswith(":") else parts[3]
+            nick = prefix.split("!")[0][1:] if prefix.startswith(":") else prefix
+            self.on_message(nick, message)
+
+    @staticmethod
+    async def _skip_line(reader):
+        """Discard input up to and including the next newline."""
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as e:
+                # Nothing is consumed on an overrun; drop what is buffered
+                await reader.readexactly(e.consumed)
+
+    def report(self):
+        return (
+            f"{self.state}, {self.connects} connects ({self.failures} failed), "
+            f"{self.lines_in} lines in / {self.lines_out} out"
+        )
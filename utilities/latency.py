@@ -0,0 +1,179 @@
+"""Input-to-photon latency histograms, kept per screen and per stage.
+
+Each input event is followed from its GPIO edge to the frame it caused:
+
+``wait``     edge until the dispatcher thread picks the event up
+``handler``  time spent in the screen's input hook
+``render``   handler start until its first frame is handed to the display
+``spi``      diffing that frame and writing it to the panel
+``total``    edge until the frame has been written
+
+Times come from ``time.monotonic()``, the clock input events are stamped with.
+"""
+
+import json
+import math
+import threading
+import time
+
+# Upper bounds of the histogram buckets in milliseconds; one more bucket
+# catches anything slower than the last bound
+BUCKETS_MS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+STAGES = ("wait", "handler", "render", "spi", "total")
+
+
+def nearest_rank(ordered, fraction):
+    """Return the ``fraction`` quantile of the sorted list ``ordered`` (nearest rank)."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+class Histogram:
+    """Counts of samples per power-of-two millisecond bucket."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        index = 0
+        while index < len(BUCKETS_MS) and ms > BUCKETS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, fraction):
+        """Return the upper bound of the bucket holding the ``fraction`` quantile.
+
+        The bound is capped at the slowest sample seen.
+        """
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= wanted and n:
+                if index < len(BUCKETS_MS):
+                    return min(BUCKETS_MS[index], self.max)
+                return self.max
+        return self.max
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max, 3),
+            "buckets_ms": list(BUCKETS_MS),
+            "counts": list(self.counts),
+        }
+
+
+class Trace:
+    """Timestamps for one input event on its way to the screen."""
+
+    __slots__ = ("screen", "edge", "start", "rendered", "shown")
+
+    def __init__(self, screen, edge, start):
+        self.screen = screen
+        self.edge = edge
+        self.start = start
+        self.rendered = False
+        self.shown = False
+
+
+class LatencyTracker:
+    """Collects :class:`Histogram` samples for every screen and stage.
+
+    The dispatcher wraps each handler call in :meth:`begin` and :meth:`end`.
+    Frames submitted on that thread in between are tagged via
+    :meth:`frame_tag`, and the display worker reports when the tagged frame
+    has been written with :meth:`frame_sent`.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def record(self, screen, stage, seconds):
+        with self.lock:
+            stages = self.histograms.setdefault(screen, {})
+            hist = stages.get(stage)
+            if hist is None:
+                hist = stages[stage] = Histogram()
+            hist.add(seconds * 1000)
+
+    def begin(self, screen, edge):
+        """Start following an event stamped ``edge`` that ``screen`` will handle."""
+        now = time.monotonic()
+        trace = Trace(screen, edge, now)
+        self.record(screen, "wait", now - edge)
+        self.local.trace = trace
+        return trace
+
+    def end(self, trace):
+        self.record(trace.screen, "handler", time.monotonic() - trace.start)
+        self.local.trace = None
+
+    def frame_tag(self):
+        """Return the trace of the event being handled on this thread, if any."""
+        trace = getattr(self.local, "trace", None)
+        if trace is not None and not trace.rendered:
+            trace.rendered = True
+            self.record(trace.screen, "render", time.monotonic() - trace.start)
+        return trace
+
+    def frame_sent(self, trace, seconds):
+        """Record that the frame tagged ``trace`` took ``seconds`` to write."""
+        if trace is None or trace.shown:
+            return
+        trace.shown = True
+        self.record(trace.screen, "spi", seconds)
+        self.record(trace.screen, "total", time.monotonic() - trace.edge)
+
+    def screens(self):
+        """Return the names of screens with samples, busiest first."""
+        with self.lock:
+            items = [(name, stages.get("wait")) for name, stages in self.histograms.items()]
+        items.sort(key=lambda item: -(item[1].count if item[1] else 0))
+        return [name for name, _ in items]
+
+    def stages(self, screen):
+        """Return ``{stage: Histogram}`` for ``screen``."""
+        with self.lock:
+            return dict(self.histograms.get(screen, {}))
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                screen: {stage: hist.as_dict() for stage, hist in stages.items()}
+                for screen, stages in self.histograms.items()
+            }
+
+    def dump(self, path):
+        """Write every histogram to ``path`` as JSON."""
+        with open(path, "w") as f:
+            json.dump({"time": time.time(), "screens": self.snapshot()}, f, indent=1)
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def report(self):
+        """Return a one-line summary of edge-to-frame times over all screens."""
+        with self.lock:
+            totals = [stages["total"] for stages in self.histograms.values() if "total" in stages]
+        count = sum(h.count for h in totals)
+        if not count:
+            return "no frames traced"
+        worst = max(h.max for h in totals)
+        avg = sum(h.total for h in totals) / count
+        return f"{count} frames traced, edge to frame avg {avg:.1f}ms max {worst:.1f}ms"
@@ -0,0 +1,213 @@
+"""Fixed-size time series for the System Monitor and the web interface.
+
+Every metric keeps three rings of :data:`SLOTS` float32 averages: one per
+second for the last two minutes, one per 30 seconds for the last hour and
+one per 12 minutes for the last day (see :data:`WINDOWS`).  A sample is
+averaged into the current slot of each ring, so memory never grows and a
+day of history costs about 1.4 KB per metric.
+
+The rings live in one flat buffer.  Given a path it is a shared ``mmap`` of
+that file, so history survives restarts and another process (the web server
+run on its own) can read what Mini OS records.  Slots are keyed by wall
+clock time, and slots for time that passed while nothing was recording read
+as NaN.
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+SLOTS = 120
+# name, seconds per slot; each window spans SLOTS slots
+WINDOWS = (("2m", 1), ("1h", 30), ("24h", 720))
+# magic, layout checksum
+HEADER = struct.Struct("<8sQ")
+MAGIC = b"MOSMETR1"
+# Per ring: newest slot's bucket number, running sum and count for it
+META_FIELDS = 3
+
+NAN = float("nan")
+
+
+class Ring:
+    """One window of one metric: ``SLOTS`` averages, ``step`` seconds apart."""
+
+    def __init__(self, step, values, meta):
+        self.step = step
+        self.values = values  # memoryview of float32
+        self.meta = meta  # memoryview of float64: bucket, sum, count
+
+    def add(self, when, value):
+        bucket = int(when // self.step)
+        newest = int(self.meta[0])
+        if bucket < newest:
+            return  # the clock went backwards; drop the sample
+        size = len(self.values)
+        slot = bucket % size
+        if bucket == newest:
+            self.meta[1] += value
+            self.meta[2] += 1
+        else:
+            # Slots skipped since the last sample have no data
+            for gap in range(newest + 1, min(bucket, newest + size + 1)):
+                self.values[gap % size] = NAN
+            self.meta[0] = bucket
+            self.meta[1] = value
+            self.meta[2] = 1
+        self.values[slot] = self.meta[1] / self.meta[2]
+
+    def series(self, now):
+        """Return the slots oldest first, ending with the one holding ``now``."""
+        size = len(self.values)
+        end = int(now // self.step)
+        newest = int(self.meta[0])
+        out = []
+        for bucket in range(end - size + 1, end + 1):
+            if bucket > newest or bucket <= newest - size:
+                out.append(NAN)
+            else:
+                out.append(self.values[bucket % size])
+        return out
+
+
+class MetricsStore:
+    """Rings for a fixed list of metric names, in memory or in a mapped file."""
+
+    def __init__(self, names, path=None):
+        self.names = list(names)
+        self.path = path
+        rings = len(self.names) * len(WINDOWS)
+        meta_size = rings * META_FIELDS * 8
+        size = HEADER.size + meta_size + rings * SLOTS * 4
+        layout = zlib.crc32(json.dumps([self.names, WINDOWS, SLOTS]).encode())
+        self.lock = threading.Lock()
+        self.samples = 0
+        self.reset = False
+
+        if path is None:
+            self.buffer = bytearray(size)
+            fresh = True
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fresh = os.fstat(fd).st_size != size
+                if fresh:
+                    os.ftruncate(fd, size)
+                self.buffer = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+            fresh = fresh or HEADER.unpack_from(self.buffer) != (MAGIC, layout)
+        view = memoryview(self.buffer)
+        meta = view[HEADER.size:HEADER.size + meta_size].cast("d")
+        values = view[HEADER.size + meta_size:].cast("f")
+        if fresh:
+            # A new file, or one written for other metrics: start over
+            self.reset = path is not None
+            HEADER.pack_into(self.buffer, 0, MAGIC, layout)
+            for i in range(len(meta)):
+                meta[i] = 0.0
+            for i in range(len(values)):
+                values[i] = NAN
+
+        self.rings = {}
+        i = 0
+        for name in self.names:
+            for window, step in WINDOWS:
+                self.rings[name, window] = Ring(
+                    step,
+                    values[i * SLOTS:(i + 1) * SLOTS],
+                    meta[i * META_FIELDS:(i + 1) * META_FIELDS],
+                )
+                i += 1
+
+    def add(self, values, when=None):
+        """Record ``{name: value}`` at ``when`` (default now); None values are skipped."""
+        when = time.time() if when is None else when
+        with self.lock:
+            for name, value in values.items():
+                if value is None or (name, WINDOWS[0][0]) not in self.rings:
+                    continue
+                for window, _ in WINDOWS:
+                    self.rings[name, window].add(when, float(value))
+            self.samples += 1
+
+    def series(self, name, window, now=None):
+        """Return the ``SLOTS`` values of ``name`` over ``window``, oldest first."""
+        now = time.time() if now is None else now
+        with self.lock:
+            return self.rings[name, window].series(now)
+
+    def latest(self, name):
+        """Return the most recent value of ``name``, or None."""
+        values = self.series(name, WINDOWS[0][0])
+        for value in reversed(values[-3:]):
+            if not math.isnan(value):
+                return value
+        return None
+
+    def to_json(self, window, now=None):
+        """Return ``window`` for every metric as a JSON-ready dict (NaN becomes None)."""
+        now = time.time() if now is None else now
+        step = dict(WINDOWS)[window]
+        return {
+            "window": window,
+            "step": step,
+            "end": int(now // step) * step,
+            "series": {
+                name: [None if math.isnan(v) else round(v, 2) for v in self.series(name, window, now)]
+                for name in self.names
+            },
+        }
+
+    def flush(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.flush()
+
+    def report(self):
+        where = self.path or "memory"
+        return f"{len(self.names)} metrics in {where}, {self.samples} samples" + (
+            " (history reset)" if self.reset else ""
+        )
+
+
+def metric_names(cpus):
+    """Names recorded by :class:`Sampler` on a machine with ``cpus`` cores."""
+    return (
+        ["load", "cpu"]
+        + [f"cpu{i}" for i in range(cpus)]
+        + ["temp", "freq", "mem", "disk_read", "disk_write", "throttled"]
+    )
+
+
+class Sampler:
+    """Reads a :class:`~utilities.sysinfo.SysInfo` into a :class:`MetricsStore`."""
+
+    def __init__(self, sysinfo, store):
+        self.sysinfo = sysinfo
+        self.store = store
+
+    def sample(self):
+        info = self.sysinfo
+        values = {
+            "load": (info.load() or (None,))[0],
+            "temp": info.temperature(),
+            "freq": info.cpu_freq(),
+            "throttled": info.throttled(),
+        }
+        usage = info.cpu_usage()
+        if usage:
+            values["cpu"] = usage[0]
+            values.update((f"cpu{i}", v) for i, v in enumerate(usage[1:]))
+        memory = info.memory()
+        if memory:
+            values["mem"] = 100 * memory[0] / memory[1]
+        io = info.disk_io()
+        if io:
+            values["disk_read"], values["disk_write"] = (v / 1024 for v in io)
+        self.store.add(values)
@@ -0,0 +1,157 @@
+"""Wi-Fi link state read from sysfs and procfs instead of forking ``iwgetid``.
+
+A wireless interface is one with a ``wireless`` directory under
+``/sys/class/net/<name>``; it counts as connected when its ``operstate`` is
+``up``, which for Wi-Fi means associated with an access point.  Link quality
+comes from ``/proc/net/wireless``.  Reading both costs a few small file
+reads and no processes.
+
+:class:`LinkMonitor` keeps the last state for draw code to read and tells
+subscribers when it changes.  On Linux it also opens a netlink socket joined
+to the link and address groups; the socket becomes readable whenever an
+interface changes, so the owner can refresh at once and poll only rarely.
+"""
+
+import os
+import socket
+import threading
+from collections import namedtuple
+
+# rtnetlink multicast groups from <linux/rtnetlink.h>
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+
+LinkState = namedtuple("LinkState", "connected interface quality")
+LinkState.__doc__ = "Wi-Fi state: connected flag, interface name and link quality (or None)."
+DISCONNECTED = LinkState(False, None, None)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def wireless_interfaces(sys_root="/sys"):
+    """Return the names of the wireless network interfaces, sorted."""
+    net = os.path.join(sys_root, "class", "net")
+    try:
+        names = os.listdir(net)
+    except OSError:
+        return []
+    return sorted(n for n in names if os.path.isdir(os.path.join(net, n, "wireless")))
+
+
+def link_quality(proc_root="/proc"):
+    """Return ``{interface: quality}`` from ``/proc/net/wireless``."""
+    text = _read(os.path.join(proc_root, "net", "wireless")) or ""
+    quality = {}
+    # Two header lines, then "wlan0: 0000   70.  -40.  -256 ..."
+    for line in text.splitlines()[2:]:
+        name, _, fields = line.partition(":")
+        fields = fields.split()
+        try:
+            quality[name.strip()] = int(float(fields[1]))
+        except (IndexError, ValueError):
+            continue
+    return quality
+
+
+def read_link_state(sys_root="/sys", proc_root="/proc"):
+    """Return the :class:`LinkState` of the first connected wireless interface."""
+    quality = None
+    for name in wireless_interfaces(sys_root):
+        if _read(os.path.join(sys_root, "class", "net", name, "operstate")) == "up":
+            if quality is None:
+                quality = link_quality(proc_root)
+            return LinkState(True, name, quality.get(name))
+    return DISCONNECTED
+
+
+def open_netlink():
+    """Return a non-blocking socket that becomes readable on link changes, or None."""
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+    except (AttributeError, OSError):
+        return None
+    sock.setblocking(False)
+    return sock
+
+
+class LinkMonitor:
+    """Cached Wi-Fi :class:`LinkState` with change notifications.
+
+    :meth:`refresh` re-reads the state and calls every subscriber with the
+    new :class:`LinkState` when it differs from the last one.  It is cheap
+    and may be called from any thread; callbacks run on the caller's thread.
+    """
+
+    def __init__(self, sys_root="/sys", proc_root="/proc"):
+        self.sys_root = sys_root
+        self.proc_root = proc_root
+        self.state = DISCONNECTED
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.netlink = None
+        self.refreshes = 0
+        self.events = 0
+        self.changes = 0
+
+    @property
+    def connected(self):
+        return self.state.connected
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def refresh(self):
+        """Read the link state now; return True if it changed."""
+        state = read_link_state(self.sys_root, self.proc_root)
+        with self.lock:
+            self.refreshes += 1
+            # Quality wobbles all the time; only connectivity is a change
+            changed = state[:2] != self.state[:2]
+            self.state = state
+            if changed:
+                self.changes += 1
+        if changed:
+            for callback in list(self.subscribers):
+                try:
+                    callback(state)
+                except Exception as e:
+                    print(f"Link state subscriber failed: {e}")
+        return changed
+
+    def open(self):
+        """Open the netlink socket; return it, or None where there is none."""
+        if self.netlink is None:
+            self.netlink = open_netlink()
+        return self.netlink
+
+    def on_netlink(self):
+        """Drain pending netlink messages, then refresh once for all of them."""
+        try:
+            while self.netlink.recv(65536):
+                self.events += 1
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as e:
+            # ENOBUFS: messages were dropped; the refresh below catches up
+            print(f"Netlink read failed: {e}")
+        self.refresh()
+
+    def close(self):
+        if self.netlink is not None:
+            self.netlink.close()
+            self.netlink = None
+
+    def report(self):
+        state = f"{self.state.interface} up" if self.connected else "down"
+        source = "netlink" if self.netlink is not None else "polling"
+        return (
+            f"{state} ({source}), {self.refreshes} reads, "
+            f"{self.events} netlink events, {self.changes} changes"
+        )
@@ -0,0 +1,201 @@
+"""Record button sessions and replay them deterministically.
+
+Set ``MINI_OS_RECORD=session.rec`` and every GPIO edge seen by
+``button_event_handler`` is appended to a compact binary file: a header with
+the random seed and pin names, then six bytes per edge (microseconds since
+the previous edge, channel, level).  ``python3 -m benchmarks.replay`` plays a
+recording back headless, either in real time or as fast as possible under a
+:class:`VirtualClock` so the same recording always draws the same frames.
+"""
+
+import random
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from .events import KeyRepeater
+
+RECORD_ENV = "MINI_OS_RECORD"
+
+MAGIC = b"MOSR"
+VERSION = 1
+_HEADER = struct.Struct("<4sBIB")  # magic, version, seed, pin count
+_PIN = struct.Struct("<BB")  # channel, name length, then the name
+_EDGE = struct.Struct("<IBB")  # microseconds since previous edge, channel, level
+
+Recording = namedtuple("Recording", "seed pins edges")
+Edge = namedtuple("Edge", "time channel level")
+
+
+class Recorder:
+    """Append GPIO edges to ``path`` as they happen.
+
+    ``pins`` maps pin names to channel numbers.  A fresh random seed is
+    stored in the header; seed ``random`` with :attr:`seed` so a replay sees
+    the same game state.
+    """
+
+    def __init__(self, path, pins, seed=None):
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.lock = threading.Lock()
+        self.file = open(path, "wb")
+        self.file.write(_HEADER.pack(MAGIC, VERSION, self.seed, len(pins)))
+        for name, channel in pins.items():
+            encoded = name.encode()
+            self.file.write(_PIN.pack(channel, len(encoded)) + encoded)
+        self.last = time.monotonic()
+        self.count = 0
+
+    def record(self, channel, level, when):
+        """Store one edge seen at monotonic time ``when``."""
+        with self.lock:
+            if self.file is None:
+                return
+            delta = max(0, int(round((when - self.last) * 1_000_000)))
+            self.last = when
+            self.file.write(_EDGE.pack(min(delta, 0xFFFFFFFF), channel, level))
+            self.count += 1
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+def load(path):
+    """Read a recording; edge times are seconds from the start of recording."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, seed, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a Mini OS recording")
+    offset = _HEADER.size
+    pins = {}
+    for _ in range(count):
+        channel, length = _PIN.unpack_from(data, offset)
+        offset += _PIN.size
+        pins[channel] = data[offset:offset + length].decode()
+        offset += length
+    # Drop a partial last edge left by a session that was killed mid-write
+    end = offset + (len(data) - offset) // _EDGE.size * _EDGE.size
+    edges = []
+    t = 0.0
+    for delta, channel, level in _EDGE.iter_unpack(data[offset:end]):
+        t += delta / 1_000_000
+        edges.append(Edge(t, channel, level))
+    return Recording(seed, pins, edges)
+
+
+class VirtualClock:
+    """Clock that only moves when the replay driver advances it.
+
+    Threads that call :meth:`sleep` park until the driver releases them with
+    :meth:`wake_next`, one at a time in deadline order, so timer-driven game
+    loops interleave with input exactly the same way on every run.
+    """
+
+    def __init__(self, start=1000.0, wall=1_700_000_000.0):
+        self.now = start
+        self.wall_offset = wall - start
+        self.cond = threading.Condition()
+        self.sleeping = {}  # thread ident -> (deadline, sequence)
+        self.sequence = 0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now + self.wall_offset
+
+    def sleep(self, seconds):
+        ident = threading.get_ident()
+        with self.cond:
+            self.sequence += 1
+            self.sleeping[ident] = (self.now + max(0.0, seconds), self.sequence)
+            while ident in self.sleeping:
+                self.cond.wait()
+
+    def next_deadline(self):
+        with self.cond:
+            if not self.sleeping:
+                return None
+            return min(self.sleeping.values())[0]
+
+    def is_sleeping(self, ident):
+        with self.cond:
+            return ident in self.sleeping
+
+    def advance(self, when):
+        with self.cond:
+            self.now = max(self.now, when)
+
+    def wake_next(self):
+        """Advance to the earliest deadline and release that sleeper; return its ident."""
+        with self.cond:
+            if not self.sleeping:
+                return None
+            ident, (deadline, _) = min(self.sleeping.items(), key=lambda item: item[1])
+            self.now = max(self.now, deadline)
+            del self.sleeping[ident]
+            self.cond.notify_all()
+            return ident
+
+
+class VirtualTime:
+    """Drop-in for the ``time`` module that reads and sleeps on a :class:`VirtualClock`.
+
+    Assign it over a module's ``time`` global; anything not overridden here
+    (``perf_counter``, formatting helpers) falls through to the real module.
+    """
+
+    def __init__(self, clock):
+        self._clock = clock
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    def time(self):
+        return self._clock.time()
+
+    def monotonic(self):
+        return self._clock.monotonic()
+
+    def sleep(self, seconds):
+        self._clock.sleep(seconds)
+
+    def localtime(self, secs=None):
+        return time.localtime(self._clock.time() if secs is None else secs)
+
+    def strftime(self, fmt, t=None):
+        return time.strftime(fmt, self.localtime() if t is None else t)
+
+
+class SteppedRepeater(KeyRepeater):
+    """:class:`KeyRepeater` without a thread, stepped by the replay driver.
+
+    Repeats fall at the same times a real hold would produce them, one step
+    each, so replays do not depend on how fast frames were drawn.
+    """
+
+    def start(self):
+        pass
+
+    def handled(self):
+        pass
+
+    def next_repeat(self):
+        """Return ``(channel, time)`` of the next repeat, or None if nothing is held."""
+        with self.cond:
+            if self.channel is None:
+                return None
+            return self.channel, self.next_due
+
+    def step(self):
+        """Account for the repeat returned by :meth:`next_repeat` and schedule the next."""
+        with self.cond:
+            held = self.next_due - self.pressed_at
+            self.steps += 1
+            self.posted += 1
+            self.next_due += self._interval(held)
@@ -0,0 +1,139 @@
+"""One asyncio event loop for Mini OS's timers, subprocesses and sockets.
+
+The loop runs on the main thread in place of the old ``sleep(1)`` loop and
+only wakes when a timer is due or a file descriptor is readable.  Every
+method here may be called from any thread: work is handed to the loop with
+``call_soon_threadsafe``.  Callbacks run on the loop thread, so they must not
+block; anything that sleeps belongs on the input dispatcher or the
+:class:`~utilities.events.WorkerPool`.
+"""
+
+import asyncio
+
+
+class Timer:
+    """Callback scheduled on a :class:`Runtime`; cancel it from any thread.
+
+    A repeating timer fires every ``interval`` seconds on a fixed schedule
+    (skipping ticks it fell behind on) until it is cancelled or its callback
+    returns False.
+    """
+
+    def __init__(self, runtime, delay, interval, func, args):
+        self.runtime = runtime
+        self.interval = interval
+        self.func = func
+        self.args = args
+        self.handle = None
+        self.due = None
+        self.cancelled = False
+        runtime.call_soon(self._schedule, delay)
+
+    def _schedule(self, delay):
+        if self.cancelled:
+            return
+        loop = self.runtime.loop
+        self.due = loop.time() + delay
+        self.handle = loop.call_at(self.due, self._fire)
+
+    def _fire(self):
+        if self.cancelled:
+            return
+        self.runtime.fired += 1
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            print(f"Timer {getattr(self.func, '__name__', 'callback')} failed: {e}")
+            result = None
+        if self.interval is None or self.cancelled or result is False:
+            self.cancelled = True
+            return
+        now = self.runtime.loop.time()
+        self.due += self.interval
+        if self.due <= now:
+            self.due = now + self.interval
+        self.handle = self.runtime.loop.call_at(self.due, self._fire)
+
+    def cancel(self):
+        """Stop the timer; a callback already running on the loop finishes first."""
+        self.cancelled = True
+        self.runtime.call_soon(self._cancel_handle)
+
+    def _cancel_handle(self):
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+
+
+class Runtime:
+    """Owner of the event loop.  :meth:`run` blocks until :meth:`stop`."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.tasks = set()
+        self.fired = 0
+        self.spawned = 0
+        self.failed = 0
+
+    def running_here(self):
+        """Return True when called from the loop thread while it is running."""
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def call_soon(self, func, *args):
+        """Run ``func(*args)`` on the loop as soon as possible."""
+        if self.running_here():
+            self.loop.call_soon(func, *args)
+        else:
+            self.loop.call_soon_threadsafe(func, *args)
+
+    def call_later(self, delay, func, *args):
+        """Run ``func(*args)`` once after ``delay`` seconds; return its :class:`Timer`."""
+        return Timer(self, delay, None, func, args)
+
+    def every(self, interval, func, *args, delay=None):
+        """Run ``func(*args)`` every ``interval`` seconds, first after ``delay`` (default ``interval``)."""
+        return Timer(self, interval if delay is None else delay, interval, func, args)
+
+    def spawn(self, coro, name=None):
+        """Run coroutine ``coro`` on the loop; return a ``concurrent.futures.Future``."""
+        name = name or getattr(coro, "__name__", "task")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        self.spawned += 1
+        self.tasks.add(future)
+
+        def done(f):
+            self.tasks.discard(f)
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is not None:
+                self.failed += 1
+                print(f"Task {name} failed: {error}")
+
+        future.add_done_callback(done)
+        return future
+
+    def add_reader(self, fd, func, *args):
+        """Call ``func(*args)`` on the loop whenever ``fd`` is readable."""
+        self.call_soon(self.loop.add_reader, fd, func, *args)
+
+    def remove_reader(self, fd):
+        self.call_soon(self.loop.remove_reader, fd)
+
+    def run(self):
+        """Run the loop on the calling thread until :meth:`stop` or Ctrl+C."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def stop(self):
+        self.call_soon(self.loop.stop)
+
+    def report(self):
+        running = len(self.tasks)
+        return (
+            f"{self.fired} timer callbacks, {self.spawned} tasks "
+            f"({running} running, {self.failed} failed)"
+        )
@@ -0,0 +1,132 @@
+"""Registry of screens and the input hooks each one owns.
+
+Every screen the menu can show registers a :class:`Screen` under the name
+kept in ``Menu.current_screen``.  Dispatching a button is then one dict
+lookup instead of a chain of comparisons, and a screen only ever sees the
+pins it declares.
+"""
+
+
+class Screen:
+    """Input, drawing and lifecycle hooks for one named screen.
+
+    ``keys`` maps a pin name to a callable run when that pin is pressed; any
+    other pin listed in ``pins`` is passed to ``on_press(pin_name)``.
+    ``on_release(pin_name, hold_time)`` is called for pins in
+    ``release_pins``.  ``enter`` and ``exit`` run when the screen becomes or
+    stops being current and ``render`` redraws it.  While a background job
+    started from this screen is running, ``cancel_pins`` cancel it.
+
+    Holding a pin in ``repeat_pins`` auto-repeats it.  Each repeat calls
+    ``on_repeat(pin_name, count)``, where ``count`` is how many steps the
+    repeat stands for, or else the press hook ``count`` times.
+    """
+
+    def __init__(self, name, keys=None, pins=(), on_press=None, on_release=None,
+                 release_pins=(), render=None, enter=None, exit=None,
+                 cancel_pins=("KEY3",), repeat_pins=(), on_repeat=None):
+        self.name = name
+        self.keys = dict(keys or {})
+        self.on_press = on_press
+        self.pins = frozenset(pins) | frozenset(self.keys)
+        self.on_release = on_release
+        self.release_pins = frozenset(release_pins)
+        self.render = render
+        self.enter = enter
+        self.exit = exit
+        self.cancel_pins = frozenset(cancel_pins)
+        self.repeat_pins = frozenset(repeat_pins)
+        self.on_repeat = on_repeat
+
+    def press(self, pin_name):
+        """Run the press hook for ``pin_name``; return False if it is not consumed."""
+        action = self.keys.get(pin_name)
+        if action is not None:
+            action()
+            return True
+        if self.on_press is not None and pin_name in self.pins:
+            self.on_press(pin_name)
+            return True
+        return False
+
+    def release(self, pin_name, hold_time):
+        """Run the release hook for ``pin_name``; return False if it is not consumed."""
+        if self.on_release is None or pin_name not in self.release_pins:
+            return False
+        self.on_release(pin_name, hold_time)
+        return True
+
+    def repeat(self, pin_name, count):
+        """Run ``count`` auto-repeat steps of ``pin_name``; return False if it does not repeat."""
+        if pin_name not in self.repeat_pins:
+            return False
+        if self.on_repeat is not None:
+            self.on_repeat(pin_name, count)
+            return True
+        for _ in range(count):
+            self.press(pin_name)
+        return True
+
+
+class ScreenRegistry:
+    """Name to :class:`Screen` table used by the input dispatcher."""
+
+    def __init__(self):
+        self.screens = {}
+
+    def add(self, name, **hooks):
+        """Register a :class:`Screen` built from ``hooks`` and return it."""
+        screen = Screen(name, **hooks)
+        self.screens[name] = screen
+        return screen
+
+    def get(self, name):
+        return self.screens.get(name)
+
+    def __contains__(self, name):
+        return name in self.screens
+
+    def press(self, name, pin_name):
+        screen = self.screens.get(name)
+        return screen is not None and screen.press(pin_name)
+
+    def release(self, name, pin_name, hold_time):
+        screen = self.screens.get(name)
+        return screen is not None and screen.release(pin_name, hold_time)
+
+    def repeat(self, name, pin_name, count):
+        screen = self.screens.get(name)
+        return screen is not None and screen.repeat(pin_name, count)
+
+    def repeats(self, name, pin_name):
+        """Return True if holding ``pin_name`` auto-repeats on screen ``name``."""
+        screen = self.screens.get(name)
+        return screen is not None and pin_name in screen.repeat_pins
+
+    def cancels(self, name, pin_name):
+        """Return True if ``pin_name`` cancels background work on screen ``name``."""
+        screen = self.screens.get(name)
+        cancel_pins = screen.cancel_pins if screen is not None else ("KEY3",)
+        return pin_name in cancel_pins
+
+    def render(self, name):
+        """Redraw screen ``name`` if it has a render hook; return True if it did."""
+        screen = self.screens.get(name)
+        if screen is None or screen.render is None:
+            return False
+        screen.render()
+        return True
+
+    def switch(self, old, new):
+        """Run ``old``'s exit hook and ``new``'s enter hook when the screen changes."""
+        if old == new:
+            return
+        for name, hook in ((old, "exit"), (new, "enter")):
+            screen = self.screens.get(name)
+            func = getattr(screen, hook, None) if screen is not None else None
+            if func is None:
+                continue
+            try:
+                func()
+            except Exception as e:
+                print(f"Screen {name} {hook} hook failed: {e}")
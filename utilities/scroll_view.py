@@ -0,0 +1,109 @@
+"""Scrollable text viewport that only draws what is on screen.
+
+Long documents (notes, stories, web pages) are split into tiles of a fixed
+number of lines.  Each tile is rendered once, the first time it scrolls into
+view, and afterwards scrolling just crops and pastes at most two tiles, so a
+step costs the same for a ten-line note and a ten-thousand-line page.
+"""
+
+from collections import OrderedDict
+from PIL import Image
+
+from . import text_cache
+
+TILE_LINES = 16
+MAX_TILES = 8
+
+
+class ScrollView:
+    """Vertical list of text lines shown through a window on the screen.
+
+    ``lines`` holds strings, or ``(text, fill)`` pairs to colour single
+    lines.  ``box`` is the ``(left, top, right, bottom)`` screen area the view
+    occupies; text is drawn ``margin`` pixels in from its left edge.  With
+    ``tiles`` off, visible lines are drawn straight onto the frame instead.
+    """
+
+    def __init__(self, lines, font, line_height, box, fill=(255, 255, 255),
+                 background="black", margin=5, tiles=True):
+        self.lines = lines
+        self.font = font
+        self.line_height = line_height
+        self.box = box
+        self.fill = fill
+        self.background = background
+        self.margin = margin
+        self.tiles = OrderedDict() if tiles else None
+        self.offset = 0
+        view_h = box[3] - box[1]
+        self.max_offset = max(0, len(lines) * line_height - view_h)
+
+    def scroll(self, direction, step=None):
+        """Move by ``direction`` lines (or ``step`` pixels each); return True if it moved."""
+        step = self.line_height if step is None else step
+        offset = min(self.max_offset, max(0, self.offset + direction * step))
+        if offset == self.offset:
+            return False
+        self.offset = offset
+        return True
+
+    def visible_range(self):
+        """Return the ``(first, last + 1)`` indexes of lines at least partly shown."""
+        view_h = self.box[3] - self.box[1]
+        first = self.offset // self.line_height
+        last = -(-(self.offset + view_h) // self.line_height)
+        return first, min(last, len(self.lines))
+
+    def _line(self, index):
+        line = self.lines[index]
+        if isinstance(line, tuple):
+            return line
+        return line, self.fill
+
+    def _tile(self, index):
+        """Return the image for tile ``index``, rendering it on first use."""
+        tile = self.tiles.get(index)
+        if tile is not None:
+            self.tiles.move_to_end(index)
+            return tile
+        width = self.box[2] - self.box[0]
+        tile = Image.new("RGB", (width, TILE_LINES * self.line_height), color=self.background)
+        draw = text_cache.Draw(tile)
+        start = index * TILE_LINES
+        for i in range(start, min(start + TILE_LINES, len(self.lines))):
+            text, fill = self._line(i)
+            draw.text((self.margin, (i - start) * self.line_height), text, font=self.font, fill=fill)
+        self.tiles[index] = tile
+        if len(self.tiles) > MAX_TILES:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def render(self, img):
+        """Draw the visible part of the document into ``img``, clipped to ``box``."""
+        left, top, right, bottom = self.box
+        view_h = bottom - top
+        if self.tiles is None:
+            port = Image.new("RGB", (right - left, view_h), color=self.background)
+            draw = text_cache.Draw(port)
+            first, last = self.visible_range()
+            for i in range(first, last):
+                text, fill = self._line(i)
+                y = i * self.line_height - self.offset
+                draw.text((self.margin, y), text, font=self.font, fill=fill)
+            img.paste(port, (left, top))
+            return
+
+        tile_h = TILE_LINES * self.line_height
+        y = self.offset
+        end = self.offset + view_h
+        while y < end:
+            index = y // tile_h
+            tile_top = index * tile_h
+            part_bottom = min(end, tile_top + tile_h)
+            if index * TILE_LINES >= len(self.lines):
+                img.paste(self.background, (left, top + y - self.offset, right, top + part_bottom - self.offset))
+            else:
+                tile = self._tile(index)
+                img.paste(tile.crop((0, y - tile_top, right - left, part_bottom - tile_top)),
+                          (left, top + y - self.offset))
+            y = part_bottom
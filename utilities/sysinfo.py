@@ -0,0 +1,298 @@
+"""System readings straight from procfs and sysfs, without running tools.
+
+:class:`SysInfo` keeps every file it reads open and re-reads it with
+``os.pread`` from offset 0, which the kernel answers with fresh contents, so
+a sample is one syscall per file instead of a fork of ``vcgencmd`` or
+``hostname``.  Each reading is cached for ``ttl`` seconds so several screens
+polling at once share one read.  All paths are resolved under ``root`` so a
+directory of fake ``sys`` and ``proc`` files can stand in for the kernel.
+"""
+
+import array
+import fcntl
+import os
+import socket
+import struct
+import threading
+import time
+
+# Largest file we expect (/proc/stat on a many-core machine fits easily)
+READ_SIZE = 65536
+# From <linux/wireless.h>
+SIOCGIWESSID = 0x8B1B
+IW_ESSID_MAX_SIZE = 32
+
+
+class SysInfo:
+    """Cached readings of temperature, CPU, memory, disk and addresses."""
+
+    def __init__(self, root="/", ttl=0.5):
+        self.root = root
+        self.ttl = ttl
+        self.fds = {}
+        self.cache = {}
+        # Guards the open files, the cache and the delta state; sample() holds
+        # it while a reading's read() calls take it again
+        self.lock = threading.RLock()
+        self.cpu_times = None  # [(total, idle)] per /proc/stat cpu line at the last sample
+        self.disk_totals = None  # (time, bytes read, bytes written) at the last sample
+        self.reads = 0
+        self.opens = 0
+        self.hits = 0
+
+    def path(self, path):
+        return os.path.join(self.root, path.lstrip("/"))
+
+    def read(self, path):
+        """Return the current text of ``path`` (under ``root``), or None if unreadable."""
+        with self.lock:
+            fd = self.fds.get(path)
+            if fd is None:
+                try:
+                    fd = os.open(self.path(path), os.O_RDONLY)
+                except OSError:
+                    return None
+                self.fds[path] = fd
+                self.opens += 1
+            try:
+                data = os.pread(fd, READ_SIZE, 0)
+            except OSError:
+                # The device went away; open it again next time
+                os.close(fd)
+                del self.fds[path]
+                return None
+            self.reads += 1
+        return data.decode(errors="replace")
+
+    def forget(self, prefix):
+        """Close the files whose path starts with ``prefix``, e.g. a process that exited."""
+        with self.lock:
+            for path in [p for p in self.fds if p.startswith(prefix)]:
+                os.close(self.fds.pop(path))
+
+    def close(self):
+        with self.lock:
+            for fd in self.fds.values():
+                os.close(fd)
+            self.fds.clear()
+
+    def sample(self, name, func):
+        """Return ``func()``, reusing the value from the last ``ttl`` seconds.
+
+        Callers on other threads wait for a reading in progress and share it,
+        so the CPU and disk deltas are never computed twice over one interval.
+        """
+        with self.lock:
+            now = time.monotonic()
+            cached = self.cache.get(name)
+            if cached is not None and now - cached[0] < self.ttl:
+                self.hits += 1
+                return cached[1]
+            value = func()
+            self.cache[name] = (now, value)
+            return value
+
+    # --- Readings ---
+
+    def temperature(self):
+        """Return the CPU temperature in degrees C, or None."""
+        return self.sample("temperature", self._temperature)
+
+    def _temperature(self):
+        zones = sorted(self._listdir("/sys/class/thermal"))
+        zones = [z for z in zones if z.startswith("thermal_zone")]
+        # Prefer the SoC sensor when the board has several zones
+        for zone in zones:
+            if (self.read(f"/sys/class/thermal/{zone}/type") or "").strip() == "cpu-thermal":
+                zones = [zone]
+                break
+        for zone in zones:
+            value = self._int(f"/sys/class/thermal/{zone}/temp")
+            if value is not None:
+                return value / 1000
+        return None
+
+    def cpu_usage(self):
+        """Return ``[all, cpu0, cpu1, ...]`` percentages since the previous sample.
+
+        Returns None on the first sample.  A core that had no ticks reads 0.
+        """
+        return self.sample("cpu_usage", self._cpu_usage)
+
+    def _cpu_usage(self):
+        times = []
+        # cpu user nice system idle iowait irq softirq steal ...
+        for line in (self.read("/proc/stat") or "").splitlines():
+            if not line.startswith("cpu"):
+                break
+            fields = [int(v) for v in line.split()[1:9]]
+            times.append((sum(fields), fields[3] + fields[4]))
+        previous, self.cpu_times = self.cpu_times, times
+        if not times or previous is None or len(previous) != len(times):
+            return None
+        usage = []
+        for (total, idle), (old_total, old_idle) in zip(times, previous):
+            ticks = total - old_total
+            usage.append(100 * (ticks - (idle - old_idle)) / ticks if ticks else 0.0)
+        return usage
+
+    def cpu_count(self):
+        """Return the number of CPUs listed in /proc/stat."""
+        lines = (self.read("/proc/stat") or "").splitlines()
+        return sum(1 for line in lines if line.startswith("cpu") and line[3:4].isdigit())
+
+    def cpu_freq(self):
+        """Return CPU 0's current frequency in MHz, or None."""
+        def freq():
+            khz = self._int("/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq")
+            return None if khz is None else khz / 1000
+        return self.sample("cpu_freq", freq)
+
+    def load(self):
+        """Return the 1, 5 and 15 minute load averages, or None."""
+        def load():
+            text = self.read("/proc/loadavg")
+            try:
+                return tuple(float(v) for v in text.split()[:3])
+            except (AttributeError, ValueError):
+                return None
+        return self.sample("load", load)
+
+    def memory(self):
+        """Return ``(used, total)`` memory in KB, or None."""
+        def memory():
+            fields = {}
+            for line in (self.read("/proc/meminfo") or "").splitlines():
+                name, _, value = line.partition(":")
+                fields[name] = value.split()[0] if value.split() else ""
+            try:
+                total = int(fields["MemTotal"])
+                return total - int(fields["MemAvailable"]), total
+            except (KeyError, ValueError):
+                return None
+        return self.sample("memory", memory)
+
+    def disk(self, path="/"):
+        """Return ``(used, total)`` bytes for the filesystem holding ``path``, or None."""
+        def disk():
+            try:
+                st = os.statvfs(self.path(path))
+            except OSError:
+                return None
+            total = st.f_blocks * st.f_frsize
+            return total - st.f_bfree * st.f_frsize, total
+        return self.sample(f"disk:{path}", disk)
+
+    def throttled(self):
+        """Return the Raspberry Pi firmware's throttling flags, or None elsewhere.
+
+        Bit 0 is under-voltage, 1 frequency capped, 2 throttled and 3 the soft
+        temperature limit; bits 16-19 say the same happened since boot.
+        """
+        def throttled():
+            text = self.read("/sys/devices/platform/soc/soc:firmware/get_throttled")
+            try:
+                return int(text, 16)
+            except (TypeError, ValueError):
+                return None
+        return self.sample("throttled", throttled)
+
+    def disk_io(self):
+        """Return ``(read, written)`` bytes per second since the previous sample, or None."""
+        return self.sample("disk_io", self._disk_io)
+
+    def _disk_io(self):
+        # Whole disks only, so partitions aren't counted twice
+        disks = {
+            name for name in self._listdir("/sys/block")
+            if not name.startswith(("loop", "ram", "zram"))
+        }
+        read = written = 0
+        # major minor name reads merged sectors_read ms writes merged sectors_written ...
+        for line in (self.read("/proc/diskstats") or "").splitlines():
+            fields = line.split()
+            if len(fields) >= 10 and fields[2] in disks:
+                read += int(fields[5]) * 512
+                written += int(fields[9]) * 512
+        now = time.monotonic()
+        previous, self.disk_totals = self.disk_totals, (now, read, written)
+        if previous is None or now <= previous[0]:
+            return None
+        elapsed = now - previous[0]
+        return (read - previous[1]) / elapsed, (written - previous[2]) / elapsed
+
+    def addresses(self):
+        """Return this host's IPv4 then global IPv6 addresses, like ``hostname -I``."""
+        return self.sample("addresses", lambda: self._ipv4() + self._ipv6())
+
+    def primary_address(self, default="localhost"):
+        addresses = self.addresses()
+        return addresses[0] if addresses else default
+
+    def _ipv4(self):
+        # The local routing table lists each address as "|-- a.b.c.d" followed
+        # by "/32 host LOCAL"
+        found = []
+        candidate = None
+        for line in (self.read("/proc/net/fib_trie") or "").splitlines():
+            line = line.strip()
+            if line.startswith("|--"):
+                candidate = line[3:].strip()
+            elif line == "/32 host LOCAL" and candidate:
+                if not candidate.startswith("127.") and candidate not in found:
+                    found.append(candidate)
+                candidate = None
+        return found
+
+    def _ipv6(self):
+        found = []
+        # address ifindex prefixlen scope flags name; scope 00 is global
+        for line in (self.read("/proc/net/if_inet6") or "").splitlines():
+            fields = line.split()
+            if len(fields) < 6 or fields[3] != "00":
+                continue
+            raw = bytes.fromhex(fields[0])
+            found.append(socket.inet_ntop(socket.AF_INET6, raw))
+        return found
+
+    def ssid(self, interface=None):
+        """Return the SSID ``interface`` (default: the first wireless one) is on, or None."""
+        return self.sample(f"ssid:{interface}", lambda: self._ssid(interface))
+
+    def _ssid(self, interface):
+        if interface is None:
+            wireless = [n for n in sorted(self._listdir("/sys/class/net"))
+                        if os.path.isdir(self.path(f"/sys/class/net/{n}/wireless"))]
+            if not wireless:
+                return None
+            interface = wireless[0]
+        if self.root != "/":
+            # The ESSID only comes from the driver, which a fake root can't provide
+            return None
+        buf = array.array("b", bytes(IW_ESSID_MAX_SIZE + 1))
+        address, _ = buf.buffer_info()
+        request = struct.pack("16sPHH", interface.encode()[:15], address, len(buf), 0)
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                result = fcntl.ioctl(sock.fileno(), SIOCGIWESSID, request)
+        except OSError:
+            return None
+        length = struct.unpack("16sPHH", result)[2]
+        return buf.tobytes()[:length].rstrip(b"\0").decode(errors="replace") or None
+
+    # --- Helpers ---
+
+    def _int(self, path):
+        try:
+            return int(self.read(path))
+        except (TypeError, ValueError):
+            return None
+
+    def _listdir(self, path):
+        try:
+            return os.listdir(self.path(path))
+        except OSError:
+            return []
+
+    def report(self):
+        return f"{len(self.fds)} files open, {self.opens} opens, {self.reads} reads, {self.hits} cached"
@@ -0,0 +1,102 @@
+"""Cache of pre-rendered text masks so repeated labels skip FreeType.
+
+Screens redraw the same strings constantly (menu items, footer hints,
+keyboard keys).  :class:`Draw` is a drop-in ``ImageDraw`` whose ``text``
+method rasterizes each ``(font, text)`` once into an alpha mask and then
+just pastes the fill colour through it, which gives the same pixels as
+``ImageDraw.text``.  Colours are applied at paste time, so one mask serves
+every colour scheme; call :func:`clear` when the fonts are reloaded.
+"""
+
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageDraw
+
+CACHE_SIZE = 1024
+
+_masks = OrderedDict()
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+
+
+def _font_key(font):
+    path = getattr(font, "path", None)
+    if path is None:
+        return id(font)
+    return (path, getattr(font, "size", None), getattr(font, "index", 0))
+
+
+def get_mask(font, text):
+    """Return ``(offset, mask)`` for ``text`` in ``font``, rendering it on a miss.
+
+    ``mask`` is None for strings with no visible pixels (such as spaces).
+    """
+    key = (_font_key(font), text)
+    with _lock:
+        entry = _masks.get(key)
+        if entry is not None:
+            _masks.move_to_end(key)
+            stats["hits"] += 1
+            return entry
+        stats["misses"] += 1
+    left, top, right, bottom = font.getbbox(text)
+    if right > left and bottom > top:
+        mask = Image.new("L", (right - left, bottom - top))
+        ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+        entry = ((left, top), mask)
+    else:
+        entry = ((0, 0), None)
+    with _lock:
+        _masks[key] = entry
+        if len(_masks) > CACHE_SIZE:
+            _masks.popitem(last=False)
+    return entry
+
+
+def clear():
+    """Drop every cached mask, e.g. after the fonts change."""
+    with _lock:
+        _masks.clear()
+
+
+def hit_rate():
+    """Return the fraction of text draws served from the cache."""
+    total = stats["hits"] + stats["misses"]
+    return stats["hits"] / total if total else 0.0
+
+
+def report():
+    """Return a one-line summary of cache use."""
+    return (
+        f"{stats['hits']} hits / {stats['misses']} misses "
+        f"({hit_rate() * 100:.0f}% hit rate), {len(_masks)} masks cached"
+    )
+
+
+class Draw(ImageDraw.ImageDraw):
+    """``ImageDraw`` whose plain single-line ``text`` calls use the mask cache.
+
+    Anything the cache does not handle (extra keyword arguments, multi-line
+    text, non-integer positions, other image modes) goes to ``ImageDraw``.
+    """
+
+    def __init__(self, im, mode=None):
+        super().__init__(im, mode)
+        self.image = im
+
+    def text(self, xy, text, fill=None, font=None, *args, **kwargs):
+        if (
+            args
+            or kwargs
+            or font is None
+            or fill is None
+            or not isinstance(text, str)
+            or "\n" in text
+            or self.image.mode not in ("RGB", "L")
+            or not all(isinstance(v, int) for v in xy)
+        ):
+            return super().text(xy, text, fill, font, *args, **kwargs)
+        (left, top), mask = get_mask(font, text)
+        if mask is not None:
+            x, y = xy[0] + left, xy[1] + top
+            self.image.paste(fill, (x, y, x + mask.width, y + mask.height), mask)
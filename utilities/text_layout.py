@@ -0,0 +1,242 @@
+"""Table-driven text measuring and word wrapping.
+
+Measuring a string with ``ImageDraw.textbbox`` goes through FreeType every
+time.  :class:`FontMetrics` asks FreeType once per character (and once per
+character pair for kerning) and measures strings by summing the cached
+values, giving the same right edge as ``textbbox``.  :func:`wrap_text` keeps
+an LRU cache of wrapped results so redrawing the same screen costs nothing.
+"""
+
+import math
+import threading
+import weakref
+from collections import OrderedDict, deque
+
+# Characters measured up front when a font is first seen
+PRELOAD_CHARS = "".join(chr(c) for c in range(32, 127))
+WRAP_CACHE_SIZE = 256
+
+
+def _pixels(x):
+    """Round a 1/64 pixel position the way FreeType's bbox ends up rounded."""
+    return math.floor(x + 0.5)
+
+
+class FontMetrics:
+    """Per-font tables of glyph advances, ink extents and kerning pairs."""
+
+    def __init__(self, font):
+        self.font = font
+        self.advances = {}
+        self.ink_right = {}
+        self.kerning = {}
+        for ch in PRELOAD_CHARS:
+            self._load(ch)
+
+    def _load(self, ch):
+        font = self.font
+        self.advances[ch] = font.getlength(ch)
+        self.ink_right[ch] = font.getbbox(ch)[2]
+
+    def kern(self, left, right):
+        """Return the kerning adjustment between ``left`` and ``right``."""
+        pair = left + right
+        value = self.kerning.get(pair)
+        if value is None:
+            # Falls back to whatever adjustment the font's own layout applies
+            value = self.font.getlength(pair) - self.advances[left] - self.advances[right]
+            self.kerning[pair] = value
+        return value
+
+    def extent(self, text):
+        """Return ``(advance, right edge)`` of ``text`` laid out from x=0."""
+        advances = self.advances
+        ink_right = self.ink_right
+        x = 0.0
+        right = 0.0
+        prev = None
+        for ch in text:
+            if ch not in advances:
+                self._load(ch)
+            if prev is not None:
+                x += self.kern(prev, ch)
+            edge = x + ink_right[ch]
+            if edge > right:
+                right = edge
+            x += advances[ch]
+            prev = ch
+        return x, right
+
+    def measure(self, text):
+        """Return the width of ``text`` as ``textbbox((0, 0), text)[2]`` would."""
+        return _pixels(self.extent(text)[1]) if text else 0
+
+
+_metrics = weakref.WeakKeyDictionary()
+_wrap_cache = OrderedDict()
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+
+
+def metrics_for(font):
+    """Return the shared :class:`FontMetrics` for ``font``, building it once."""
+    with _lock:
+        metrics = _metrics.get(font)
+        if metrics is None:
+            metrics = _metrics[font] = FontMetrics(font)
+        return metrics
+
+
+def text_width(text, font):
+    """Return the width ``textbbox`` would report for ``text`` in ``font``."""
+    return metrics_for(font).measure(text)
+
+
+def _break_word(word, metrics, max_width):
+    """Split a word wider than ``max_width`` into hyphenated pieces."""
+    pieces = []
+    remaining = word
+    while remaining:
+        if metrics.measure(remaining) <= max_width:
+            pieces.append(remaining)
+            break
+        # Longest prefix that still fits with a trailing hyphen
+        lo, hi = 1, len(remaining) - 1
+        best = 0
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            if metrics.measure(remaining[:mid] + "-") <= max_width:
+                best = mid
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        if not best:
+            # Not even one character fits; emit it anyway so we make progress
+            best = 1
+        pieces.append(remaining[:best] + "-" if best < len(remaining) else remaining)
+        remaining = remaining[best:]
+    return pieces
+
+
+def _wrap(text, font, max_width):
+    metrics = metrics_for(font)
+    space_adv = metrics.advances[" "]
+    space_right = metrics.ink_right[" "]
+    lines = []
+    for paragraph in text.split("\n"):
+        current = ""
+        line_adv = line_right = 0.0
+        for word in paragraph.split():
+            word_adv, word_right = metrics.extent(word)
+            if current:
+                # Lay the word out after a space, as textbbox would for the joined line
+                space_x = line_adv + metrics.kern(current[-1], " ")
+                origin = space_x + space_adv + metrics.kern(" ", word[0])
+                right = max(line_right, space_x + space_right, origin + word_right)
+                if _pixels(right) <= max_width:
+                    current = f"{current} {word}"
+                    line_adv = origin + word_adv
+                    line_right = right
+                    continue
+                lines.append(current)
+            if _pixels(word_right) <= max_width:
+                current = word
+                line_adv, line_right = word_adv, word_right
+            else:
+                lines.extend(_break_word(word, metrics, max_width))
+                current = ""
+                line_adv = line_right = 0.0
+        if current:
+            lines.append(current)
+    return lines
+
+
+def wrap_text(text, font, max_width):
+    """Return ``text`` wrapped into lines no wider than ``max_width`` pixels.
+
+    Each newline starts a new paragraph, runs of whitespace collapse to one
+    space and words that cannot fit on a line are hyphenated.  Results are
+    cached by ``(text, font, max_width)``; the caller gets its own list.
+    """
+    key = (text, font, max_width)
+    with _lock:
+        lines = _wrap_cache.get(key)
+        if lines is not None:
+            _wrap_cache.move_to_end(key)
+            stats["hits"] += 1
+            return list(lines)
+        stats["misses"] += 1
+    lines = tuple(_wrap(text, font, max_width))
+    with _lock:
+        _wrap_cache[key] = lines
+        if len(_wrap_cache) > WRAP_CACHE_SIZE:
+            _wrap_cache.popitem(last=False)
+    return list(lines)
+
+
+class WrappedLines:
+    """Bounded scrollback that wraps each line once, when it is added.
+
+    Behaves like the plain list it replaces for ``append``/``extend``, but
+    keeps the wrapped form alongside so redraws only slice the tail.  At most
+    ``limit`` raw and ``limit`` wrapped lines are kept; older ones fall off.
+    ``version`` changes whenever the wrapped lines do.
+    """
+
+    def __init__(self, limit=500):
+        self.limit = limit
+        self.raw = deque(maxlen=limit)
+        self.wrapped = deque(maxlen=limit)
+        self.font = None
+        self.max_width = None
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.raw))
+
+    def append(self, line):
+        self.extend((line,))
+
+    def extend(self, lines):
+        with self.lock:
+            for line in lines:
+                self.raw.append(line)
+                if self.font is not None:
+                    self.wrapped.extend(_wrap(line, self.font, self.max_width))
+            self.version += 1
+
+    def clear(self):
+        with self.lock:
+            self.raw.clear()
+            self.wrapped.clear()
+            self.version += 1
+
+    def tail(self, count, font, max_width):
+        """Return the last ``count`` wrapped lines for ``font`` and ``max_width``.
+
+        Changing the font or width re-wraps the kept raw lines once.
+        """
+        with self.lock:
+            if font is not self.font or max_width != self.max_width:
+                self.font = font
+                self.max_width = max_width
+                self.wrapped.clear()
+                for line in self.raw:
+                    self.wrapped.extend(_wrap(line, font, max_width))
+                self.version += 1
+            if count <= 0:
+                return []
+            skip = max(0, len(self.wrapped) - count)
+            return [self.wrapped[i] for i in range(skip, len(self.wrapped))]
+
+
+def clear_cache():
+    """Forget every cached wrap result and font table."""
+    with _lock:
+        _wrap_cache.clear()
+        _metrics.clear()
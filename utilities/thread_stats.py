@@ -0,0 +1,141 @@
+"""CPU time, context switches and wakeups for each thread of this process.
+
+Linux keeps per-thread counters under ``/proc/self/task/<tid>``: ``stat``
+has the user and system CPU ticks and ``status`` the voluntary and
+involuntary context switch counts.  A voluntary switch happens every time a
+thread blocks, so voluntary switches per second are its wakeup rate.  A
+thread that wakes many times a second yet uses almost no CPU is polling,
+typically a ``while True: ... time.sleep(0.1)`` loop, and is flagged.
+
+Native thread ids are matched to :attr:`threading.Thread.native_id`, so
+threads show up under the names they were given when created.
+"""
+
+import os
+import threading
+import time
+from collections import namedtuple
+
+ThreadUsage = namedtuple(
+    "ThreadUsage", "tid name cpu wakeups preempted state polling"
+)
+ThreadUsage.__doc__ = (
+    "One thread over the last interval: CPU percent, voluntary and involuntary "
+    "switches per second, scheduler state letter and whether it looks like a poll loop."
+)
+
+# Waking this often while using under POLL_CPU percent looks like a poll loop
+POLL_WAKEUPS = 5.0
+POLL_CPU = 2.0
+# Calls closer together than this share one reading
+MIN_INTERVAL = 0.5
+
+
+class ThreadStats:
+    """Samples ``/proc/self/task`` through a :class:`~utilities.sysinfo.SysInfo`."""
+
+    def __init__(self, sysinfo):
+        self.sysinfo = sysinfo
+        self.ticks = os.sysconf("SC_CLK_TCK")
+        self.previous = {}  # tid -> (cpu ticks, voluntary, involuntary)
+        self.previous_time = None
+        self.last = []
+        self.lock = threading.Lock()
+        self.samples = 0
+
+    def read_task(self, tid):
+        """Return ``(comm, state, cpu ticks, voluntary, involuntary)`` or None if gone."""
+        stat = self.sysinfo.read(f"/proc/self/task/{tid}/stat")
+        status = self.sysinfo.read(f"/proc/self/task/{tid}/status")
+        if not stat or not status:
+            return None
+        # "tid (comm) state ..." where comm may itself contain spaces or ")"
+        comm = stat[stat.find("(") + 1:stat.rfind(")")]
+        fields = stat[stat.rfind(")") + 2:].split()
+        switches = {}
+        for line in status.splitlines():
+            if line.endswith(tuple("0123456789")) and "ctxt_switches" in line:
+                name, _, value = line.partition(":")
+                switches[name] = int(value)
+        try:
+            # utime and stime are fields 14 and 15 of the whole line
+            cpu = int(fields[11]) + int(fields[12])
+        except (IndexError, ValueError):
+            return None
+        return (
+            comm,
+            fields[0],
+            cpu,
+            switches.get("voluntary_ctxt_switches", 0),
+            switches.get("nonvoluntary_ctxt_switches", 0),
+        )
+
+    def sample(self):
+        """Return a :class:`ThreadUsage` per live thread, busiest first.
+
+        Rates cover the time since the previous call; the first call has
+        only totals to go on and reports zeros.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self.previous_time is not None and now - self.previous_time < MIN_INTERVAL:
+                return self.last
+            try:
+                tids = sorted(int(t) for t in os.listdir(self.sysinfo.path("/proc/self/task")))
+            except (OSError, ValueError):
+                return []
+            names = {t.native_id: t.name for t in threading.enumerate()}
+            elapsed = now - self.previous_time if self.previous_time is not None else None
+            current = {}
+            usage = []
+            for tid in tids:
+                task = self.read_task(tid)
+                if task is None:
+                    continue
+                comm, state, cpu, voluntary, involuntary = task
+                current[tid] = (cpu, voluntary, involuntary)
+                old = self.previous.get(tid)
+                if elapsed and old is not None:
+                    cpu_pct = 100 * (cpu - old[0]) / self.ticks / elapsed
+                    wakeups = (voluntary - old[1]) / elapsed
+                    preempted = (involuntary - old[2]) / elapsed
+                else:
+                    cpu_pct = wakeups = preempted = 0.0
+                polling = wakeups >= POLL_WAKEUPS and cpu_pct < POLL_CPU
+                usage.append(ThreadUsage(
+                    tid, names.get(tid, comm), cpu_pct, wakeups, preempted, state, polling
+                ))
+            # Close the files of threads that have exited
+            for tid in set(self.previous) - set(current):
+                self.sysinfo.forget(f"/proc/self/task/{tid}/")
+            self.previous = current
+            self.previous_time = now
+            usage.sort(key=lambda u: (u.cpu, u.wakeups), reverse=True)
+            self.last = usage
+            self.samples += 1
+            return usage
+
+    def to_json(self):
+        return {
+            "time": time.time(),
+            "threads": [
+                {
+                    "tid": u.tid,
+                    "name": u.name,
+                    "cpu": round(u.cpu, 1),
+                    "wakeups": round(u.wakeups, 1),
+                    "preempted": round(u.preempted, 1),
+                    "state": u.state,
+                    "polling": u.polling,
+                }
+                for u in self.sample()
+            ],
+        }
+
+    def report(self):
+        usage = self.last
+        polling = [u.name for u in usage if u.polling]
+        text = f"{len(usage)} threads, {self.samples} samples"
+        if polling:
+            text += f", polling: {', '.join(polling)}"
+        return text
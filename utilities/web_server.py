@@ -4,10 +4,13 @@ import os
 import re
 import json
 import threading
+import time
 import importlib
 import subprocess
 import pexpect
-from flask import Flask, request, redirect, send_from_directory
+from html import escape
+from urllib.parse import urlencode
+from flask import Flask, request, redirect, send_from_directory, jsonify
 from flask_sock import Sock
 
 app = Flask(__name__)
@@ -20,7 +23,6 @@ os.makedirs(NOTES_DIR, exist_ok=True)
 NYT_API_KEY = None
 OPENAI_API_KEY = None
 VA_OPENAI_API_KEY = None
-CHAT_LOG = []
 VA_MESSAGES = []
 VA_CURRENT_REPLY = ""
 VA_CURRENT_OPTIONS = []
@@ -51,7 +53,7 @@ def shell_ws(ws):
         except Exception:
             pass
 
-    t = threading.Thread(target=read_output, daemon=True)
+    t = threading.Thread(target=read_output, name="web-shell", daemon=True)
     t.start()
 
     while True:
@@ -193,6 +195,9 @@ def index():
         "<li><a href='/settings'>Settings</a></li>"
         "<li><a href='/notes'>Notes</a></li>"
         "<li><a href='/chat'>Chat</a></li>"
+        "<li><a href='/metrics.json'>System Metrics (JSON)</a></li>"
+        "<li><a href='/threads.json'>Threads (JSON)</a></li>"
+        "<li><a href='/http.json'>HTTP Latency (JSON)</a></li>"
         "<li><a href='/shell'>Shell</a></li>"
         "<li><a href='/weather'>Weather</a></li>"
         "<li><a href='/top-stories'>Top Stories</a></li>"
@@ -312,7 +317,7 @@ def toggle_wifi_route():
     """Toggle Wi-Fi radio using main module helper."""
     main = importlib.import_module("__main__")
     if hasattr(main, "toggle_wifi"):
-        threading.Thread(target=main.toggle_wifi).start()
+        threading.Thread(target=main.toggle_wifi, name="wifi-toggle").start()
     return redirect("/settings")
 
 
@@ -346,22 +351,120 @@ def notes():
     return "\n".join(html)
 
 
+CHAT_PAGE = 50  # messages per page on /chat
+_chat_log = None
+
+
+def get_chat_log():
+    """Return Mini OS's chat log, or open the log file when running standalone."""
+    global _chat_log
+    main = importlib.import_module("__main__")
+    if getattr(main, "chat_log", None) is not None:
+        return main.chat_log
+    if _chat_log is None:
+        from utilities.chat_log import ChatLog
+        _chat_log = ChatLog(os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "chat.log"))
+    return _chat_log
+
+
 @app.route("/chat", methods=["GET", "POST"])
 def chat():
+    """Show the IRC log a page at a time, search it and post to the channel."""
+    log = get_chat_log()
     if request.method == "POST":
         msg = request.form.get("msg", "").strip()
         if msg:
-            CHAT_LOG.append(msg)
+            main = importlib.import_module("__main__")
+            if hasattr(main, "send_irc_message"):
+                main.send_irc_message(msg)
+                main.request_chat_redraw()
+            else:
+                log.append("web", msg)
         return redirect("/chat")
 
+    nick = request.args.get("nick", "").strip()
+    text = request.args.get("q", "").strip()
+    try:
+        before = int(request.args.get("before", len(log)))
+    except ValueError:
+        before = len(log)
+    if nick or text:
+        found = log.search(nick=nick or None, text=text or None, limit=CHAT_PAGE, before=before)
+    else:
+        start = max(0, before - CHAT_PAGE)
+        found = list(enumerate(log.read(start, before), start))
+
     html = ["<h1>Chat</h1>"]
     html.append("<form method='post'><input name='msg'><button type='submit'>Send</button></form>")
-    for line in CHAT_LOG[-50:]:
-        html.append(f"<div>{line}</div>")
+    html.append(
+        "<form method='get'>"
+        f"<input name='nick' placeholder='nick' value='{escape(nick, quote=True)}'> "
+        f"<input name='q' placeholder='text' value='{escape(text, quote=True)}'> "
+        "<button type='submit'>Search</button></form>"
+    )
+    for number, (when, who, message) in found:
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(when))
+        html.append(f"<div><small>{stamp}</small> <b>{escape(who)}</b> {escape(message)}</div>")
+    if found and found[0][0] > 0:
+        query = urlencode({"before": found[0][0], "nick": nick, "q": text})
+        html.append(f"<p><a href='/chat?{escape(query)}'>Older</a></p>")
+    elif not found:
+        html.append("<p>No messages.</p>")
     html.append("<p><a href='/'>Back</a></p>")
     return "\n".join(html)
 
 
+_metrics = None
+
+
+def get_metrics():
+    """Return Mini OS's metrics store, or map its history file when running standalone."""
+    global _metrics
+    main = importlib.import_module("__main__")
+    if getattr(main, "metrics", None) is not None:
+        return main.metrics
+    if _metrics is None:
+        from utilities.metrics import MetricsStore, metric_names
+        from utilities.sysinfo import SysInfo
+        path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "metrics.bin")
+        _metrics = MetricsStore(metric_names(SysInfo().cpu_count()), path)
+    return _metrics
+
+
+@app.route("/metrics.json")
+def metrics_json():
+    """Serve one window ("2m", "1h" or "24h") of every system metric."""
+    from utilities.metrics import WINDOWS
+    window = request.args.get("window", WINDOWS[0][0])
+    if window not in dict(WINDOWS):
+        return jsonify(error=f"window must be one of {', '.join(name for name, _ in WINDOWS)}"), 400
+    return jsonify(get_metrics().to_json(window))
+
+
+_thread_stats = None
+
+
+@app.route("/threads.json")
+def threads_json():
+    """Serve CPU percent, wakeups and context switches per thread of this process."""
+    global _thread_stats
+    main = importlib.import_module("__main__")
+    stats = getattr(main, "thread_stats", None)
+    if stats is None:
+        if _thread_stats is None:
+            from utilities.sysinfo import SysInfo
+            from utilities.thread_stats import ThreadStats
+            _thread_stats = ThreadStats(SysInfo())
+        stats = _thread_stats
+    return jsonify(stats.to_json())
+
+
+@app.route("/http.json")
+def http_json():
+    """Serve request counts and latencies per host of the shared HTTP client."""
+    return jsonify(get_http_client().stats())
+
+
 @app.route("/vet-adventure", methods=["GET", "POST"])
 def vet_adventure_page():
     """Simple web interface for the Vet Adventure game."""
@@ -513,15 +616,32 @@ WEATHER_EMOJI = {
 }
 
 
+_http_client = None
+
+
+def get_http_client():
+    """Return Mini OS's shared HTTP client, or this server's own when standalone."""
+    global _http_client
+    main = importlib.import_module("__main__")
+    if getattr(main, "http_client", None) is not None:
+        return main.http_client
+    if _http_client is None:
+        from utilities.http_client import HttpClient
+        _http_client = HttpClient()
+    return _http_client
+
+
 def fetch_weather_data(zip_code):
     """Fetch weather info for a US ZIP code using open-meteo."""
+    main = importlib.import_module("__main__")
     try:
-        import requests
-        r = requests.get(f"https://api.zippopotam.us/us/{zip_code}", timeout=5)
-        loc = r.json()
-        place = loc["places"][0]
-        lat = place["latitude"]
-        lon = place["longitude"]
+        if hasattr(main, "zip_location"):
+            lat, lon = main.zip_location(zip_code)
+        else:
+            loc = get_http_client().get_json(f"https://api.zippopotam.us/us/{zip_code}")
+            place = loc["places"][0]
+            lat = place["latitude"]
+            lon = place["longitude"]
     except Exception:
         return None
 
@@ -531,8 +651,7 @@ def fetch_weather_data(zip_code):
         "&timezone=America%2FLos_Angeles"
     )
     try:
-        import requests
-        data = requests.get(url, timeout=5).json()
+        data = get_http_client().get_json(url)
     except Exception:
         return None
 
@@ -609,12 +728,9 @@ def weather():
 def top_stories():
     load_nyt_api_key()
     try:
-        import requests
-        resp = requests.get(
-            f"https://api.nytimes.com/svc/topstories/v2/home.json?api-key={NYT_API_KEY}",
-            timeout=5,
+        data = get_http_client().get_json(
+            f"https://api.nytimes.com/svc/topstories/v2/home.json?api-key={NYT_API_KEY}"
         )
-        data = resp.json()
         stories = data.get("results", [])[:10]
     except Exception:
         stories = []